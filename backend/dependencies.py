@@ -17,6 +17,7 @@ def get_ai_service() -> BaseAIService:
 #     return EmbeddingService()
 
 def get_neo4j_handler() -> Neo4jHandler:
+    # 핸들러는 가볍고, 실제 커넥션은 lifespan이 소유한 공유 드라이버 풀에서 빌려씁니다.
     return Neo4jHandler()
 
 def get_sqlite_handler() -> SQLiteHandler:
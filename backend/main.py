@@ -12,10 +12,16 @@ from exceptions.custom_exceptions import AppException
 from schemas.error_response import ErrorResponse
 from fastapi.exceptions import RequestValidationError
 from neo4j_db.utils import run_neo4j
+from neo4j_db.Neo4jHandler import init_driver, close_driver, bootstrap_schema
 from sqlite_db import SQLiteHandler
+from sqlite_db.connection import connections
+from services.model_registry import registry
+from services.executors import shutdown_pools
+from services.ingest_service import ingest_workers
+import threading
 
 # 기존 라우터
-from routers import brainGraph, brainRouter, memoRouter, pdfRouter, textFileRouter, chatRouter, searchRouter, voiceRouter, mdRouter
+from routers import brainGraph, brainRouter, memoRouter, pdfRouter, textFileRouter, chatRouter, searchRouter, voiceRouter, mdRouter, healthRouter, jobRouter
 
 
 # ─── 로깅 설정 ─────────────────────────────────────
@@ -31,6 +37,11 @@ logging.getLogger("uvicorn.access").setLevel(logging.INFO)
 sqlite_handler = SQLiteHandler()
 neo4j_process = None
 
+# ───── 모델 warm-up 설정 ─────
+# 서버 시작 직후 백그라운드에서 미리 로드할 모델 목록 (쉼표 구분, 빈 문자열이면 warm-up 하지 않음)
+# 등록된 이름: qdrant, koe5, whisper, ollama
+WARMUP_MODELS = [m.strip() for m in os.getenv("WARMUP_MODELS", "qdrant,koe5").split(",") if m.strip()]
+
 # ─── 앱 수명 주기(lifespan) ──────────────────────────
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -46,8 +57,24 @@ async def lifespan(app: FastAPI):
             logging.error("❌ Neo4j 실행 실패")
     except Exception as e:
         logging.error("Neo4j 실행 중 오류: %s", e)
+    # 2-1) 공유 Neo4j 드라이버(커넥션 풀) 생성 및 인덱스/제약조건 부트스트랩 (Neo4j 기동을 기다리므로 백그라운드)
+    init_driver()
+    threading.Thread(target=bootstrap_schema, name="neo4j-schema", daemon=True).start()
+    # 3) 모델 warm-up (요청 처리를 막지 않도록 백그라운드 스레드에서)
+    if WARMUP_MODELS:
+        threading.Thread(
+            target=registry.warm_up, args=(WARMUP_MODELS,),
+            name="model-warmup", daemon=True
+        ).start()
+        logging.info("🔥 모델 warm-up 시작: %s", ", ".join(WARMUP_MODELS))
+    # 3-1) ingest 작업 워커 시작 (재시작 전에 중단된 작업도 다시 처리)
+    ingest_workers.start()
     yield
-    # 3) 종료 시 Neo4j 정리
+    # 4) 종료 시 ingest 워커, 실행 풀, SQLite 연결, 공유 드라이버 및 Neo4j 정리
+    ingest_workers.stop()
+    shutdown_pools()
+    connections.close_all()
+    close_driver()
     if neo4j_process:
         logging.info("🛑 Neo4j 프로세스를 종료합니다...")
         try:
@@ -102,6 +129,8 @@ app.include_router(chatRouter.router)
 app.include_router(searchRouter.router)
 app.include_router(voiceRouter.router)
 app.include_router(mdRouter.router)
+app.include_router(healthRouter.router)
+app.include_router(jobRouter.router)
 
 app.mount("/uploaded_pdfs", StaticFiles(directory="uploaded_pdfs"), name="uploaded_pdfs")
 app.mount("/uploaded_txts", StaticFiles(directory="uploaded_txts"), name="uploaded_txts")
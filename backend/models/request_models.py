@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Literal, Optional
 # Pydantic은 FastAPI가 사용하는 데이터 검증 및 직렬화 라이브러리
 
 
@@ -36,6 +36,10 @@ class ProcessTextRequest(BaseModel):
     text: str
     brain_id: str = Field(..., description="브레인 ID (문자열)")
     source_id: str = Field(..., description="소스 ID (문자열)")
+    use_cache: bool = Field(True, description="false면 LLM 추출 응답 캐시를 사용하지 않음")
+    source_kind: Optional[Literal["memo", "pdf", "text", "md"]] = Field(
+        None, description="소스 종류. 없으면 같은 ID와 브레인의 파일이 있는 종류를 찾아 원문을 저장"
+    )
 
 class AnswerRequest(BaseModel):
     question: str
@@ -1,80 +1,340 @@
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, Driver
 import logging
-from typing import List, Dict
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Tuple
 import json
 from exceptions.custom_exceptions import Neo4jException
+from services.graph_version import bump_graph_version
 
 NEO4J_URI = "bolt://localhost:7687"
 NEO4J_AUTH = ("neo4j", "YOUR_PASSWORD")  # 실제 비밀번호로 교체
-from exceptions.custom_exceptions import Neo4jException
+
+# ───── 커넥션 풀 설정 (환경 변수로 조정 가능) ─────
+NEO4J_MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", "50"))
+NEO4J_ACQUISITION_TIMEOUT = float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "60"))       # 초
+NEO4J_MAX_CONNECTION_LIFETIME = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600"))  # 초
+# insert_nodes_and_edges에서 UNWIND 한 번에 보낼 최대 행 수
+NEO4J_WRITE_BATCH_SIZE = int(os.getenv("NEO4J_WRITE_BATCH_SIZE", "500"))
+
+# ───── 스키마(인덱스/제약조건) 정의 ─────
+# 핫 쿼리는 모두 (:Node {brain_id, name}) / (:Node {brain_id}) / [:REL {brain_id}]로 매칭합니다.
+# fallback은 Community 에디션이나 기존 중복 데이터 때문에 제약조건 생성이 실패할 때 대신 만들 인덱스입니다.
+SCHEMA_DEFINITIONS = [
+    {
+        "name": "node_brain_name_unique",
+        "kind": "constraint",
+        "entity": "Node",
+        "properties": ["brain_id", "name"],
+        "cypher": "CREATE CONSTRAINT node_brain_name_unique IF NOT EXISTS "
+                  "FOR (n:Node) REQUIRE (n.brain_id, n.name) IS UNIQUE",
+        "fallback": "CREATE INDEX node_brain_name IF NOT EXISTS FOR (n:Node) ON (n.brain_id, n.name)",
+    },
+    {
+        "name": "source_brain_id_unique",
+        "kind": "constraint",
+        "entity": "Source",
+        "properties": ["brain_id", "id"],
+        "cypher": "CREATE CONSTRAINT source_brain_id_unique IF NOT EXISTS "
+                  "FOR (s:Source) REQUIRE (s.brain_id, s.id) IS UNIQUE",
+        "fallback": "CREATE INDEX source_brain_id IF NOT EXISTS FOR (s:Source) ON (s.brain_id, s.id)",
+    },
+    {
+        "name": "node_brain_id",
+        "kind": "index",
+        "entity": "Node",
+        "properties": ["brain_id"],
+        "cypher": "CREATE INDEX node_brain_id IF NOT EXISTS FOR (n:Node) ON (n.brain_id)",
+    },
+    {
+        "name": "rel_brain_id",
+        "kind": "index",
+        "entity": "REL",
+        "properties": ["brain_id"],
+        "cypher": "CREATE INDEX rel_brain_id IF NOT EXISTS FOR ()-[r:REL]-() ON (r.brain_id)",
+    },
+]
+
+# ───── 출처(provenance) 모델 ─────
+# 각 노드가 어떤 소스에서 추출되었는지는 (:Source {id, brain_id})-[:MENTIONS]->(:Node) 관계로 저장합니다.
+# n.descriptions(JSON 문자열 배열)의 source_id는 설명 텍스트와 함께 그대로 유지합니다.
+
+
+def description_source_ids(descriptions, default_source_id=None) -> List[str]:
+    """
+    descriptions(dict 또는 JSON 문자열 리스트)에 등장하는 source_id를 순서대로 중복 없이 반환합니다.
+    default_source_id가 주어지면 함께 포함합니다.
+    """
+    source_ids = []
+    for desc in descriptions or []:
+        if isinstance(desc, str):
+            try:
+                desc = json.loads(desc)
+            except json.JSONDecodeError:
+                continue
+        if isinstance(desc, dict) and desc.get("source_id") not in (None, ""):
+            source_ids.append(str(desc["source_id"]))
+    if default_source_id not in (None, ""):
+        source_ids.append(str(default_source_id))
+    return list(dict.fromkeys(source_ids))
+
+
+def build_write_rows(nodes: List[Dict], edges: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+    """
+    insert_nodes_and_edges가 UNWIND로 보낼 노드/엣지 행을 만듭니다. (입력은 수정하지 않음)
+    - 노드: descriptions를 JSON 문자열로 바꾸고(source_id가 없으면 노드의 source_id로 채움),
+      같은 이름의 노드는 한 행으로 합쳐 description/출처를 중복 없이 모음 (label/source_id는 마지막 값)
+    - 엣지: (source, target, relation)이 같은 엣지를 한 행으로 합치고 source_ids(출처)를 중복 없이 모음
+    Returns:
+        (노드 행 목록, 엣지 행 목록) 처음 등장한 순서
+    """
+    node_rows: Dict[str, Dict] = {}
+    for node in nodes:
+        descriptions = []
+        for desc in node.get("descriptions", []):
+            if isinstance(desc, dict) and "source_id" not in desc and "description" in desc:
+                desc = {**desc, "source_id": node.get("source_id", "")}
+            descriptions.append(json.dumps(desc, ensure_ascii=False))
+        source_ids = description_source_ids(node.get("descriptions", []), node.get("source_id"))
+
+        row = node_rows.get(node["name"])
+        if row is None:
+            node_rows[node["name"]] = {
+                "name": node["name"],
+                "label": node["label"],
+                "source_id": node.get("source_id", ""),
+                "new_descriptions": list(dict.fromkeys(descriptions)),
+                "source_ids": source_ids
+            }
+        else:
+            row["label"] = node["label"]
+            row["source_id"] = node.get("source_id", "")
+            row["new_descriptions"] = list(dict.fromkeys(row["new_descriptions"] + descriptions))
+            row["source_ids"] = list(dict.fromkeys(row["source_ids"] + source_ids))
+
+    edge_rows: Dict[Tuple[str, str, str], Dict] = {}
+    for edge in edges:
+        key = (edge["source"], edge["target"], edge["relation"])
+        row = edge_rows.setdefault(
+            key, {"source": edge["source"], "target": edge["target"], "relation": edge["relation"], "source_ids": []}
+        )
+        if edge.get("source_id") not in (None, "") and str(edge["source_id"]) not in row["source_ids"]:
+            row["source_ids"].append(str(edge["source_id"]))
+
+    return list(node_rows.values()), list(edge_rows.values())
+
+
+def batched(rows: List[Dict], batch_size: int) -> List[List[Dict]]:
+    """행 목록을 batch_size개씩 나눕니다. (UNWIND 한 번에 보낼 단위)"""
+    if batch_size < 1:
+        raise ValueError("batch_size는 1 이상이어야 합니다.")
+    return [rows[start:start + batch_size] for start in range(0, len(rows), batch_size)]
+
+
+def _source_id_needles(source_id: str) -> List[str]:
+    """
+    JSON 직렬화된 description에서 정확히 이 source_id만 찾기 위한 부분 문자열 목록.
+    '"source_id": "1"'처럼 따옴표까지 포함하므로 1이 12, 21, 100과 매칭되지 않습니다.
+    (예전에 숫자로 저장된 description도 찾도록 숫자 형태도 포함)
+    """
+    needles = [f'"source_id": {json.dumps(source_id, ensure_ascii=False)}']
+    if source_id.isdigit():
+        needles += [f'"source_id": {source_id},', f'"source_id": {source_id}}}']
+    return needles
+
+
+# ───── 프로세스 전체에서 공유하는 드라이버 ─────
+# main.py lifespan에서 init_driver()/close_driver()로 수명을 관리하고,
+# lifespan 밖(스크립트, 테스트)에서는 get_driver()가 처음 호출될 때 생성합니다.
+_driver: Optional[Driver] = None
+_driver_lock = threading.Lock()
+_pool_stats_lock = threading.Lock()
+_pool_stats = {
+    "sessions_opened": 0,
+    "sessions_in_use": 0,
+    "max_sessions_in_use": 0,
+    "session_errors": 0,
+    "total_session_seconds": 0.0,
+}
+
+
+def init_driver() -> Driver:
+    """공유 드라이버를 생성합니다. 이미 있으면 기존 드라이버를 반환합니다."""
+    global _driver
+    with _driver_lock:
+        if _driver is None:
+            _driver = GraphDatabase.driver(
+                NEO4J_URI,
+                auth=NEO4J_AUTH,
+                max_connection_pool_size=NEO4J_MAX_POOL_SIZE,
+                connection_acquisition_timeout=NEO4J_ACQUISITION_TIMEOUT,
+                max_connection_lifetime=NEO4J_MAX_CONNECTION_LIFETIME,
+            )
+            logging.info(
+                "✅ Neo4j 공유 드라이버 생성 (pool=%d, acquisition_timeout=%.0fs, max_lifetime=%.0fs)",
+                NEO4J_MAX_POOL_SIZE, NEO4J_ACQUISITION_TIMEOUT, NEO4J_MAX_CONNECTION_LIFETIME
+            )
+        return _driver
+
+
+def get_driver() -> Driver:
+    """공유 드라이버를 반환합니다. (없으면 생성)"""
+    return _driver if _driver is not None else init_driver()
+
+
+def close_driver() -> None:
+    """공유 드라이버와 커넥션 풀을 닫습니다. (앱 종료 시 호출)"""
+    global _driver
+    with _driver_lock:
+        if _driver is not None:
+            try:
+                _driver.close()
+                logging.info("🛑 Neo4j 공유 드라이버 종료")
+            except Exception as e:
+                logging.error("Neo4j 드라이버 종료 중 오류: %s", str(e))
+            _driver = None
+
+
+def get_pool_metrics() -> Dict:
+    """
+    커넥션 풀 설정과 세션 사용 통계를 반환합니다.
+    - sessions_in_use / max_sessions_in_use: 동시에 열린 세션 수 (현재/최대)
+    - pool_connections: 드라이버 내부 풀의 주소별 커넥션 수 (드라이버가 제공하는 경우)
+    """
+    with _pool_stats_lock:
+        stats = dict(_pool_stats)
+    stats["avg_session_seconds"] = (
+        stats["total_session_seconds"] / stats["sessions_opened"] if stats["sessions_opened"] else 0.0
+    )
+    stats.update({
+        "driver_initialized": _driver is not None,
+        "max_connection_pool_size": NEO4J_MAX_POOL_SIZE,
+        "connection_acquisition_timeout": NEO4J_ACQUISITION_TIMEOUT,
+        "max_connection_lifetime": NEO4J_MAX_CONNECTION_LIFETIME,
+    })
+    # 드라이버 내부 풀 상태는 공개 API가 아니므로 가능한 경우에만 포함
+    try:
+        pool = getattr(_driver, "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is not None:
+            stats["pool_connections"] = {
+                str(address): {
+                    "total": len(conns),
+                    "in_use": sum(1 for c in conns if getattr(c, "in_use", False)),
+                }
+                for address, conns in list(connections.items())
+            }
+    except Exception:
+        pass
+    return stats
+
+
 class Neo4jHandler:
-    def __init__(self):
-        self.driver = GraphDatabase.driver(NEO4J_URI, auth=NEO4J_AUTH)
+    def __init__(self, driver: Optional[Driver] = None):
+        # driver를 직접 넘기지 않으면 프로세스 공유 드라이버를 사용 (요청마다 새 드라이버를 만들지 않음)
+        self._driver = driver
+
+    @property
+    def driver(self) -> Driver:
+        return self._driver if self._driver is not None else get_driver()
 
     def close(self):
-        self.driver.close()
+        # 공유 드라이버는 앱 lifespan에서 close_driver()로 닫습니다.
+        # 생성자에 직접 넘긴 드라이버만 여기서 닫습니다.
+        if self._driver is not None:
+            self._driver.close()
 
+    @contextmanager
+    def _session(self):
+        """공유 풀에서 세션을 빌려오고 사용 통계를 기록합니다."""
+        started = time.perf_counter()
+        with _pool_stats_lock:
+            _pool_stats["sessions_opened"] += 1
+            _pool_stats["sessions_in_use"] += 1
+            _pool_stats["max_sessions_in_use"] = max(
+                _pool_stats["max_sessions_in_use"], _pool_stats["sessions_in_use"]
+            )
+        try:
+            with self.driver.session() as session:
+                yield session
+        except Exception:
+            with _pool_stats_lock:
+                _pool_stats["session_errors"] += 1
+            raise
+        finally:
+            with _pool_stats_lock:
+                _pool_stats["sessions_in_use"] -= 1
+                _pool_stats["total_session_seconds"] += time.perf_counter() - started
 
-    def insert_nodes_and_edges(self, nodes, edges, brain_id):
+    def insert_nodes_and_edges(self, nodes, edges, brain_id, batch_size: int = NEO4J_WRITE_BATCH_SIZE):
         """
         노드와 엣지를 Neo4j에 저장합니다.
-        쓰기 트랜잭션은 session.write_transaction()을 사용하여 한 번에 처리합니다.
+        노드/엣지를 파라미터 리스트로 만들어 UNWIND로 batch_size개씩 전송하므로
+        행 하나당 왕복이 아니라 청크 하나당 한 번만 왕복합니다.
+        노드마다 descriptions의 source_id로 (:Source)-[:MENTIONS]->(:Node) 관계도 함께 만듭니다.
+        쓰기 트랜잭션은 session.execute_write()를 사용하여 한 번에 처리합니다.
         """
-        def _insert(tx, nodes, edges, brain_id):
-            # 노드 저장
-            for node in nodes:
-                # descriptions를 JSON 문자열로 변환 (한글 깨짐 방지를 위해 ensure_ascii=False)
-                # source_id를 descriptions에 포함하여 저장
-                new_descriptions = []
-                for desc in node.get("descriptions", []):
-                    # 이미 source_id가 포함되어 있지 않으면 추가
-                    if isinstance(desc, dict) and "source_id" not in desc and "description" in desc:
-                        desc["source_id"] = node.get("source_id", "")
-                    new_descriptions.append(json.dumps(desc, ensure_ascii=False))
-                
+        # descriptions는 JSON 문자열로 변환하고, 같은 이름의 노드/같은 엣지는 한 행으로 합침 (build_write_rows)
+        # 엣지의 source_id는 REL.source_ids에 모아 증분 재처리 때 이 소스만 만든 엣지를 지울 수 있게 함
+        node_rows, edge_rows = build_write_rows(nodes, edges)
+
+        def _insert(tx, node_rows, edge_rows, brain_id):
+            # 노드 저장 (같은 이름의 노드는 build_write_rows에서 이미 한 행으로 합쳐짐)
+            for rows in batched(node_rows, batch_size):
                 tx.run(
                     """
-                    MERGE (n:Node {name: $name, brain_id: $brain_id})
+                    UNWIND $rows AS row
+                    MERGE (n:Node {name: row.name, brain_id: $brain_id})
                     ON CREATE SET 
-                        n.label = $label, 
-                        n.descriptions = $new_descriptions,
-                        n.source_id = $source_id,
+                        n.label = row.label, 
+                        n.descriptions = row.new_descriptions,
+                        n.source_id = row.source_id,
                         n.brain_id = $brain_id
                     ON MATCH SET 
-                        n.label = $label, 
-                        n.source_id = $source_id,
+                        n.label = row.label, 
+                        n.source_id = row.source_id,
                         n.brain_id = $brain_id,
                         n.descriptions = CASE 
-                            WHEN n.descriptions IS NULL THEN $new_descriptions 
-                            ELSE n.descriptions + [item IN $new_descriptions WHERE NOT item IN n.descriptions] 
+                            WHEN n.descriptions IS NULL THEN row.new_descriptions 
+                            ELSE n.descriptions + [item IN row.new_descriptions WHERE NOT item IN n.descriptions] 
                         END
+                    WITH n, row
+                    UNWIND row.source_ids AS sid
+                    MERGE (s:Source {id: sid, brain_id: $brain_id})
+                    MERGE (s)-[:MENTIONS]->(n)
                     """,
-                    name=node["name"],
-                    label=node["label"],
-                    source_id=node.get("source_id", ""),
-                    new_descriptions=new_descriptions,
+                    rows=rows,
                     brain_id=brain_id
-                )
+                ).consume()
             # 엣지 저장
-            for edge in edges:
+            for rows in batched(edge_rows, batch_size):
                 tx.run(
                     """
-                    MATCH (a:Node {name: $source, brain_id: $brain_id}), (b:Node {name: $target, brain_id: $brain_id})
-                    MERGE (a)-[r:REL {relation: $relation, brain_id: $brain_id}]->(b)
+                    UNWIND $rows AS row
+                    MATCH (a:Node {name: row.source, brain_id: $brain_id}), (b:Node {name: row.target, brain_id: $brain_id})
+                    MERGE (a)-[r:REL {relation: row.relation, brain_id: $brain_id}]->(b)
+                    ON CREATE SET r.source_ids = CASE WHEN size(row.source_ids) = 0 THEN null ELSE row.source_ids END
+                    ON MATCH SET r.source_ids = CASE
+                        WHEN r.source_ids IS NULL OR size(row.source_ids) = 0 THEN r.source_ids
+                        ELSE r.source_ids + [x IN row.source_ids WHERE NOT x IN r.source_ids]
+                    END
                     """,
-                    source=edge["source"],
-                    target=edge["target"],
-                    relation=edge["relation"],
+                    rows=rows,
                     brain_id=brain_id
-                )
+                ).consume()
 
         try:
-            with self.driver.session() as session:
-                session.execute_write(_insert, nodes, edges, brain_id)
-                logging.info("✅ Neo4j 노드와 엣지 삽입 및 트랜잭션 커밋 완료")
+            with self._session() as session:
+                session.execute_write(_insert, node_rows, edge_rows, brain_id)
+                logging.info("✅ Neo4j 노드 %d개와 엣지 %d개 삽입 및 트랜잭션 커밋 완료 (batch_size=%d)",
+                             len(node_rows), len(edge_rows), batch_size)
         except Exception as e:
             logging.error(f"❌ Neo4j 쓰기 트랜잭션 오류: {str(e)}")
             raise Neo4jException(message=f"Neo4j 쓰기 트랜잭션 오류: {str(e)}")
+        finally:
+            bump_graph_version(brain_id)
 
     def fetch_all_nodes(self):
         """
@@ -83,7 +343,7 @@ class Neo4jHandler:
         """
         nodes = []
         try:
-            with self.driver.session() as session:
+            with self._session() as session:
                 result = session.run("MATCH (n:Node) RETURN n.label AS label, n.name AS name, n.descriptions AS descriptions")
                 for record in result:
                     raw = record["descriptions"]
@@ -109,7 +369,7 @@ class Neo4jHandler:
         
         try:
             # 두 개의 별도 쿼리로 분리: 1단계 관계와 2단계 관계
-            with self.driver.session() as session:
+            with self._session() as session:
                 # 1단계: 직접 연결된 노드 및 관계
                 query1 = '''
                 MATCH (n:Node)
@@ -192,7 +452,7 @@ class Neo4jHandler:
         """
         for attempt in range(retries):
             try:
-                with self.driver.session() as session:
+                with self._session() as session:
                     result = session.run(query, parameters)
                     return [record.data() for record in result]
             except Exception as e:
@@ -216,11 +476,11 @@ class Neo4jHandler:
         """특정 브레인의 노드와 엣지 정보 조회"""
         logging.info(f"Neo4j get_brain_graph 시작 - brain_id: {brain_id}")
         try:
-            with self.driver.session() as session:
+            with self._session() as session:
                 # 노드 조회
                 logging.info("노드 조회 쿼리 실행")
                 nodes_result = session.run("""
-                    MATCH (n)
+                    MATCH (n:Node)
                     WHERE n.brain_id = $brain_id
                     RETURN DISTINCT n.name as name
                     """, brain_id=brain_id)
@@ -231,7 +491,7 @@ class Neo4jHandler:
                 # 엣지(관계) 조회
                 logging.info("엣지 조회 쿼리 실행")
                 edges_result = session.run("""
-                    MATCH (source)-[r]->(target)
+                    MATCH (source:Node)-[r]->(target:Node)
                     WHERE source.brain_id = $brain_id AND target.brain_id = $brain_id
                     RETURN DISTINCT source.name as source, target.name as target, r.relation as relation
                     """, brain_id=brain_id)
@@ -263,10 +523,15 @@ class Neo4jHandler:
             DETACH DELETE n
             """
             self._execute_with_retry(query, {"brain_id": brain_id})
+            self._execute_with_retry(
+                "MATCH (s:Source {brain_id: $brain_id}) DETACH DELETE s", {"brain_id": brain_id}
+            )
             logging.info(f"✅ brain_id {brain_id}의 모든 데이터 삭제 완료")
         except Exception as e:
             logging.error(f"❌ Neo4j 데이터 삭제 실패: {str(e)}")
             raise Neo4jException(f"Neo4j 데이터 삭제 실패: {str(e)}")
+        finally:
+            bump_graph_version(brain_id)
 
     def delete_descriptions_by_source_id(self, source_id: str, brain_id: str) -> None:
         """
@@ -275,27 +540,104 @@ class Neo4jHandler:
             source_id: 삭제할 description의 source_id
             brain_id: 브레인 ID
         """
+        source_id = str(source_id)
         try:
-            # 1. description 삭제
+            # 1. 이 소스가 언급한 노드에서만 해당 source_id의 description 삭제, 비게 된 노드는 삭제
             query1 = """
-            MATCH (n:Node {brain_id: $brain_id})
-            WITH n, [d in n.descriptions WHERE NOT (d CONTAINS $source_id)] as filtered_descriptions
-            SET n.descriptions = filtered_descriptions
-            """
-            self._execute_with_retry(query1, {"source_id": source_id, "brain_id": brain_id})
-            
-            # 2. description이 비어있는 노드 삭제
-            query2 = """
-            MATCH (n:Node {brain_id: $brain_id})
+            MATCH (s:Source {id: $source_id, brain_id: $brain_id})-[m:MENTIONS]->(n:Node)
+            SET n.descriptions = [d IN n.descriptions WHERE NOT ANY(x IN $needles WHERE d CONTAINS x)]
+            DELETE m
+            WITH DISTINCT n
             WHERE size(n.descriptions) = 0
             DETACH DELETE n
             """
-            self._execute_with_retry(query2, {"brain_id": brain_id})
+            self._execute_with_retry(query1, {
+                "source_id": source_id,
+                "brain_id": brain_id,
+                "needles": _source_id_needles(source_id)
+            })
+
+            # 2. Source 노드 삭제
+            query2 = """
+            MATCH (s:Source {id: $source_id, brain_id: $brain_id})
+            DETACH DELETE s
+            """
+            self._execute_with_retry(query2, {"source_id": source_id, "brain_id": brain_id})
             
             logging.info(f"✅ source_id {source_id}의 descriptions 삭제 완료")
         except Exception as e:
             logging.error(f"❌ descriptions 삭제 실패: {str(e)}")
             raise Neo4jException(f"descriptions 삭제 실패: {str(e)}")
+        finally:
+            bump_graph_version(brain_id)
+
+    def remove_descriptions(self, source_id: str, brain_id: str, descriptions: List[str]) -> None:
+        """
+        소스가 언급한 노드에서 지정한 description(JSON 문자열)만 삭제합니다. (증분 재처리용)
+        - 이 소스의 description이 더 남지 않은 노드는 MENTIONS 관계를 끊고
+        - description이 모두 비게 된 노드는 삭제합니다. (노드에 달린 엣지도 함께 삭제)
+        남은 노드 사이의 엣지는 remove_edges로 지웁니다.
+        """
+        if not descriptions:
+            return
+        source_id = str(source_id)
+        query = """
+        MATCH (s:Source {id: $source_id, brain_id: $brain_id})-[m:MENTIONS]->(n:Node)
+        WHERE ANY(d IN n.descriptions WHERE d IN $descriptions)
+        SET n.descriptions = [d IN n.descriptions WHERE NOT d IN $descriptions]
+        WITH m, n
+        WHERE NOT ANY(d IN n.descriptions WHERE ANY(x IN $needles WHERE d CONTAINS x))
+        DELETE m
+        WITH DISTINCT n
+        WHERE size(n.descriptions) = 0
+        DETACH DELETE n
+        """
+        try:
+            self._execute_with_retry(query, {
+                "source_id": source_id,
+                "brain_id": brain_id,
+                "descriptions": descriptions,
+                "needles": _source_id_needles(source_id)
+            })
+            logging.info("✅ source_id %s의 description %d개 삭제 완료", source_id, len(descriptions))
+        except Exception as e:
+            logging.error(f"❌ description 삭제 실패: {str(e)}")
+            raise Neo4jException(f"description 삭제 실패: {str(e)}")
+        finally:
+            bump_graph_version(brain_id)
+
+    def remove_edges(self, source_id: str, brain_id: str, edges: List[Dict]) -> None:
+        """
+        엣지(source, target, relation)에서 이 소스의 출처만 지우고, 출처가 남지 않은 엣지는 삭제합니다. (증분 재처리용)
+        출처(source_ids)가 기록되기 전에 만들어진 엣지는 다른 소스가 만든 것일 수 있으므로 그대로 둡니다.
+        """
+        if not edges:
+            return
+        source_id = str(source_id)
+        query = """
+        UNWIND $rows AS row
+        MATCH (:Node {name: row.source, brain_id: $brain_id})-[r:REL {relation: row.relation, brain_id: $brain_id}]->(:Node {name: row.target, brain_id: $brain_id})
+        WHERE r.source_ids IS NOT NULL AND $source_id IN r.source_ids
+        SET r.source_ids = [x IN r.source_ids WHERE x <> $source_id]
+        WITH r
+        WHERE size(r.source_ids) = 0
+        DELETE r
+        """
+        try:
+            self._execute_with_retry(query, {
+                "source_id": source_id,
+                "brain_id": brain_id,
+                "rows": [
+                    {"source": edge["source"], "target": edge["target"], "relation": edge["relation"]}
+                    for edge in edges
+                ]
+            })
+            logging.info("✅ source_id %s의 엣지 %d개 출처 삭제 완료", source_id, len(edges))
+        except Exception as e:
+            logging.error(f"❌ 엣지 삭제 실패: {str(e)}")
+            raise Neo4jException(f"엣지 삭제 실패: {str(e)}")
+        finally:
+            bump_graph_version(brain_id)
 
     def delete_descriptions_by_brain_id(self, brain_id: str) -> None:
         """
@@ -309,10 +651,15 @@ class Neo4jHandler:
             DETACH DELETE n
             """
             self._execute_with_retry(query, {"brain_id": brain_id})
+            self._execute_with_retry(
+                "MATCH (s:Source {brain_id: $brain_id}) DETACH DELETE s", {"brain_id": brain_id}
+            )
             logging.info(f"✅ brain_id {brain_id}의 모든 데이터 삭제 완료")
         except Exception as e:
             logging.error(f"❌ Neo4j 데이터 삭제 실패: {str(e)}")
             raise Neo4jException(f"Neo4j 데이터 삭제 실패: {str(e)}")
+        finally:
+            bump_graph_version(brain_id)
 
     def get_node_descriptions(self, node_name: str, brain_id: str) -> List[Dict]:
         """
@@ -354,7 +701,7 @@ class Neo4jHandler:
 
     def get_nodes_by_source_id(self, source_id: str, brain_id: str) -> List[str]:
         """
-        특정 source_id가 descriptions에 포함된 모든 노드의 이름을 반환합니다.
+        특정 source_id가 언급한(:Source-[:MENTIONS]->) 모든 노드의 이름을 반환합니다.
         
         Args:
             source_id: 찾을 source_id
@@ -365,11 +712,10 @@ class Neo4jHandler:
         """
         try:
             query = """
-            MATCH (n:Node {brain_id: $brain_id})
-            WHERE ANY(desc IN n.descriptions WHERE desc CONTAINS $source_id)
+            MATCH (:Source {id: $source_id, brain_id: $brain_id})-[:MENTIONS]->(n:Node)
             RETURN n.name as name
             """
-            result = self._execute_with_retry(query, {"source_id": source_id, "brain_id": brain_id})
+            result = self._execute_with_retry(query, {"source_id": str(source_id), "brain_id": brain_id})
             return [record["name"] for record in result]
             
         except Exception as e:
@@ -378,7 +724,8 @@ class Neo4jHandler:
 
     def get_edges_by_source_id(self, source_id: str, brain_id: str) -> List[Dict]:
         """
-        특정 source_id가 descriptions에 포함된 노드들 간의 엣지를 반환합니다.
+        특정 source_id가 언급한 노드에 연결된 엣지를 반환합니다.
+        (source 또는 target 중 하나라도 해당 소스가 언급한 노드이면 포함)
         
         Args:
             source_id: 찾을 source_id
@@ -389,12 +736,12 @@ class Neo4jHandler:
         """
         try:
             query = """
-            MATCH (source:Node {brain_id: $brain_id})-[r:REL {brain_id: $brain_id}]->(target:Node {brain_id: $brain_id})
-            WHERE ANY(desc IN source.descriptions WHERE desc CONTAINS $source_id)
-               OR ANY(desc IN target.descriptions WHERE desc CONTAINS $source_id)
-            RETURN source.name as source, target.name as target, r.relation as relation
+            MATCH (:Source {id: $source_id, brain_id: $brain_id})-[:MENTIONS]->(n:Node)
+            MATCH (n)-[r:REL {brain_id: $brain_id}]-(:Node)
+            WITH DISTINCT r
+            RETURN startNode(r).name as source, endNode(r).name as target, r.relation as relation
             """
-            result = self._execute_with_retry(query, {"source_id": source_id, "brain_id": brain_id})
+            result = self._execute_with_retry(query, {"source_id": str(source_id), "brain_id": brain_id})
             return [
                 {
                     "source": record["source"],
@@ -408,5 +755,137 @@ class Neo4jHandler:
             logging.error(f"❌ source_id로 엣지 조회 실패: {str(e)}")
             raise Neo4jException(f"source_id로 엣지 조회 실패: {str(e)}")
 
-    def __del__(self):
-        self.close()
\ No newline at end of file
+    def ensure_schema(self) -> Dict[str, str]:
+        """
+        SCHEMA_DEFINITIONS의 인덱스/제약조건을 생성합니다. (IF NOT EXISTS 사용으로 여러 번 실행해도 안전)
+        제약조건 생성이 실패하면 같은 속성에 대한 일반 인덱스(fallback)를 대신 생성합니다.
+        Returns:
+            {정의 이름: "created" | "fallback" | "failed"}
+        """
+        results = {}
+        with self._session() as session:
+            for definition in SCHEMA_DEFINITIONS:
+                try:
+                    session.run(definition["cypher"]).consume()
+                    results[definition["name"]] = "created"
+                except Exception as e:
+                    fallback = definition.get("fallback")
+                    if not fallback:
+                        logging.error("❌ Neo4j 스키마 생성 실패 (%s): %s", definition["name"], str(e))
+                        results[definition["name"]] = "failed"
+                        continue
+                    logging.warning("⚠️ 제약조건 %s 생성 실패, 인덱스로 대체: %s", definition["name"], str(e))
+                    try:
+                        session.run(fallback).consume()
+                        results[definition["name"]] = "fallback"
+                    except Exception as fe:
+                        logging.error("❌ Neo4j 대체 인덱스 생성 실패 (%s): %s", definition["name"], str(fe))
+                        results[definition["name"]] = "failed"
+        logging.info("✅ Neo4j 스키마 부트스트랩 완료: %s", results)
+        return results
+
+    def check_schema(self) -> Dict:
+        """
+        현재 DB의 인덱스 목록을 SCHEMA_DEFINITIONS와 비교합니다.
+        이름이 아니라 (라벨/타입, 속성 목록)으로 비교하므로 다른 이름으로 만든 동등한 인덱스도 인정합니다.
+        Returns:
+            {"ok": bool, "missing": [정의 이름...], "not_online": [인덱스 이름...]}
+        """
+        try:
+            indexes = self._execute_with_retry(
+                "SHOW INDEXES YIELD name, labelsOrTypes, properties, state RETURN name, labelsOrTypes, properties, state",
+                {}
+            )
+        except Exception as e:
+            logging.error("❌ Neo4j 인덱스 조회 실패: %s", str(e))
+            raise Neo4jException(f"Neo4j 인덱스 조회 실패: {str(e)}")
+
+        existing = {
+            (tuple(idx.get("labelsOrTypes") or []), tuple(idx.get("properties") or [])): idx
+            for idx in indexes
+        }
+        missing, not_online = [], []
+        for definition in SCHEMA_DEFINITIONS:
+            idx = existing.get(((definition["entity"],), tuple(definition["properties"])))
+            if idx is None:
+                missing.append(definition["name"])
+            elif idx.get("state") != "ONLINE":
+                not_online.append(idx.get("name"))
+
+        if missing:
+            logging.warning("⚠️ Neo4j 스키마 누락 인덱스: %s", missing)
+        return {"ok": not missing and not not_online, "missing": missing, "not_online": not_online}
+
+
+    def migrate_provenance(self, brain_id: Optional[str] = None, batch_size: int = NEO4J_WRITE_BATCH_SIZE) -> Dict:
+        """
+        기존 그래프의 n.descriptions(JSON 문자열)에서 source_id를 읽어
+        (:Source)-[:MENTIONS]->(:Node) 관계를 생성합니다. 여러 번 실행해도 MERGE라 안전합니다.
+        Args:
+            brain_id: 지정하면 해당 브레인만, 없으면 전체 그래프를 마이그레이션
+            batch_size: UNWIND 한 번에 보낼 노드 수
+        Returns:
+            {"nodes_scanned": int, "nodes_linked": int, "mentions": int}
+        """
+        if brain_id is None:
+            query = "MATCH (n:Node) RETURN n.brain_id AS brain_id, n.name AS name, n.source_id AS source_id, n.descriptions AS descriptions"
+            params = {}
+        else:
+            query = "MATCH (n:Node {brain_id: $brain_id}) RETURN n.brain_id AS brain_id, n.name AS name, n.source_id AS source_id, n.descriptions AS descriptions"
+            params = {"brain_id": brain_id}
+        records = self._execute_with_retry(query, params)
+
+        rows = []
+        for record in records:
+            # 예전 데이터는 description에만 source_id가 있으므로 n.source_id는 보조로만 사용
+            source_ids = description_source_ids(record.get("descriptions"))
+            if not source_ids and record.get("source_id") not in (None, ""):
+                source_ids = [str(record["source_id"])]
+            if source_ids:
+                rows.append({"brain_id": record["brain_id"], "name": record["name"], "source_ids": source_ids})
+
+        for start in range(0, len(rows), batch_size):
+            self._execute_with_retry(
+                """
+                UNWIND $rows AS row
+                MATCH (n:Node {name: row.name, brain_id: row.brain_id})
+                UNWIND row.source_ids AS sid
+                MERGE (s:Source {id: sid, brain_id: row.brain_id})
+                MERGE (s)-[:MENTIONS]->(n)
+                """,
+                {"rows": rows[start:start + batch_size]}
+            )
+
+        report = {
+            "nodes_scanned": len(records),
+            "nodes_linked": len(rows),
+            "mentions": sum(len(r["source_ids"]) for r in rows)
+        }
+        logging.info("✅ provenance 마이그레이션 완료 (brain_id=%s): %s", brain_id, report)
+        return report
+
+def bootstrap_schema(retries: int = 30, delay: float = 2.0) -> Optional[Dict]:
+    """
+    Neo4j가 요청을 받을 수 있을 때까지 기다린 뒤 ensure_schema()와 check_schema()를 실행합니다.
+    main.py lifespan에서 Neo4j 프로세스 기동과 병행되도록 백그라운드 스레드로 호출합니다.
+    Returns:
+        check_schema() 결과, 끝내 연결하지 못하면 None
+    """
+    handler = Neo4jHandler()
+    for attempt in range(retries):
+        try:
+            handler.driver.verify_connectivity()
+            break
+        except Exception as e:
+            logging.info("Neo4j 연결 대기 중 (%d/%d): %s", attempt + 1, retries, str(e))
+            time.sleep(delay)
+    else:
+        logging.error("❌ Neo4j에 연결하지 못해 스키마 부트스트랩을 건너뜁니다.")
+        return None
+
+    try:
+        handler.ensure_schema()
+        return handler.check_schema()
+    except Exception as e:
+        logging.error("❌ Neo4j 스키마 부트스트랩 오류: %s", str(e))
+        return None
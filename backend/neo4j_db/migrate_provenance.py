@@ -0,0 +1,30 @@
+"""
+기존 그래프에 (:Source)-[:MENTIONS]->(:Node) 출처 관계를 채워 넣는 마이그레이션 스크립트
+
+사용법 (backend 디렉토리에서):
+    python -m neo4j_db.migrate_provenance              # 전체 브레인
+    python -m neo4j_db.migrate_provenance --brain-id 3 # 특정 브레인만
+"""
+import argparse
+import logging
+
+from neo4j_db.Neo4jHandler import Neo4jHandler, close_driver
+
+
+def main():
+    parser = argparse.ArgumentParser(description="descriptions 기반 출처 정보를 Source-MENTIONS 관계로 마이그레이션")
+    parser.add_argument("--brain-id", default=None, help="마이그레이션할 브레인 ID (생략 시 전체)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    try:
+        handler = Neo4jHandler()
+        handler.ensure_schema()
+        report = handler.migrate_provenance(brain_id=args.brain_id)
+        print(report)
+    finally:
+        close_driver()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,16 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.responses import StreamingResponse
 from models.request_models import ProcessTextRequest, AnswerRequest, GraphResponse
 from services import ai_service, embedding_service
+from services.executors import run_in_pool
+from services.answer_cache import answer_cache
+from services.answer_stream import AnswerStreamParser
+from services.graph_version import get_graph_version
+from services.ingest_service import run_incremental_ingest
+from routers.jobRouter import JobResponse, submit_process_text
 from neo4j_db.Neo4jHandler import Neo4jHandler
+from dependencies import get_neo4j_handler
+import json
 import logging
 from sqlite_db import SQLiteHandler
 from exceptions.custom_exceptions import Neo4jException,AppException, GraphDataNotFoundException, QdrantException
@@ -26,7 +35,7 @@ router = APIRouter(
     }
     
 )
-async def get_brain_graph(brain_id: str):
+async def get_brain_graph(brain_id: str, neo4j_handler: Neo4jHandler = Depends(get_neo4j_handler)):
     """
     특정 브레인의 그래프 데이터를 반환합니다:
     
@@ -38,10 +47,7 @@ async def get_brain_graph(brain_id: str):
     """
     logging.info(f"getNodeEdge 엔드포인트 호출됨 - brain_id: {brain_id}")
     try:
-        neo4j_handler = Neo4jHandler()
-        logging.info("Neo4j 핸들러 생성됨")
-        
-        graph_data = neo4j_handler.get_brain_graph(brain_id)
+        graph_data = await run_in_pool("db", neo4j_handler.get_brain_graph, brain_id)
         logging.info(f"Neo4j에서 받은 데이터: nodes={len(graph_data['nodes'])}, links={len(graph_data['links'])}")
         
         # if not graph_data['nodes'] and not graph_data['links']:
@@ -59,54 +65,51 @@ async def get_brain_graph(brain_id: str):
         raise Neo4jException(message=str(e))
         
 
-@router.post("/process_text", 
-    summary="텍스트 처리 및 그래프 생성",
-    description="입력된 텍스트에서 노드와 엣지를 추출하여 Neo4j에 저장하고, 노드 정보를 벡터 DB에 임베딩합니다.",
-    response_description="처리된 노드와 엣지 정보를 반환합니다.",
+@router.post("/process_text",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="텍스트 처리 작업 등록",
+    description="텍스트 처리(청킹 → 노드/엣지 추출 → Neo4j 저장 → 임베딩)를 백그라운드 작업으로 등록하고 job_id를 바로 반환합니다. (/jobs/process_text와 동일)",
+    response_description="등록된 작업을 반환합니다. 진행 상황은 /jobs/{job_id}로 확인합니다.",
     responses={
         500: ErrorExamples[50001]
     }
     )
 async def process_text_endpoint(request_data: ProcessTextRequest):
     """
-    텍스트를 받아 노드/엣지 추출, Neo4j 저장, 벡터 DB 임베딩까지 전체 파이프라인 실행
+    요청 스레드에서 추출/저장/임베딩을 모두 기다리지 않도록 IngestJob으로 등록하고 ingest 워커가 처리
     """
-    text = request_data.text
-    source_id = request_data.source_id
-    brain_id = request_data.brain_id
-    
-    if not text:
+    logging.info("텍스트 처리 작업 등록: source_id: %s, brain_id: %s", request_data.source_id, request_data.brain_id)
+    return await submit_process_text(request_data)
+
+@router.post("/update_text",
+    summary="변경된 텍스트 증분 재처리",
+    description="이미 처리된 소스의 텍스트가 바뀌었을 때, 지난번에 반영된 청크와 해시를 비교해 새로 생기거나 바뀐 청크만 추출하고 사라진 청크의 description/엣지/임베딩만 삭제합니다.",
+    response_description="추가/삭제된 청크 수와 새로 저장된 노드/엣지 수를 반환합니다.",
+    responses={
+        500: ErrorExamples[50001]
+    }
+    )
+async def update_text_endpoint(request_data: ProcessTextRequest, neo4j_handler: Neo4jHandler = Depends(get_neo4j_handler)):
+    """
+    소스 텍스트 수정 시 전체 삭제 후 재처리 대신 바뀐 부분만 그래프와 벡터 DB에 반영
+    """
+    if not request_data.text:
         raise HTTPException(status_code=400, detail="text 파라미터가 필요합니다.")
-    if not source_id:
+    if not request_data.source_id:
         raise HTTPException(status_code=400, detail="source_id 파라미터가 필요합니다.")
-    if not brain_id:
+    if not request_data.brain_id:
         raise HTTPException(status_code=400, detail="brain_id 파라미터가 필요합니다.")
-    
-    logging.info("사용자 입력 텍스트: %s, source_id: %s, brain_id: %s", text, source_id, brain_id)
-    
-    # Step 1: 텍스트에서 노드/엣지 추출 (AI 서비스)
-    nodes, edges = ai_service.extract_graph_components(text, source_id)
-    logging.info("추출된 노드: %s", nodes)
-    logging.info("추출된 엣지: %s", edges)
-
-    # Step 2: Neo4j에 노드와 엣지 저장 
-    neo4j_handler = Neo4jHandler()
-    neo4j_handler.insert_nodes_and_edges(nodes, edges, brain_id)
-    logging.info("Neo4j에 노드와 엣지 삽입 완료")
-
-    # Step 3: 노드 정보를 벡터 DB에 임베딩
-    # 컬렉션이 없으면 초기화
-    if not embedding_service.is_index_ready(brain_id):
-        embedding_service.initialize_collection(brain_id)
-    
-    # 노드 정보 임베딩 및 저장
-    embeddings = embedding_service.update_index_and_get_embeddings(nodes, brain_id)
-    logging.info("벡터 DB에 노드 임베딩 저장 완료")
 
+    logging.info("증분 재처리 요청: source_id: %s, brain_id: %s", request_data.source_id, request_data.brain_id)
+    result = await run_in_pool(
+        "llm", run_incremental_ingest,
+        request_data.text, request_data.source_id, request_data.brain_id, neo4j_handler,
+        use_cache=request_data.use_cache, source_kind=request_data.source_kind
+    )
     return {
-        "message": "텍스트 처리 완료, 그래프(노드와 엣지)가 생성되었고 벡터 DB에 임베딩되었습니다.",
-        "nodes": nodes,
-        "edges": edges
+        "message": "텍스트 증분 재처리 완료",
+        **result
     }
 
 @router.post("/answer",
@@ -127,7 +130,7 @@ async def process_text_endpoint(request_data: ProcessTextRequest):
     }
 }
 )
-async def answer_endpoint(request_data: AnswerRequest):
+async def answer_endpoint(request_data: AnswerRequest, neo4j_handler: Neo4jHandler = Depends(get_neo4j_handler)):
     """
     사용자 질문을 받아 임베딩을 통해 유사한 노드를 찾고, 
     해당 노드들의 2단계 깊이 스키마를 추출 후 LLM을 이용해 최종 답변 생성
@@ -145,58 +148,31 @@ async def answer_endpoint(request_data: AnswerRequest):
     try:
         # 사용자 질문 저장
         db_handler = SQLiteHandler()
-        chat_id = db_handler.save_chat(False, question, brain_id)
-        
-        # Step 1: 컬렉션이 없으면 초기화
-        if not embedding_service.is_index_ready(brain_id):
-            embedding_service.initialize_collection(brain_id)
-            logging.info("Qdrant 컬렉션 초기화 완료: %s", brain_id)
-        
-        # Step 2: 질문 임베딩 계산
-        question_embedding = embedding_service.encode_text(question)
-        
-        # Step 3: 임베딩을 통해 유사한 노드 검색
-        similar_nodes = embedding_service.search_similar_nodes(embedding=question_embedding, brain_id=brain_id)
-        if not similar_nodes:
-            raise QdrantException("질문과 유사한 노드를 찾지 못했습니다.")
-        
-        # 노드 이름만 추출
-        similar_node_names = [node["name"] for node in similar_nodes]
-        logging.info("sim node name: %s", similar_node_names)
-        logging.info("sim node score: %s", [f"{node['name']}:{node['score']:.2f}" for node in similar_nodes])
-        
-        # Step 4: 유사한 노드들의 2단계 깊이 스키마 조회
-        neo4j_handler = Neo4jHandler()
-        result = neo4j_handler.query_schema_by_node_names(similar_node_names, brain_id)
-        if not result:
-            raise Neo4jException("스키마 조회 결과가 없습니다.")
-            
-        logging.info("### Neo4j 조회 결과 전체: %s", result)
+        chat_id = await run_in_pool("db", db_handler.save_chat, False, question, brain_id)
         
-        # 결과를 즉시 처리
-        nodes_result = result.get("nodes", [])
-        related_nodes_result = result.get("relatedNodes", [])
-        relationships_result = result.get("relationships", [])
-        
-        logging.info("Neo4j search result: nodes=%d, related_nodes=%d, relationships=%d", 
-                   len(nodes_result), len(related_nodes_result), len(relationships_result))
-        
-        # Step 5: 스키마 간결화 및 텍스트 구성
-        raw_schema_text = ai_service.generate_schema_text(nodes_result, related_nodes_result, relationships_result)
+        context = await _prepare_answer(question, brain_id, neo4j_handler)
+        cached = context["cached"]
+        if cached:
+            chat_id = await run_in_pool("db", db_handler.save_chat, True, cached["answer"], brain_id, cached["referenced_nodes"])
+            return {
+                "answer": cached["answer"],
+                "referenced_nodes": cached["referenced_nodes"],
+                "chat_id": chat_id
+            }
         
         # Step 6: LLM을을 사용해 최종 답변 생성
-        final_answer = ai_service.generate_answer(raw_schema_text, question)
+        final_answer = await run_in_pool("llm", ai_service.generate_answer, context["schema_text"], question)
         referenced_nodes = ai_service.extract_referenced_nodes(final_answer)
         final_answer = final_answer.split("EOF")[0].strip()
         
         # referenced_nodes 내용을 텍스트로 final_answer 뒤에 추가
-        if referenced_nodes:
-            nodes_text = "\n\n[참고된 노드 목록]\n" + "\n".join(f"- {node}" for node in referenced_nodes)
-            final_answer += nodes_text
+        final_answer = _append_referenced_nodes(final_answer, referenced_nodes)
+        
+        answer_cache.store(brain_id, context["graph_version"], question, context["question_embedding"], final_answer, referenced_nodes)
             
         # AI 답변 저장
         # AI 답변 저장 및 chat_id 획득
-        chat_id = db_handler.save_chat(True, final_answer, brain_id, referenced_nodes)
+        chat_id = await run_in_pool("db", db_handler.save_chat, True, final_answer, brain_id, referenced_nodes)
 
         return {
             "answer": final_answer,
@@ -207,6 +183,191 @@ async def answer_endpoint(request_data: AnswerRequest):
         logging.error("answer 오류: %s", str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
+def _append_referenced_nodes(answer: str, referenced_nodes: list) -> str:
+    """referenced_nodes 내용을 텍스트로 답변 뒤에 추가"""
+    if not referenced_nodes:
+        return answer
+    return answer + "\n\n[참고된 노드 목록]\n" + "\n".join(f"- {node}" for node in referenced_nodes)
+
+async def _prepare_answer(question: str, brain_id: str, neo4j_handler: Neo4jHandler) -> dict:
+    """
+    답변 생성 전 단계(질문 임베딩 → 답변 캐시 조회 → 유사 노드 검색 → 스키마 텍스트 구성)를 수행합니다.
+    Returns:
+        {"question_embedding", "graph_version", "cached", "schema_text"}
+        답변 캐시 hit이면 cached에 캐시된 답변이 들어 있고 schema_text는 None
+    """
+    # Step 1: 컬렉션이 없으면 초기화
+    if not await run_in_pool("db", embedding_service.is_index_ready, brain_id):
+        await run_in_pool("db", embedding_service.initialize_collection, brain_id)
+        logging.info("Qdrant 컬렉션 초기화 완료: %s", brain_id)
+    
+    # Step 2: 질문 임베딩 계산
+    question_embedding = await run_in_pool("embedding", embedding_service.encode_text, question)
+    
+    # 그래프가 바뀌지 않았고 비슷한 질문의 답변이 있으면 그대로 반환
+    graph_version = get_graph_version(brain_id)
+    context = {
+        "question_embedding": question_embedding,
+        "graph_version": graph_version,
+        "cached": answer_cache.lookup(brain_id, question_embedding),
+        "schema_text": None
+    }
+    if context["cached"]:
+        logging.info("✅ 답변 캐시 hit (유사도 %.3f): %s", context["cached"]["similarity"], context["cached"]["question"])
+        return context
+    
+    # Step 3: 임베딩을 통해 유사한 노드 검색
+    similar_nodes = await run_in_pool("db", embedding_service.search_similar_nodes, embedding=question_embedding, brain_id=brain_id)
+    if not similar_nodes:
+        raise QdrantException("질문과 유사한 노드를 찾지 못했습니다.")
+    
+    # 노드 이름만 추출
+    similar_node_names = [node["name"] for node in similar_nodes]
+    logging.info("sim node name: %s", similar_node_names)
+    logging.info("sim node score: %s", [f"{node['name']}:{node['score']:.2f}" for node in similar_nodes])
+    
+    # Step 4: 유사한 노드들의 2단계 깊이 스키마 조회
+    result = await run_in_pool("db", neo4j_handler.query_schema_by_node_names, similar_node_names, brain_id)
+    if not result:
+        raise Neo4jException("스키마 조회 결과가 없습니다.")
+        
+    logging.info("### Neo4j 조회 결과 전체: %s", result)
+    
+    # 결과를 즉시 처리
+    nodes_result = result.get("nodes", [])
+    related_nodes_result = result.get("relatedNodes", [])
+    relationships_result = result.get("relationships", [])
+    
+    logging.info("Neo4j search result: nodes=%d, related_nodes=%d, relationships=%d", 
+               len(nodes_result), len(related_nodes_result), len(relationships_result))
+    
+    # Step 5: 스키마 간결화 및 텍스트 구성
+    context["schema_text"] = ai_service.generate_schema_text(nodes_result, related_nodes_result, relationships_result)
+    return context
+
+def _sse(event: str, data: dict) -> str:
+    """server-sent event 한 건을 직렬화합니다."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+_STREAM_END = object()
+
+@router.post("/answer/stream",
+    summary="질문에 대한 답변 스트리밍 생성 (SSE)",
+    description="/answer와 같은 과정으로 답변을 생성하되, LLM 토큰을 server-sent events로 도착하는 대로 전송합니다.",
+    response_description="text/event-stream (token / referenced_nodes / done / error 이벤트)")
+async def answer_stream_endpoint(request_data: AnswerRequest, neo4j_handler: Neo4jHandler = Depends(get_neo4j_handler)):
+    """
+    이벤트 형식:
+    - **token**: {"text": 답변 본문 조각}
+    - **referenced_nodes**: {"referenced_nodes": [...]} (EOF 뒤 JSON이 완성되는 즉시 전송)
+    - **done**: {"answer": 저장된 최종 답변, "referenced_nodes": [...], "chat_id": AI 답변 chat_id, "cached": bool}
+    - **error**: {"detail": 오류 메시지}
+    """
+    question = request_data.question
+    brain_id = request_data.brain_id
+    
+    if not question:
+        raise HTTPException(status_code=400, detail="question 파라미터가 필요합니다.")
+    if not brain_id:
+        raise HTTPException(status_code=400, detail="brain_id 파라미터가 필요합니다.")
+    
+    logging.info("스트리밍 질문 접수: %s, brain_id: %s", question, brain_id)
+    
+    async def event_stream():
+        db_handler = SQLiteHandler()
+        tokens = None
+        try:
+            await run_in_pool("db", db_handler.save_chat, False, question, brain_id)
+            context = await _prepare_answer(question, brain_id, neo4j_handler)
+            
+            cached = context["cached"]
+            if cached:
+                yield _sse("token", {"text": cached["answer"]})
+                yield _sse("referenced_nodes", {"referenced_nodes": cached["referenced_nodes"]})
+                chat_id = await run_in_pool("db", db_handler.save_chat, True, cached["answer"], brain_id, cached["referenced_nodes"])
+                yield _sse("done", {"answer": cached["answer"], "referenced_nodes": cached["referenced_nodes"], "chat_id": chat_id, "cached": True})
+                return
+            
+            # Step 6: 토큰이 도착하는 대로 전송 (토큰 하나를 기다리는 동안만 llm 풀 사용)
+            tokens = ai_service.generate_answer_stream(context["schema_text"], question)
+            parser = AnswerStreamParser()
+            nodes_sent = False
+            while True:
+                token = await run_in_pool("llm", next, tokens, _STREAM_END)
+                if token is _STREAM_END:
+                    break
+                text = parser.feed(token)
+                if text:
+                    yield _sse("token", {"text": text})
+                if not nodes_sent and parser.referenced_nodes is not None:
+                    nodes_sent = True
+                    yield _sse("referenced_nodes", {"referenced_nodes": parser.referenced_nodes})
+            text = parser.finish()
+            if text:
+                yield _sse("token", {"text": text})
+            referenced_nodes = parser.referenced_nodes
+            if not nodes_sent:
+                yield _sse("referenced_nodes", {"referenced_nodes": referenced_nodes})
+            
+            # 스트림이 끝나면 /answer와 같은 형식으로 저장
+            final_answer = _append_referenced_nodes(parser.answer.strip(), referenced_nodes)
+            answer_cache.store(brain_id, context["graph_version"], question, context["question_embedding"], final_answer, referenced_nodes)
+            chat_id = await run_in_pool("db", db_handler.save_chat, True, final_answer, brain_id, referenced_nodes)
+            yield _sse("done", {"answer": final_answer, "referenced_nodes": referenced_nodes, "chat_id": chat_id, "cached": False})
+        except Exception as e:
+            logging.error("answer stream 오류: %s", str(e))
+            yield _sse("error", {"detail": str(e)})
+        finally:
+            # 클라이언트가 연결을 끊으면 LLM 스트림도 닫음
+            if tokens is not None:
+                try:
+                    tokens.close()
+                except Exception:
+                    pass
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _collect_node_sources(node_name: str, brain_id: str, neo4j_handler: Neo4jHandler) -> list:
+    """노드 descriptions의 source_id마다 PDF/TextFile 제목을 찾아 반환합니다. (db 풀에서 실행)"""
+    db = SQLiteHandler()
+    
+    # Neo4j에서 노드의 descriptions 배열 조회
+    descriptions = neo4j_handler.get_node_descriptions(node_name, brain_id)
+    if not descriptions:
+        return []
+        
+    # descriptions 배열에서 모든 source_id 추출
+    seen_ids = set()  # 중복 제거를 위해 set 사용
+    sources = []
+    
+    for desc in descriptions:
+        if "source_id" in desc:
+            source_id = desc["source_id"]
+            if source_id not in seen_ids:
+                seen_ids.add(source_id)
+                
+                # PDF와 TextFile 테이블에서 모두 조회
+                pdf = db.get_pdf(int(source_id))
+                textfile = db.get_textfile(int(source_id))
+                
+                title = None
+                if pdf:
+                    title = pdf['pdf_title']
+                elif textfile:
+                    title = textfile['txt_title']
+                
+                if title:
+                    sources.append({
+                        "id": source_id,
+                        "title": title
+                    })
+
+    return sources
+
 @router.get("/getSourceIds",
     summary="노드의 모든 source_id와 제목을 조회",
     description="특정 노드의 descriptions 배열에서 모든 source_id를 추출하여 반환합니다.",
@@ -215,7 +376,7 @@ async def answer_endpoint(request_data: AnswerRequest):
     500: ErrorExamples[50002]
     }
 )
-async def get_source_ids(node_name: str, brain_id: str):
+async def get_source_ids(node_name: str, brain_id: str, neo4j_handler: Neo4jHandler = Depends(get_neo4j_handler)):
     """
     노드의 모든 source_id와 제목을 반환합니다:
     
@@ -227,40 +388,7 @@ async def get_source_ids(node_name: str, brain_id: str):
     """
     logging.info(f"getSourceIds 엔드포인트 호출됨 - node_name: {node_name}, brain_id: {brain_id}")
     try:
-        neo4j_handler = Neo4jHandler()
-        db = SQLiteHandler()
-        logging.info("Neo4j 핸들러 생성됨")
-        
-        # Neo4j에서 노드의 descriptions 배열 조회
-        descriptions = neo4j_handler.get_node_descriptions(node_name, brain_id)
-        if not descriptions:
-            return {"sources": []}
-            
-        # descriptions 배열에서 모든 source_id 추출
-        seen_ids = set()  # 중복 제거를 위해 set 사용
-        sources = []
-        
-        for desc in descriptions:
-            if "source_id" in desc:
-                source_id = desc["source_id"]
-                if source_id not in seen_ids:
-                    seen_ids.add(source_id)
-                    
-                    # PDF와 TextFile 테이블에서 모두 조회
-                    pdf = db.get_pdf(int(source_id))
-                    textfile = db.get_textfile(int(source_id))
-                    
-                    title = None
-                    if pdf:
-                        title = pdf['pdf_title']
-                    elif textfile:
-                        title = textfile['txt_title']
-                    
-                    if title:
-                        sources.append({
-                            "id": source_id,
-                            "title": title
-                        })
+        sources = await run_in_pool("db", _collect_node_sources, node_name, brain_id, neo4j_handler)
         
         logging.info(f"추출된 sources: {sources}")
         return {"sources": sources}
@@ -273,7 +401,7 @@ async def get_source_ids(node_name: str, brain_id: str):
     summary="source_id로 노드 조회",
     description="특정 source_id가 descriptions에 포함된 모든 노드의 이름을 반환합니다.",
     response_description="노드 이름 목록을 반환합니다.")
-async def get_nodes_by_source_id(source_id: str, brain_id: str):
+async def get_nodes_by_source_id(source_id: str, brain_id: str, neo4j_handler: Neo4jHandler = Depends(get_neo4j_handler)):
     """
     source_id로 노드를 조회합니다:
     
@@ -285,11 +413,8 @@ async def get_nodes_by_source_id(source_id: str, brain_id: str):
     """
     logging.info(f"getNodesBySourceId 엔드포인트 호출됨 - source_id: {source_id}, brain_id: {brain_id}")
     try:
-        neo4j_handler = Neo4jHandler()
-        logging.info("Neo4j 핸들러 생성됨")
-        
         # Neo4j에서 source_id로 노드 조회
-        node_names = neo4j_handler.get_nodes_by_source_id(source_id, brain_id)
+        node_names = await run_in_pool("db", neo4j_handler.get_nodes_by_source_id, source_id, brain_id)
         logging.info(f"조회된 노드 이름: {node_names}")
         
         return {"nodes": node_names}
@@ -298,6 +423,114 @@ async def get_nodes_by_source_id(source_id: str, brain_id: str):
         logging.error("노드 조회 오류: %s", str(e))
         raise HTTPException(status_code=500, detail=f"노드 조회 중 오류가 발생했습니다: {str(e)}")
 
+def _compute_source_data_metrics(brain_id: str, neo4j_handler: Neo4jHandler) -> dict:
+    """브레인의 소스별 텍스트 길이와 노드/엣지 수를 계산합니다. (db 풀에서 실행)"""
+    db_handler = SQLiteHandler()
+    
+    # 1. Neo4j에서 그래프 데이터 조회
+    graph_data = neo4j_handler.get_brain_graph(brain_id)
+    total_nodes = len(graph_data.get('nodes', []))
+    total_edges = len(graph_data.get('links', []))
+    
+    # 2. SQLite에서 소스별 텍스트 길이 계산
+    source_metrics = []
+    total_text_length = 0
+    
+    # PDF 소스들 조회
+    pdfs = db_handler.get_pdfs_by_brain(brain_id)
+    for pdf in pdfs:
+        try:
+            # PDF 파일에서 텍스트 추출 (간단한 추정)
+            # 실제로는 PDF 파싱이 필요하지만, 여기서는 파일 크기로 추정
+            import os
+            if os.path.exists(pdf['pdf_path']):
+                file_size = os.path.getsize(pdf['pdf_path'])
+                # PDF 파일 크기를 텍스트 길이로 추정 (대략적인 계산)
+                estimated_text_length = int(file_size * 0.1)  # PDF의 약 10%가 텍스트라고 가정
+            else:
+                estimated_text_length = 0
+            
+            # 이 PDF에서 생성된 노드 수 계산
+            pdf_nodes = neo4j_handler.get_nodes_by_source_id(pdf['pdf_id'], brain_id)
+            pdf_edges = neo4j_handler.get_edges_by_source_id(pdf['pdf_id'], brain_id)
+            
+            source_metrics.append({
+                "source_id": pdf['pdf_id'],
+                "source_type": "pdf",
+                "title": pdf['pdf_title'],
+                "text_length": estimated_text_length,
+                "nodes_count": len(pdf_nodes),
+                "edges_count": len(pdf_edges)
+            })
+            
+            total_text_length += estimated_text_length
+            
+        except Exception as e:
+            logging.error(f"PDF 메트릭 계산 오류 (ID: {pdf['pdf_id']}): {str(e)}")
+    
+    # TXT 소스들 조회
+    txts = db_handler.get_textfiles_by_brain(brain_id)
+    for txt in txts:
+        try:
+            # TXT 파일에서 실제 텍스트 길이 계산
+            import os
+            if os.path.exists(txt['txt_path']):
+                with open(txt['txt_path'], 'r', encoding='utf-8') as f:
+                    text_content = f.read()
+                    text_length = len(text_content)
+            else:
+                text_length = 0
+            
+            # 이 TXT에서 생성된 노드 수 계산
+            txt_nodes = neo4j_handler.get_nodes_by_source_id(txt['txt_id'], brain_id)
+            txt_edges = neo4j_handler.get_edges_by_source_id(txt['txt_id'], brain_id)
+            
+            source_metrics.append({
+                "source_id": txt['txt_id'],
+                "source_type": "txt",
+                "title": txt['txt_title'],
+                "text_length": text_length,
+                "nodes_count": len(txt_nodes),
+                "edges_count": len(txt_edges)
+            })
+            
+            total_text_length += text_length
+            
+        except Exception as e:
+            logging.error(f"TXT 메트릭 계산 오류 (ID: {txt['txt_id']}): {str(e)}")
+    
+    # MEMO 소스들 조회
+    memos = db_handler.get_memos_by_brain(brain_id, is_source=True)
+    for memo in memos:
+        try:
+            # 메모 텍스트 길이 계산
+            text_length = len(memo['memo_text'] or '')
+            
+            # 이 메모에서 생성된 노드 수 계산
+            memo_nodes = neo4j_handler.get_nodes_by_source_id(memo['memo_id'], brain_id)
+            memo_edges = neo4j_handler.get_edges_by_source_id(memo['memo_id'], brain_id)
+            
+            source_metrics.append({
+                "source_id": memo['memo_id'],
+                "source_type": "memo",
+                "title": memo['memo_title'],
+                "text_length": text_length,
+                "nodes_count": len(memo_nodes),
+                "edges_count": len(memo_edges)
+            })
+            
+            total_text_length += text_length
+            
+        except Exception as e:
+            logging.error(f"MEMO 메트릭 계산 오류 (ID: {memo['memo_id']}): {str(e)}")
+    
+    return {
+        "total_text_length": total_text_length,
+        "total_nodes": total_nodes,
+        "total_edges": total_edges,
+        "source_metrics": source_metrics
+    }
+
 @router.get("/getSourceDataMetrics/{brain_id}",
     summary="브레인의 소스별 데이터 메트릭 조회",
     description="특정 브레인의 모든 소스에 대한 텍스트 양과 그래프 데이터 양을 계산하여 반환합니다.",
@@ -307,7 +540,7 @@ async def get_nodes_by_source_id(source_id: str, brain_id: str):
         500: ErrorExamples[50001]
     }
 )
-async def get_source_data_metrics(brain_id: str):
+async def get_source_data_metrics(brain_id: str, neo4j_handler: Neo4jHandler = Depends(get_neo4j_handler)):
     """
     특정 브레인의 모든 소스에 대한 데이터 메트릭을 반환합니다:
     
@@ -321,112 +554,7 @@ async def get_source_data_metrics(brain_id: str):
     """
     logging.info(f"getSourceDataMetrics 엔드포인트 호출됨 - brain_id: {brain_id}")
     try:
-        neo4j_handler = Neo4jHandler()
-        db_handler = SQLiteHandler()
-        
-        # 1. Neo4j에서 그래프 데이터 조회
-        graph_data = neo4j_handler.get_brain_graph(brain_id)
-        total_nodes = len(graph_data.get('nodes', []))
-        total_edges = len(graph_data.get('links', []))
-        
-        # 2. SQLite에서 소스별 텍스트 길이 계산
-        source_metrics = []
-        total_text_length = 0
-        
-        # PDF 소스들 조회
-        pdfs = db_handler.get_pdfs_by_brain(brain_id)
-        for pdf in pdfs:
-            try:
-                # PDF 파일에서 텍스트 추출 (간단한 추정)
-                # 실제로는 PDF 파싱이 필요하지만, 여기서는 파일 크기로 추정
-                import os
-                if os.path.exists(pdf['pdf_path']):
-                    file_size = os.path.getsize(pdf['pdf_path'])
-                    # PDF 파일 크기를 텍스트 길이로 추정 (대략적인 계산)
-                    estimated_text_length = int(file_size * 0.1)  # PDF의 약 10%가 텍스트라고 가정
-                else:
-                    estimated_text_length = 0
-                
-                # 이 PDF에서 생성된 노드 수 계산
-                pdf_nodes = neo4j_handler.get_nodes_by_source_id(pdf['pdf_id'], brain_id)
-                pdf_edges = neo4j_handler.get_edges_by_source_id(pdf['pdf_id'], brain_id)
-                
-                source_metrics.append({
-                    "source_id": pdf['pdf_id'],
-                    "source_type": "pdf",
-                    "title": pdf['pdf_title'],
-                    "text_length": estimated_text_length,
-                    "nodes_count": len(pdf_nodes),
-                    "edges_count": len(pdf_edges)
-                })
-                
-                total_text_length += estimated_text_length
-                
-            except Exception as e:
-                logging.error(f"PDF 메트릭 계산 오류 (ID: {pdf['pdf_id']}): {str(e)}")
-        
-        # TXT 소스들 조회
-        txts = db_handler.get_textfiles_by_brain(brain_id)
-        for txt in txts:
-            try:
-                # TXT 파일에서 실제 텍스트 길이 계산
-                import os
-                if os.path.exists(txt['txt_path']):
-                    with open(txt['txt_path'], 'r', encoding='utf-8') as f:
-                        text_content = f.read()
-                        text_length = len(text_content)
-                else:
-                    text_length = 0
-                
-                # 이 TXT에서 생성된 노드 수 계산
-                txt_nodes = neo4j_handler.get_nodes_by_source_id(txt['txt_id'], brain_id)
-                txt_edges = neo4j_handler.get_edges_by_source_id(txt['txt_id'], brain_id)
-                
-                source_metrics.append({
-                    "source_id": txt['txt_id'],
-                    "source_type": "txt",
-                    "title": txt['txt_title'],
-                    "text_length": text_length,
-                    "nodes_count": len(txt_nodes),
-                    "edges_count": len(txt_edges)
-                })
-                
-                total_text_length += text_length
-                
-            except Exception as e:
-                logging.error(f"TXT 메트릭 계산 오류 (ID: {txt['txt_id']}): {str(e)}")
-        
-        # MEMO 소스들 조회
-        memos = db_handler.get_memos_by_brain(brain_id, is_source=True)
-        for memo in memos:
-            try:
-                # 메모 텍스트 길이 계산
-                text_length = len(memo['memo_text'] or '')
-                
-                # 이 메모에서 생성된 노드 수 계산
-                memo_nodes = neo4j_handler.get_nodes_by_source_id(memo['memo_id'], brain_id)
-                memo_edges = neo4j_handler.get_edges_by_source_id(memo['memo_id'], brain_id)
-                
-                source_metrics.append({
-                    "source_id": memo['memo_id'],
-                    "source_type": "memo",
-                    "title": memo['memo_title'],
-                    "text_length": text_length,
-                    "nodes_count": len(memo_nodes),
-                    "edges_count": len(memo_edges)
-                })
-                
-                total_text_length += text_length
-                
-            except Exception as e:
-                logging.error(f"MEMO 메트릭 계산 오류 (ID: {memo['memo_id']}): {str(e)}")
-        
-        return {
-            "total_text_length": total_text_length,
-            "total_nodes": total_nodes,
-            "total_edges": total_edges,
-            "source_metrics": source_metrics
-        }
+        return await run_in_pool("db", _compute_source_data_metrics, brain_id, neo4j_handler)
         
     except AppException as ae:
         raise ae
@@ -442,10 +570,10 @@ async def get_source_count(brain_id: int):
     """
     db = SQLiteHandler()
     try:
-        pdfs = db.get_pdfs_by_brain(brain_id)
-        txts = db.get_textfiles_by_brain(brain_id)
-        mds = db.get_mds_by_brain(brain_id)
-        memos = db.get_memos_by_brain(brain_id, is_source=True)  # is_source가 True인 메모만 조회
+        pdfs = await run_in_pool("db", db.get_pdfs_by_brain, brain_id)
+        txts = await run_in_pool("db", db.get_textfiles_by_brain, brain_id)
+        mds = await run_in_pool("db", db.get_mds_by_brain, brain_id)
+        memos = await run_in_pool("db", db.get_memos_by_brain, brain_id, is_source=True)  # is_source가 True인 메모만 조회
         total_count = len(pdfs) + len(txts) + len(mds) + len(memos)
         return {
             "pdf_count": len(pdfs),
@@ -1,14 +1,16 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, status, Depends
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from sqlite_db import SQLiteHandler
 from neo4j_db.Neo4jHandler import Neo4jHandler
+from dependencies import get_neo4j_handler
+from services.executors import run_in_pool
+from services.answer_cache import answer_cache
 import logging
 import sqlite3
 from datetime import date
 
 sqlite_handler = SQLiteHandler()
-neo4j_handler = Neo4jHandler()
 
 router = APIRouter(
     prefix="/brains",
@@ -50,7 +52,9 @@ class BrainRename(BaseModel):
 )
 async def create_brain(brain: BrainCreate):
     try:
-        return sqlite_handler.create_brain(
+        return await run_in_pool(
+            "db",
+            sqlite_handler.create_brain,
             brain_name = brain.brain_name,
             created_at = date.today().isoformat()   # ← 오늘 날짜 자동 입력
         )
@@ -65,14 +69,14 @@ async def create_brain(brain: BrainCreate):
     summary="모든 브레인 조회", description="전체 브레인 목록을 반환합니다."
 )
 async def get_all_brains():
-    return sqlite_handler.get_all_brains()
+    return await run_in_pool("db", sqlite_handler.get_all_brains)
 
 @router.get(
     "/{brain_id}", response_model=BrainResponse,
     summary="특정 브레인 조회"
 )
 async def get_brain(brain_id: int):
-    rec = sqlite_handler.get_brain(brain_id)
+    rec = await run_in_pool("db", sqlite_handler.get_brain, brain_id)
     if not rec:
         raise HTTPException(404, "브레인을 찾을 수 없습니다")
     return rec
@@ -82,7 +86,7 @@ async def get_brain(brain_id: int):
     summary="브레인 수정", description="이름·아이콘·파일트리·생성일 중 필요한 필드만 갱신"
 )
 async def update_brain(brain_id: int, data: BrainUpdate):
-    origin = sqlite_handler.get_brain(brain_id)
+    origin = await run_in_pool("db", sqlite_handler.get_brain, brain_id)
     if not origin:
         raise HTTPException(404, "브레인을 찾을 수 없습니다")
 
@@ -91,11 +95,7 @@ async def update_brain(brain_id: int, data: BrainUpdate):
         return origin  # 변경 사항 없음
 
     try:
-        # 이름만 바꿀 때 기존 메서드 활용
-        if 'brain_name' in payload:
-            sqlite_handler.update_brain_name(brain_id, payload['brain_name'])
-        # 나머지 필드는 범용 update_brain(가변) 메서드로 처리
-        sqlite_handler.update_brain(brain_id, **payload)
+        await run_in_pool("db", sqlite_handler.update_brain, brain_id, **payload)
         origin.update(payload)
         return origin
     except Exception as e:
@@ -110,13 +110,13 @@ async def update_brain(brain_id: int, data: BrainUpdate):
 )
 async def rename_brain(brain_id: int, data: BrainRename):
     # 1) 기존 레코드 확인
-    origin = sqlite_handler.get_brain(brain_id)
+    origin = await run_in_pool("db", sqlite_handler.get_brain, brain_id)
     if not origin:
         raise HTTPException(status_code=404, detail="브레인을 찾을 수 없습니다")
 
     # 2) DB 업데이트
     try:
-        sqlite_handler.update_brain_name(brain_id, data.brain_name)
+        await run_in_pool("db", sqlite_handler.update_brain_name, brain_id, data.brain_name)
         origin["brain_name"] = data.brain_name
         return origin
     except sqlite3.IntegrityError:
@@ -129,17 +129,18 @@ async def rename_brain(brain_id: int, data: BrainRename):
     "/{brain_id}", status_code=status.HTTP_204_NO_CONTENT,
     summary="브레인 삭제"
 )
-async def delete_brain(brain_id: int):
+async def delete_brain(brain_id: int, neo4j_handler: Neo4jHandler = Depends(get_neo4j_handler)):
     try:
         # 1. Neo4j에서 brain_id에 해당하는 모든 description 삭제
-        neo4j_handler.delete_descriptions_by_brain_id(str(brain_id))
+        await run_in_pool("db", neo4j_handler.delete_descriptions_by_brain_id, str(brain_id))
         
         # 2. 벡터 DB에서 brain_id에 해당하는 컬렉션 전체 삭제
         from services.embedding_service import delete_collection
-        delete_collection(str(brain_id))
+        await run_in_pool("db", delete_collection, str(brain_id))
+        answer_cache.invalidate(brain_id)
         
         # 3. SQLite에서 brain 삭제
-        if not sqlite_handler.delete_brain(brain_id):
+        if not await run_in_pool("db", sqlite_handler.delete_brain, brain_id):
             raise HTTPException(404, "브레인을 찾을 수 없습니다")
             
     except Exception as e:
@@ -150,7 +151,7 @@ async def delete_brain(brain_id: int):
     status_code=status.HTTP_204_NO_CONTENT,
     summary="특정 source_id의 descriptions 삭제 및 임베딩 삭제"
 )
-async def delete_descriptions_by_source_id(brain_id: str, source_id: str):
+async def delete_descriptions_by_source_id(brain_id: str, source_id: str, neo4j_handler: Neo4jHandler = Depends(get_neo4j_handler)):
     """
     특정 source_id를 가진 description들을 삭제합니다.
     - Neo4j에서 해당 source_id를 가진 description들을 삭제하고, description이 비어있는 노드는 삭제합니다.
@@ -158,11 +159,14 @@ async def delete_descriptions_by_source_id(brain_id: str, source_id: str):
     """
     try:
         # 1. Neo4j에서 description 삭제
-        neo4j_handler.delete_descriptions_by_source_id(source_id, brain_id)
+        await run_in_pool("db", neo4j_handler.delete_descriptions_by_source_id, source_id, brain_id)
         
         # 2. 벡터 DB에서 임베딩 삭제
         from services.embedding_service import delete_node
-        delete_node(source_id, brain_id)
+        await run_in_pool("db", delete_node, source_id, brain_id)
+
+        # 3. 반영된 청크 기록 삭제 (다음 증분 재처리는 처음부터 처리)
+        await run_in_pool("db", sqlite_handler.delete_applied_chunks, source_id)
         
     except Exception as e:
         raise HTTPException(500, str(e))
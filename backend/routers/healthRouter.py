@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from services.model_registry import registry
+from services import embedding_service
+from services.executors import get_pool_stats, run_in_pool
+from services.llm_cache import llm_cache
+from services.answer_cache import answer_cache
+from neo4j_db.Neo4jHandler import Neo4jHandler, get_pool_metrics
+from dependencies import get_neo4j_handler
+
+router = APIRouter(
+    prefix="/health",
+    tags=["health"],
+    responses={404: {"description": "Not found"}}
+)
+
+@router.get("/live",
+    summary="프로세스 생존 확인",
+    description="모델 로딩 여부와 관계없이 서버 프로세스가 요청을 받을 수 있으면 200을 반환합니다.")
+async def liveness():
+    return {"status": "ok"}
+
+@router.get("/ready",
+    summary="모델 준비 상태 조회",
+    description="지연 로딩 레지스트리에 등록된 모델별 로드 여부를 반환합니다. warm-up 대상 모델이 모두 로드되었으면 200, 아니면 503입니다.")
+async def readiness():
+    """
+    반환값:
+    - **ready**: warm-up 대상 모델이 모두 로드되었는지 여부
+    - **models**: 모델별 loaded / load_seconds / error
+    - **embedding_cache**: 임베딩 캐시 hit/miss 통계
+    - **llm_cache**: LLM 추출 응답 캐시 hit/miss/eviction 통계
+    - **answer_cache**: 브레인별 시맨틱 답변 캐시 hit/miss/invalidation 통계
+    """
+    ready = registry.is_ready()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "ready": ready,
+            "models": registry.status(),
+            "embedding_cache": embedding_service.embedding_cache.stats(),
+            "llm_cache": llm_cache.stats(),
+            "answer_cache": answer_cache.stats()
+        }
+    )
+
+@router.get("/executors",
+    summary="워크로드별 실행 풀 메트릭 조회",
+    description="embedding / llm / db / asr 풀별 대기(queued)·실행(running) 작업 수와 평균 대기 시간을 반환합니다.")
+async def executor_metrics():
+    return get_pool_stats()
+
+@router.get("/neo4j",
+    summary="Neo4j 커넥션 풀 메트릭 조회",
+    description="공유 Neo4j 드라이버의 풀 설정과 세션 사용 통계를 반환합니다.")
+async def neo4j_pool_metrics():
+    return get_pool_metrics()
+
+@router.get("/neo4j/schema",
+    summary="Neo4j 스키마(인덱스/제약조건) 점검",
+    description="필요한 인덱스/제약조건 중 누락되었거나 아직 ONLINE이 아닌 항목을 반환합니다.")
+async def neo4j_schema_check(neo4j_handler: Neo4jHandler = Depends(get_neo4j_handler)):
+    return await run_in_pool("db", neo4j_handler.check_schema)
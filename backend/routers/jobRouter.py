@@ -0,0 +1,90 @@
+from fastapi import APIRouter, HTTPException, status
+from pydantic import BaseModel
+from typing import List, Optional, Dict, Any
+from models.request_models import ProcessTextRequest
+from sqlite_db import SQLiteHandler
+from services.executors import run_in_pool
+from services.ingest_service import ingest_workers
+import logging
+
+sqlite_handler = SQLiteHandler()
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["jobs"],
+    responses={404: {"description": "Not found"}}
+)
+
+# 작업 응답 모델
+class JobResponse(BaseModel):
+    job_id: int
+    brain_id: str
+    source_id: str
+    source_path: Optional[str] = None
+    use_cache: bool = True
+    source_kind: Optional[str] = None
+    status: str
+    stage: Optional[str]
+    progress: Dict[str, Any]
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    attempts: int
+    cancel_requested: bool
+    created_at: str
+    updated_at: str
+
+# 텍스트 처리 작업 등록
+@router.post("/process_text",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="텍스트 처리 작업 등록",
+    description="텍스트 처리(청킹 → 노드/엣지 추출 → Neo4j 저장 → 임베딩)를 백그라운드 작업으로 등록하고 job_id를 바로 반환합니다.")
+async def submit_process_text(request_data: ProcessTextRequest):
+    if not request_data.text:
+        raise HTTPException(status_code=400, detail="text 파라미터가 필요합니다.")
+    if not request_data.source_id:
+        raise HTTPException(status_code=400, detail="source_id 파라미터가 필요합니다.")
+    if not request_data.brain_id:
+        raise HTTPException(status_code=400, detail="brain_id 파라미터가 필요합니다.")
+    try:
+        job = await run_in_pool(
+            "db", sqlite_handler.create_job,
+            request_data.brain_id, request_data.source_id, request_data.text,
+            use_cache=request_data.use_cache, source_kind=request_data.source_kind
+        )
+        ingest_workers.notify()
+        return job
+    except Exception as e:
+        logging.error("작업 등록 오류: %s", str(e))
+        raise HTTPException(status_code=500, detail="내부 서버 오류")
+
+# 작업 목록 조회
+@router.get("/", response_model=List[JobResponse],
+    summary="작업 목록 조회",
+    description="brain_id / status(queued, running, succeeded, failed, cancelled)로 필터링한 작업 목록을 최신순으로 반환합니다.")
+async def get_jobs(brain_id: Optional[str] = None, status: Optional[str] = None, limit: int = 100):
+    return await run_in_pool("db", sqlite_handler.get_jobs, brain_id, status, limit)
+
+# 작업 상태 조회
+@router.get("/{job_id}", response_model=JobResponse,
+    summary="작업 상태 조회",
+    description="작업 상태, 현재 단계, 단계별(chunking, extraction, graph_write, embedding) 진행 상황을 반환합니다.")
+async def get_job(job_id: int):
+    job = await run_in_pool("db", sqlite_handler.get_job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    return job
+
+# 작업 취소
+@router.post("/{job_id}/cancel", response_model=JobResponse,
+    summary="작업 취소",
+    description="대기 중인 작업은 즉시 취소하고, 실행 중인 작업은 다음 단계로 넘어가기 전에 중단합니다.")
+async def cancel_job(job_id: int):
+    try:
+        job = await run_in_pool("db", sqlite_handler.cancel_job, job_id)
+    except RuntimeError as e:
+        logging.error("작업 취소 오류: %s", str(e))
+        raise HTTPException(status_code=500, detail="내부 서버 오류")
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    return job
@@ -3,7 +3,8 @@ from fastapi.responses import FileResponse
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from sqlite_db import SQLiteHandler
-import logging, uuid, os, re
+from services.upload_service import save_upload, UploadTooLargeError
+import logging, os, re
 
 sqlite_handler = SQLiteHandler()
 router = APIRouter(
@@ -130,19 +131,18 @@ async def upload_mdfiles(
                 continue
 
             safe_name = sanitize_filename(file.filename)
-            unique_name = f"{uuid.uuid4().hex}_{safe_name}"
-            file_path = os.path.join(UPLOAD_MD_DIR, unique_name)
-
-            with open(file_path, "wb") as f:
-                f.write(await file.read())
+            # 청크 단위 스트리밍 저장 (내용 해시 이름으로 저장되므로 같은 파일은 한 번만 저장)
+            saved = await save_upload(file, UPLOAD_MD_DIR, ".md")
 
             created = sqlite_handler.create_mdfile(
                 md_title=safe_name,
-                md_path=file_path,
+                md_path=saved["path"],
                 type="md",
                 brain_id=brain_id
             )
             uploaded_mdfiles.append(created)
+        except UploadTooLargeError as e:
+            logging.warning("MD 업로드 거부 (%s): %s", file.filename, e)
         except Exception as e:
             logging.error("MD 업로드 실패 (%s): %s", file.filename, e)
 
@@ -177,7 +177,7 @@ async def download_md_file(md_id: int):
         
         return FileResponse(
             path=file_path,
-            filename=os.path.basename(file_path),
+            filename=md_file['md_title'],
             media_type="text/markdown"
         )
     except Exception as e:
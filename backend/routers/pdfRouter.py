@@ -3,7 +3,11 @@ from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from sqlite_db import SQLiteHandler
-import logging, os, shutil, uuid, re
+from services.executors import run_in_pool
+from services.ingest_service import ingest_workers
+from services.upload_service import save_upload, UploadTooLargeError
+from routers.jobRouter import JobResponse
+import logging, os, shutil, re
 
 # DB 핸들러 초기화
 sqlite_handler = SQLiteHandler()
@@ -36,6 +40,14 @@ class PdfResponse(BaseModel):
     type: Optional[str]
     brain_id: Optional[int]
 
+class ChunkPageResponse(BaseModel):
+    chunk_index: int
+    chunk_hash: str
+    char_start: int
+    char_end: int
+    page_start: int
+    page_end: int
+
 # ───────── CREATE PDF ─────────
 @router.post("/", response_model=PdfResponse, status_code=status.HTTP_201_CREATED)
 async def create_pdf(pdf_data: PdfCreate):
@@ -110,7 +122,10 @@ async def delete_pdf(pdf_id: int):
 
     file_path = pdf["pdf_path"]
     try:
-        if os.path.exists(file_path):
+        # 같은 내용으로 업로드된 다른 PDF가 파일을 공유하고 있으면 남겨둠
+        if sqlite_handler.count_pdfs_by_path(file_path) > 0:
+            logging.info(f"다른 PDF가 사용 중인 파일이라 유지: {file_path}")
+        elif os.path.exists(file_path):
             os.remove(file_path)
             logging.info(f"✅ 로컬 파일 삭제 완료: {file_path}")
         else:
@@ -160,21 +175,54 @@ async def upload_pdfs(
                 continue
 
             safe_name = sanitize_filename(file.filename)
-            unique_name = f"{uuid.uuid4().hex}_{safe_name}"
-            file_path = os.path.join(UPLOAD_DIR, unique_name)
-
-            content = await file.read()
-            with open(file_path, "wb") as f:
-                f.write(content)
+            # 청크 단위 스트리밍 저장 (내용 해시 이름으로 저장되므로 같은 파일은 한 번만 저장)
+            saved = await save_upload(file, UPLOAD_DIR, ".pdf")
 
             created = sqlite_handler.create_pdf(
                 pdf_title=safe_name,
-                pdf_path=file_path,
+                pdf_path=saved["path"],
                 type="pdf",
                 brain_id=brain_id
             )
             uploaded_pdfs.append(created)
+        except UploadTooLargeError as e:
+            logging.warning("PDF 업로드 거부 (%s): %s", file.filename, e)
         except Exception as e:
             logging.error("PDF 업로드 실패 (%s): %s", file.filename, e)
 
     return uploaded_pdfs
+
+# ───────── 서버 측 텍스트 추출 + 그래프 처리 ─────────
+@router.post("/{pdf_id}/process", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED,
+    summary="업로드된 PDF 처리 작업 등록",
+    description="업로드된 PDF를 서버에서 페이지 단위로 읽어 청킹 → 노드/엣지 추출 → Neo4j 저장 → 임베딩하는 백그라운드 작업을 등록합니다.")
+async def process_pdf(pdf_id: int, use_cache: bool = True):
+    """
+    브라우저에서 PDF를 파싱해 텍스트를 보내는 대신, 저장된 파일을 ingest 워커가 직접 읽습니다.
+    진행 상황은 /jobs/{job_id}로 확인합니다.
+    use_cache=false면 LLM 응답 캐시와 청크 체크포인트를 사용하지 않고 다시 추출합니다.
+    """
+    pdf = await run_in_pool("db", sqlite_handler.get_pdf, pdf_id)
+    if not pdf:
+        raise HTTPException(status_code=404, detail="PDF를 찾을 수 없습니다")
+    if pdf["brain_id"] is None:
+        raise HTTPException(status_code=400, detail="brain_id가 없는 PDF는 처리할 수 없습니다")
+    if not os.path.exists(pdf["pdf_path"]):
+        raise HTTPException(status_code=404, detail="PDF 파일이 존재하지 않습니다")
+
+    try:
+        job = await run_in_pool(
+            "db", sqlite_handler.create_job,
+            pdf["brain_id"], pdf_id, "", pdf["pdf_path"], use_cache, "pdf"
+        )
+        ingest_workers.notify()
+        return job
+    except Exception as e:
+        logging.error("PDF 처리 작업 등록 오류: %s", e)
+        raise HTTPException(status_code=500, detail="내부 서버 오류")
+
+@router.get("/{pdf_id}/chunk_pages", response_model=List[ChunkPageResponse],
+    summary="PDF 청크별 페이지 매핑 조회",
+    description="서버에서 추출한 PDF의 청크마다 시작/끝 페이지와 문자 오프셋을 반환합니다.")
+async def get_pdf_chunk_pages(pdf_id: int):
+    return await run_in_pool("db", sqlite_handler.get_chunk_pages, pdf_id)
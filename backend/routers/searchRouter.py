@@ -1,9 +1,11 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import List, Dict
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
+from typing import List, Dict, Optional
 import logging
-from services import embedding_service
+from services.executors import run_in_pool
+from services.hybrid_search import hybrid_search
 from sqlite_db import SQLiteHandler
+from sqlite_db.search_index import SEARCH_KINDS
 
 router = APIRouter(
     prefix="/search",
@@ -14,67 +16,81 @@ router = APIRouter(
 class SearchRequest(BaseModel):
     query: str
     brain_id: str
+    k: int = Field(10, ge=1, le=100)  # 반환할 최대 source_id 수
+
+class HybridHit(BaseModel):
+    source_id: str
+    score: float                        # RRF 점수
+    lexical_rank: Optional[int] = None  # 키워드(BM25) 검색 순위
+    vector_rank: Optional[int] = None   # 벡터 검색 순위
 
 class SearchResponse(BaseModel):
     source_ids: List[str]  # 중복 제거된 source_id 목록
+    results: List[HybridHit] = []
+    timings: Dict[str, float] = {}  # lexical_ms, vector_ms, embedding_ms, vector_search_ms, fusion_ms, total_ms
+
+class SearchHit(BaseModel):
+    type: str               # memo / pdf / text / md / chat
+    id: int
+    title: Optional[str] = None
+    snippet: str            # 검색어가 <b>...</b>로 표시된 본문 일부
+    score: float            # BM25 점수 (클수록 관련도 높음)
+
+class TitleHit(BaseModel):
+    type: str
+    id: int
+    title: str
+
+@router.get("",
+    summary="전문 검색",
+    description="메모, 소스 파일(제목과 추출 텍스트), 채팅 메시지를 FTS5 색인으로 검색해 BM25 순위와 스니펫을 반환합니다.",
+    response_model=List[SearchHit])
+async def full_text_search(
+    q: str = Query(..., min_length=1, description="검색어 (공백으로 나눈 단어를 모두 포함하는 문서를 찾음)"),
+    brain_id: int = Query(..., description="브레인 ID"),
+    types: Optional[str] = Query(None, description="검색할 종류를 쉼표로 구분 (memo,pdf,text,md,chat)"),
+    limit: int = Query(20, ge=1, le=100, description="최대 결과 수")
+):
+    type_list = [t.strip() for t in types.split(",") if t.strip()] if types else None
+    unknown = set(type_list or []) - set(SEARCH_KINDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"알 수 없는 검색 종류: {', '.join(sorted(unknown))}")
+
+    db = SQLiteHandler()
+    return await run_in_pool("db", db.search_documents, q, brain_id, type_list, limit)
+
+@router.get("/titles",
+    summary="소스 제목 검색",
+    description="PDF와 텍스트 파일 제목에서 검색어를 찾습니다.",
+    response_model=List[TitleHit])
+async def search_titles(query: str = Query(..., min_length=1), brain_id: int = Query(...)):
+    db = SQLiteHandler()
+    return await run_in_pool("db", db.search_titles_by_query, query, brain_id)
 
 @router.post("/getSimilarSourceIds",
-    summary="유사도 기반 소스 검색",
-    description="입력된 설명이나 키워드와 유사한 문장을 벡터DB에서 찾아 해당 source_id들을 반환합니다.",
+    summary="하이브리드 소스 검색",
+    description="키워드(BM25) 검색과 벡터 검색을 동시에 실행하고 Reciprocal Rank Fusion으로 합친 source_id 순위를 반환합니다.",
     response_model=SearchResponse)
 async def search_similar_descriptions(request: SearchRequest):
     """
-    설명이나 키워드로 유사한 문장을 검색하고 source_id를 반환합니다:
+    설명이나 키워드로 관련 소스를 검색하고 source_id를 반환합니다:
     
     - **query**: 검색할 설명이나 키워드
     - **brain_id**: 브레인 ID
+    - **k**: 반환할 최대 source_id 수 (기본 10)
     
     반환값:
-    - **source_ids**: 유사도 순으로 정렬된 source_id 목록 (중복 제거됨)
+    - **source_ids**: 관련도 순으로 정렬된 source_id 목록 (중복 제거됨)
+    - **results**: source_id별 RRF 점수와 키워드/벡터 검색 순위
+    - **timings**: 단계별 소요 시간 (ms)
     """
-    logging.info(f"유사 문장 검색 시작 - query: {request.query}, brain_id: {request.brain_id}")
+    logging.info(f"하이브리드 검색 시작 - query: {request.query}, brain_id: {request.brain_id}, k: {request.k}")
     
     try:
-        # 1. 텍스트 기반 제목 검색 (우선)
-        db = SQLiteHandler()
-        title_results = db.search_titles_by_query(request.query, int(request.brain_id))
-        
-        # 제목 검색 결과의 source_id 추출 (숫자만)
-        title_source_ids = []
-        seen_ids = set()  # 중복 체크를 위한 set
-        
-        for result in title_results:
-            id_num = str(result['id'])
-            if id_num not in seen_ids:
-                seen_ids.add(id_num)
-                title_source_ids.append(id_num)
-        
-        # 2. 벡터 DB 검색
-        if not embedding_service.is_index_ready(request.brain_id):
-            embedding_service.initialize_collection(request.brain_id)
-            logging.info("Qdrant 컬렉션 초기화 완료: %s", request.brain_id)
-        
-        query_embedding = embedding_service.encode_text(request.query)
-        
-        similar_descriptions = embedding_service.search_similar_descriptions(
-            embedding=query_embedding,
-            brain_id=request.brain_id,
-            limit=10
-        )
-        
-        # 벡터 검색 결과의 source_id 추출
-        vector_source_ids = []
-        for desc in similar_descriptions:
-            source_id = desc["source_id"]
-            if source_id and source_id not in seen_ids:
-                seen_ids.add(source_id)
-                vector_source_ids.append(source_id)
-        
-        # 3. 결과 병합 (제목 검색 결과를 우선)
-        final_source_ids = title_source_ids + vector_source_ids
-        
-        logging.info(f"검색 결과: {len(final_source_ids)}개의 고유 source_id 발견")
-        return {"source_ids": final_source_ids}
+        result = await hybrid_search(request.query, request.brain_id, k=request.k)
+        source_ids = [item["source_id"] for item in result["results"]]
+        logging.info(f"검색 결과: {len(source_ids)}개의 고유 source_id 발견")
+        return {"source_ids": source_ids, **result}
         
     except Exception as e:
         logging.error("검색 오류: %s", str(e))
@@ -2,7 +2,8 @@ from fastapi import APIRouter, HTTPException, status, UploadFile, File, Form
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from sqlite_db import SQLiteHandler
-import logging, uuid, os, re
+from services.upload_service import save_upload, UploadTooLargeError
+import logging, os, re
 
 sqlite_handler = SQLiteHandler()
 router = APIRouter(
@@ -129,19 +130,18 @@ async def upload_textfiles(
                 continue
 
             safe_name = sanitize_filename(file.filename)
-            unique_name = f"{uuid.uuid4().hex}_{safe_name}"
-            file_path = os.path.join(UPLOAD_TXT_DIR, unique_name)
-
-            with open(file_path, "wb") as f:
-                f.write(await file.read())
+            # 청크 단위 스트리밍 저장 (내용 해시 이름으로 저장되므로 같은 파일은 한 번만 저장)
+            saved = await save_upload(file, UPLOAD_TXT_DIR, ".txt")
 
             created = sqlite_handler.create_textfile(
                 txt_title=safe_name,
-                txt_path=file_path,
+                txt_path=saved["path"],
                 type="txt",
                 brain_id=brain_id
             )
             uploaded_textfiles.append(created)
+        except UploadTooLargeError as e:
+            logging.warning("TXT 업로드 거부 (%s): %s", file.filename, e)
         except Exception as e:
             logging.error("TXT 업로드 실패 (%s): %s", file.filename, e)
 
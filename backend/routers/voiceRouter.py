@@ -4,6 +4,7 @@ import tempfile
 import os
 import logging
 from services.voiceService import transcribe
+from services.executors import run_in_pool
 
 router = APIRouter(prefix="/voices", tags=["Voice Transcription"])
 
@@ -24,8 +25,8 @@ async def transcribe_audio(file: UploadFile = File(...)):
             tmp_file_path = tmp_file.name
         
         try:
-            # 음성 변환 실행
-            transcribed_text = transcribe(tmp_file_path)
+            # 음성 변환 실행 (ASR 전용 풀에서 실행해 이벤트 루프를 막지 않음)
+            transcribed_text = await run_in_pool("asr", transcribe, tmp_file_path)
             
             return JSONResponse(content={
                 "text": transcribed_text,
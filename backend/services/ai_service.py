@@ -1,6 +1,6 @@
 # services/ai_service.py
 from abc import ABC, abstractmethod
-from typing import List, Dict, Tuple
+from typing import List, Dict, Iterator, Tuple
 
 #BaseAIService : AIService 클래스들의 기능을 모아놓은 추상 클래스입니다.
 class BaseAIService(ABC):
@@ -12,6 +12,10 @@ class BaseAIService(ABC):
     def generate_answer(self, schema_text: str, question: str) -> str:
         """스키마+질문 → 답변"""
 
+    def generate_answer_stream(self, schema_text: str, question: str) -> Iterator[str]:
+        """스키마+질문 → 답변 토큰 스트림 (기본 구현은 generate_answer 결과를 한 번에 반환)"""
+        yield self.generate_answer(schema_text, question)
+
     @abstractmethod
     def generate_schema_text(
         self, nodes: List[Dict], related_nodes: List[Dict], relationships: List
@@ -29,7 +33,13 @@ class BaseAIService(ABC):
 import logging
 from openai import OpenAI           # OpenAI 클라이언트 임포트
 import json
-from .chunk_service import chunk_text
+import hashlib
+from .chunk_service import iter_chunks
+from .chunk_checkpoint import extract_chunks
+from .llm_cache import llm_cache
+from .llm_concurrency import call_with_backoff
+from .answer_stream import parse_referenced_nodes
+from .node_merge import merge_nodes_and_edges
 from typing import List
 
 import os
@@ -47,6 +57,30 @@ if not openai_api_key:
 client = OpenAI(api_key=openai_api_key)
 
 
+# ✅ 노드/엣지 추출 프롬프트 (청크 텍스트는 뒤에 붙여서 사용)
+EXTRACTION_MODEL = "gpt-4o"
+EXTRACTION_SYSTEM_PROMPT = "너는 텍스트에서 구조화된 노드와 엣지를 추출하는 전문가야. 엣지의 source와 target은 반드시 노드의 name을 참조해야 해."
+EXTRACTION_PROMPT = (
+    "다음 텍스트를 분석해서 노드와 엣지 정보를 추출해줘. "
+    "노드는 { \"label\": string, \"name\": string, \"description\": string } 형식의 객체 배열, "
+    "엣지는 { \"source\": string, \"target\": string, \"relation\": string } 형식의 객체 배열로 출력해줘. "
+    "여기서 source와 target은 노드의 name을 참조해야 하고, source_id는 사용하면 안 돼. "
+    "출력 결과는 반드시 아래 JSON 형식을 준수해야 해:\n"
+    "{\n"
+    '  "nodes": [ ... ],\n'
+    '  "edges": [ ... ]\n'
+    "}\n"
+    "문장에 있는 모든 개념을 노드로 만들어줘"
+    "각 노드의 description은 해당 노드를 간단히 설명하는 문장이어야 해. "
+    "만약 텍스트 내에 하나의 긴 description에 여러 개념이 섞여 있다면, 반드시 개념 단위로 나누어 여러 노드를 생성해줘. "
+    "description은 하나의 개념에 대한 설명만 들어가야 해"
+    "노드의 label과 name은 한글로 표현하고, 불필요한 내용이나 텍스트에 없는 정보는 추가하지 말아줘. "
+    "노드와 엣지 정보가 추출되지 않으면 빈 배열을 출력해줘.\n\n"
+    "json 형식 외에는 출력 금지"
+)
+# 프롬프트가 바뀌면 버전도 바뀌어 이전 체크포인트를 재사용하지 않음
+PROMPT_VERSION = hashlib.sha256((EXTRACTION_SYSTEM_PROMPT + EXTRACTION_PROMPT).encode("utf-8")).hexdigest()[:12]
+
 
 def extract_referenced_nodes(llm_response: str) -> List[str]:
     """
@@ -59,170 +93,128 @@ def extract_referenced_nodes(llm_response: str) -> List[str]:
     if len(parts) < 2:
         return []
 
-    json_part = parts[-1].strip()
-    try:
-        payload = json.loads(json_part)
-        # payload가 리스트인 경우 빈 리스트 반환
-        if isinstance(payload, list):
-            return []
-        # payload가 딕셔너리인 경우에만 get() 호출
-        raw_nodes = payload.get("referenced_nodes", [])
-        cleaned = [
-            node.split("-", 1)[1] if "-" in node else node
-            for node in raw_nodes
-        ]
-        return cleaned
-    except json.JSONDecodeError:
-        return []
+    return parse_referenced_nodes(parts[-1]) or []
+
+def split_into_chunks(text: str) -> List[str]:
+    """텍스트를 OpenAI 토큰 예산에 맞춰 문장 단위로 청킹합니다. (예산 이하이면 청크 하나)"""
+    return [chunk.text for chunk in iter_chunks(text, provider="openai")] or [text]
 
-def extract_graph_components(text: str, source_id: str):
+def extract_graph_components(text: str, source_id: str, chunks: List[str] = None, on_chunk_done=None, use_cache: bool = True):
     """
     입력 텍스트에서 LLM을 활용해 노드와 엣지 정보를 추출합니다.
-    텍스트가 2000자 이상인 경우 청킹하여 처리합니다.
+    텍스트가 토큰 예산(CHUNK_TOKENS_OPENAI)보다 길면 문장 단위로 청킹하여 처리합니다.
+    - chunks: 이미 분할한 청크가 있으면 그대로 사용
+    - on_chunk_done: 청크 하나의 추출이 끝날 때마다 호출되는 콜백 (인자 없음, 진행률 표시용)
+    - use_cache: False면 LLM 응답 캐시와 청크 체크포인트를 건너뛰고 항상 모델을 호출
     반환 형식: (nodes: list, edges: list)
     """
-    # 모든 노드와 엣지를 저장할 리스트
-    all_nodes = []
-    all_edges = []
-    
-    # 텍스트가 2000자 이상이면 청킹
-    if len(text) >= 2000:
-        chunks = chunk_text(text)
+    if chunks is None:
+        chunks = split_into_chunks(text)
+    if len(chunks) > 1:
         logging.info(f"✅ 텍스트가 {len(chunks)}개의 청크로 분할되어 처리됩니다.")
-        
-        # 각 청크별로 노드와 엣지 추출
-        for i, chunk in enumerate(chunks, 1):
-            logging.info(f"청크 {i}/{len(chunks)} 처리 중...")
-            nodes, edges = _extract_from_chunk(chunk, source_id)
-            all_nodes.extend(nodes)
-            all_edges.extend(edges)
-    else:
-        # 2000자 미만이면 직접 처리
-        all_nodes, all_edges = _extract_from_chunk(text, source_id)
-    
-    # 중복 제거
-    all_nodes = _remove_duplicate_nodes(all_nodes)
-    all_edges = _remove_duplicate_edges(all_edges)
+
+    results, _ = extract_chunk_results(chunks, source_id, on_chunk_done, use_cache)
+    all_nodes, all_edges = merge_chunk_results(results)
     
     logging.info(f"✅ 총 {len(all_nodes)}개의 노드와 {len(all_edges)}개의 엣지가 추출되었습니다.")
     return all_nodes, all_edges
 
-def _extract_from_chunk(chunk: str, source_id: str):
-    """개별 청크에서 노드와 엣지 정보를 추출합니다."""
-    prompt = (
-    "다음 텍스트를 분석해서 노드와 엣지 정보를 추출해줘. "
-    "노드는 { \"label\": string, \"name\": string, \"description\": string } 형식의 객체 배열, "
-    "엣지는 { \"source\": string, \"target\": string, \"relation\": string } 형식의 객체 배열로 출력해줘. "
-    "여기서 source와 target은 노드의 name을 참조해야 하고, source_id는 사용하면 안 돼. "
-    "출력 결과는 반드시 아래 JSON 형식을 준수해야 해:\n"
-    "{\n"
-    '  "nodes": [ ... ],\n'
-    '  "edges": [ ... ]\n'
-    "}\n"
-    "문장에 있는 모든 개념을 노드로 만들어줘"
-    "각 노드의 description은 해당 노드를 간단히 설명하는 문장이어야 해. "
-    "만약 텍스트 내에 하나의 긴 description에 여러 개념이 섞여 있다면, 반드시 개념 단위로 나누어 여러 노드를 생성해줘. "
-    "description은 하나의 개념에 대한 설명만 들어가야 해"
-    "노드의 label과 name은 한글로 표현하고, 불필요한 내용이나 텍스트에 없는 정보는 추가하지 말아줘. "
-    "노드와 엣지 정보가 추출되지 않으면 빈 배열을 출력해줘.\n\n"
-    "json 형식 외에는 출력 금지"
-    f"텍스트: {chunk}"
+def extract_chunk_results(chunks: List[str], source_id: str, on_chunk_done=None, use_cache: bool = True) -> Tuple[List[Tuple[List[Dict], List[Dict]]], List[int]]:
+    """
+    청크별 (nodes, edges)를 청크 순서대로, 추출에 실패한 청크 인덱스와 함께 반환합니다. (병합/중복 제거 전)
+    각 청크를 동시성 한도 안에서 병렬로 추출하고,
+    이전에 성공한 청크는 체크포인트에서 재사용해 실패했거나 바뀐 청크만 다시 추출합니다.
+    """
+    return extract_chunks(
+        chunks, source_id, "openai", EXTRACTION_MODEL, PROMPT_VERSION,
+        lambda chunk: _request_chunk_extraction(chunk, source_id, use_cache), on_chunk_done, use_cache
     )
-    try:
-        completion = client.chat.completions.create(
-            model="gpt-4o",
+
+def merge_chunk_results(results) -> Tuple[List[Dict], List[Dict]]:
+    """청크별 결과를 청크 순서대로 합치고 중복/유사 노드와 중복 엣지를 병합합니다."""
+    # 모든 노드와 엣지를 저장할 리스트
+    all_nodes = []
+    all_edges = []
+    for nodes, edges in results:
+        all_nodes.extend(nodes)
+        all_edges.extend(edges)
+    
+    # 중복 제거 (+ 설정 시 유사 엔티티 병합)
+    return merge_nodes_and_edges(all_nodes, all_edges)
+
+def _request_chunk_extraction(chunk: str, source_id: str, use_cache: bool = True):
+    """
+    개별 청크에서 노드와 엣지 정보를 추출합니다. 실패하면 예외를 그대로 발생시킵니다.
+    같은 청크/프롬프트/모델의 응답이 캐시에 있으면 LLM을 호출하지 않습니다.
+    """
+    content = llm_cache.get("openai", EXTRACTION_MODEL, PROMPT_VERSION, chunk, use_cache)
+    cached = content is not None
+    if not cached:
+        prompt = EXTRACTION_PROMPT + f"텍스트: {chunk}"
+        # rate limit(429) 등 일시적 오류는 백오프 후 재시도
+        completion = call_with_backoff(lambda: client.chat.completions.create(
+            model=EXTRACTION_MODEL,
             messages=[
-                {"role": "system", "content": "너는 텍스트에서 구조화된 노드와 엣지를 추출하는 전문가야. 엣지의 source와 target은 반드시 노드의 name을 참조해야 해."},
+                {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
             max_tokens=5000,
             temperature=0.3,
             # JSON만 돌려주도록 강제
             response_format={"type": "json_object"}
-        )
+        ), "openai")
 
-        # print("response: ", response)
-        # data = json.loads(response)
-        # print("data: ", data)
-         # ⬇️  문자열만 추출!
+        # ⬇️  문자열만 추출!
         content = completion.choices[0].message.content.strip()
-        data = json.loads(content)
+    data = json.loads(content)
+    # 파싱에 성공한 응답만 캐시에 저장
+    if not cached:
+        llm_cache.put("openai", EXTRACTION_MODEL, PROMPT_VERSION, chunk, content, use_cache)
+        
+        
+    # 각 노드에 source_id 추가 및 구조 검증
+    valid_nodes = []
+    for node in data.get("nodes", []):
+        # 필수 필드 검증
+        if not all(key in node for key in ["label", "name"]):
+            logging.warning("필수 필드가 누락된 노드: %s", node)
+            continue
             
+        # descriptions 필드 초기화
+        if "descriptions" not in node:
+            node["descriptions"] = []
             
-        # 각 노드에 source_id 추가 및 구조 검증
-        valid_nodes = []
-        for node in data.get("nodes", []):
-            # 필수 필드 검증
-            if not all(key in node for key in ["label", "name"]):
-                logging.warning("필수 필드가 누락된 노드: %s", node)
-                continue
-                
-            # descriptions 필드 초기화
-            if "descriptions" not in node:
-                node["descriptions"] = []
-                
-            # source_id 추가
-            node["source_id"] = source_id
-            
-            # description 처리
-            if "description" in node:
-                node["descriptions"].append({
-                    "description": node["description"],
-                    "source_id": source_id  # 각 description에도 source_id 추가
-                })
-                del node["description"]
-                
-            valid_nodes.append(node)
+        # source_id 추가
+        node["source_id"] = source_id
         
-        # 엣지의 source와 target이 노드의 name을 참조하는지 검증
-        valid_edges = []
-        node_names = {node["name"] for node in valid_nodes}
-        for edge in data.get("edges", []):
-            if "source" in edge and "target" in edge and "relation" in edge:
-                if edge["source"] in node_names and edge["target"] in node_names:
-                    valid_edges.append(edge)
-                else:
-                    logging.warning("잘못된 엣지 참조: %s", edge)
+        # description 처리
+        if "description" in node:
+            node["descriptions"].append({
+                "description": node["description"],
+                "source_id": source_id  # 각 description에도 source_id 추가
+            })
+            del node["description"]
+            
+        valid_nodes.append(node)
+    
+    # 엣지의 source와 target이 노드의 name을 참조하는지 검증
+    valid_edges = []
+    node_names = {node["name"] for node in valid_nodes}
+    for edge in data.get("edges", []):
+        if "source" in edge and "target" in edge and "relation" in edge:
+            if edge["source"] in node_names and edge["target"] in node_names:
+                edge["source_id"] = source_id
+                valid_edges.append(edge)
             else:
-                logging.warning("필수 필드가 누락된 엣지: %s", edge)
-        
-        return valid_nodes, valid_edges
-    except Exception as e:
-        logging.error(f"청크 처리 중 오류 발생: {str(e)}")
-        return [], []
-
-def _remove_duplicate_nodes(nodes: list) -> list:
-    """중복된 노드를 제거합니다."""
-    seen = set()
-    unique_nodes = []
-    for node in nodes:
-        node_key = (node["name"], node["label"])
-        if node_key not in seen:
-            seen.add(node_key)
-            unique_nodes.append(node)
+                logging.warning("잘못된 엣지 참조: %s", edge)
         else:
-            # 같은 이름의 노드가 있으면 descriptions만 추가
-            for existing_node in unique_nodes:
-                if existing_node["name"] == node["name"] and existing_node["label"] == node["label"]:
-                    existing_node["descriptions"].extend(node["descriptions"])
-    return unique_nodes
-
-def _remove_duplicate_edges(edges: list) -> list:
-    """중복된 엣지를 제거합니다."""
-    seen = set()
-    unique_edges = []
-    for edge in edges:
-        edge_key = (edge["source"], edge["target"], edge["relation"])
-        if edge_key not in seen:
-            seen.add(edge_key)
-            unique_edges.append(edge)
-    return unique_edges
+            logging.warning("필수 필드가 누락된 엣지: %s", edge)
+    
+    return valid_nodes, valid_edges
 
-def generate_answer(schema_text: str, question: str) -> str:
-    """
-    스키마 텍스트와 질문을 기반으로 AI를 호출하여 최종 답변을 생성합니다.
-    """
-    prompt = (
+def _build_answer_prompt(schema_text: str, question: str) -> str:
+    """답변 생성 프롬프트 (본문 뒤에 EOF와 referenced_nodes JSON을 붙이도록 지시)"""
+    return (
     "다음 스키마와 질문을 바탕으로, 스키마에 명시된 정보나 연결된 관계를 통해 추론 가능한 범위 내에서만 자연어로 답변해줘. "
     "정보가 일부라도 있다면 해당 범위 내에서 최대한 설명하고, 스키마와 완전히 무관한 경우에만 '지식그래프에 해당 정보가 없습니다.'라고 출력해. "
     "스키마:\n" + schema_text + "\n\n"
@@ -237,6 +229,11 @@ def generate_answer(schema_text: str, question: str) -> str:
     "※ 반드시    EOF를 출력해"
     )
 
+def generate_answer(schema_text: str, question: str) -> str:
+    """
+    스키마 텍스트와 질문을 기반으로 AI를 호출하여 최종 답변을 생성합니다.
+    """
+    prompt = _build_answer_prompt(schema_text, question)
 
     try:
     
@@ -252,6 +249,31 @@ def generate_answer(schema_text: str, question: str) -> str:
     except Exception as e:
         logging.error("GPT 응답 오류: %s", str(e))
         raise RuntimeError("GPT 응답 생성 중 오류 발생")
+
+def generate_answer_stream(schema_text: str, question: str) -> Iterator[str]:
+    """
+    generate_answer의 스트리밍 버전. 모델이 생성하는 토큰 조각을 도착하는 대로 반환합니다.
+    (EOF 이후의 referenced_nodes 블록도 그대로 포함되므로 AnswerStreamParser로 나눠서 사용)
+    """
+    prompt = _build_answer_prompt(schema_text, question)
+    try:
+        # 첫 토큰 전(요청 생성 단계)의 일시적 오류만 재시도
+        stream = call_with_backoff(lambda: client.chat.completions.create(
+            model="gpt-4o",
+            messages=[{"role": "user", "content": prompt}],
+            stream=True
+        ), "openai")
+    except Exception as e:
+        logging.error("GPT 스트리밍 응답 오류: %s", str(e))
+        raise RuntimeError("GPT 응답 생성 중 오류 발생")
+
+    with stream:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
 import json
 import logging
 
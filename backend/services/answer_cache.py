@@ -0,0 +1,177 @@
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .graph_version import get_graph_version
+
+# ================================================
+# 브레인별 시맨틱 답변 캐시
+# ================================================
+# /brainGraph/answer에서 이미 계산한 질문 임베딩으로 같은 브레인의 이전 질문들과 코사인 유사도를 비교해,
+# 임계값 이상이고 그 사이 그래프 버전이 바뀌지 않았다면 저장된 답변을 그대로 돌려줍니다.
+# 그래프 버전이 바뀌면 해당 브레인의 항목은 조회 시점에 모두 버립니다.
+
+# true가 아니면 조회/저장하지 않음
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+# 캐시 hit로 볼 최소 코사인 유사도
+ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.97"))
+# 브레인당 최대 항목 수 (넘으면 가장 오래 사용하지 않은 항목부터 삭제)
+ANSWER_CACHE_MAX_PER_BRAIN = int(os.getenv("ANSWER_CACHE_MAX_PER_BRAIN", "256"))
+# 항목 유효 기간 (초, 기본 1일)
+ANSWER_CACHE_TTL = float(os.getenv("ANSWER_CACHE_TTL", str(24 * 3600)))
+
+
+def _normalize(embedding) -> np.ndarray:
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm > 0 else vector
+
+
+class _BrainEntries:
+    """한 브레인의 캐시 항목 (정규화된 질문 임베딩 행렬 + 답변 목록)"""
+
+    def __init__(self, version: int):
+        self.version = version
+        self.matrix: Optional[np.ndarray] = None
+        self.items: List[Dict] = []
+
+
+class SemanticAnswerCache:
+    """
+    브레인별로 (질문 임베딩, 답변, 참고 노드, 그래프 버전)을 저장하는 메모리 캐시
+    - lookup은 현재 그래프 버전과 다른 항목을 버린 뒤 코사인 유사도가 가장 높은 항목을 찾습니다.
+    - store는 답변 계산을 시작할 때 읽은 버전을 받으므로, 계산 도중 그래프가 바뀌면 저장되지 않습니다.
+    """
+
+    def __init__(
+        self,
+        threshold: float = ANSWER_CACHE_THRESHOLD,
+        max_per_brain: int = ANSWER_CACHE_MAX_PER_BRAIN,
+        ttl_seconds: float = ANSWER_CACHE_TTL,
+        enabled: bool = ANSWER_CACHE_ENABLED
+    ):
+        self.threshold = threshold
+        self.max_per_brain = max_per_brain
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._brains: Dict[str, _BrainEntries] = {}
+        self._counters = {"hits": 0, "misses": 0, "invalidations": 0, "writes": 0, "evictions": 0, "stale_writes": 0}
+
+    def _entries(self, brain_id: str, version: int) -> _BrainEntries:
+        """브레인 항목을 반환합니다. 버전이 바뀌었으면 비웁니다. (lock 보유 상태에서 호출)"""
+        entries = self._brains.get(brain_id)
+        if entries is None or entries.version != version:
+            if entries is not None and entries.items:
+                self._counters["invalidations"] += len(entries.items)
+            entries = _BrainEntries(version)
+            self._brains[brain_id] = entries
+        return entries
+
+    def _drop(self, entries: _BrainEntries, indexes: List[int]) -> None:
+        """지정한 위치의 항목을 삭제합니다. (lock 보유 상태에서 호출)"""
+        if not indexes:
+            return
+        keep = [i for i in range(len(entries.items)) if i not in set(indexes)]
+        entries.items = [entries.items[i] for i in keep]
+        entries.matrix = entries.matrix[keep] if keep else None
+
+    def lookup(self, brain_id, embedding) -> Optional[Dict]:
+        """
+        유사한 이전 질문의 답변을 찾습니다.
+        Returns:
+            {"answer", "referenced_nodes", "question", "similarity"} 또는 None
+        """
+        if not self.enabled:
+            return None
+        brain_id = str(brain_id)
+        query = _normalize(embedding)
+        version = get_graph_version(brain_id)
+        now = time.time()
+        with self._lock:
+            entries = self._entries(brain_id, version)
+            expired = [i for i, item in enumerate(entries.items) if now - item["created_at"] > self.ttl_seconds]
+            self._drop(entries, expired)
+            self._counters["evictions"] += len(expired)
+            if entries.matrix is None or entries.matrix.shape[1] != query.shape[0]:
+                self._counters["misses"] += 1
+                return None
+            similarities = entries.matrix @ query
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            if similarity < self.threshold:
+                self._counters["misses"] += 1
+                return None
+            item = entries.items[best]
+            item["last_used"] = now
+            self._counters["hits"] += 1
+            return {
+                "answer": item["answer"],
+                "referenced_nodes": list(item["referenced_nodes"]),
+                "question": item["question"],
+                "similarity": similarity
+            }
+
+    def store(self, brain_id, version: int, question: str, embedding, answer: str, referenced_nodes: List[str]) -> bool:
+        """
+        답변을 저장합니다.
+        Args:
+            version: 답변 계산을 시작할 때 get_graph_version()으로 읽은 버전
+        Returns:
+            저장 여부 (계산 도중 그래프 버전이 바뀌었으면 False)
+        """
+        if not self.enabled:
+            return False
+        brain_id = str(brain_id)
+        vector = _normalize(embedding)
+        now = time.time()
+        with self._lock:
+            if get_graph_version(brain_id) != version:
+                self._counters["stale_writes"] += 1
+                return False
+            entries = self._entries(brain_id, version)
+            if entries.matrix is not None and entries.matrix.shape[1] != vector.shape[0]:
+                entries = _BrainEntries(version)
+                self._brains[brain_id] = entries
+            if len(entries.items) >= self.max_per_brain:
+                oldest = min(range(len(entries.items)), key=lambda i: entries.items[i]["last_used"])
+                self._drop(entries, [oldest])
+                self._counters["evictions"] += 1
+            entries.items.append({
+                "question": question,
+                "answer": answer,
+                "referenced_nodes": list(referenced_nodes or []),
+                "created_at": now,
+                "last_used": now
+            })
+            row = vector[np.newaxis, :]
+            entries.matrix = row if entries.matrix is None else np.vstack([entries.matrix, row])
+            self._counters["writes"] += 1
+            return True
+
+    def invalidate(self, brain_id) -> None:
+        """브레인의 항목을 모두 삭제합니다."""
+        with self._lock:
+            entries = self._brains.pop(str(brain_id), None)
+            if entries is not None:
+                self._counters["invalidations"] += len(entries.items)
+
+    def stats(self) -> Dict:
+        """hit/miss 카운터와 브레인별 항목 수를 반환합니다."""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": self._counters["hits"] / lookups if lookups else 0.0,
+                "entries": sum(len(entries.items) for entries in self._brains.values()),
+                "brains": len(self._brains),
+                "threshold": self.threshold,
+                "enabled": self.enabled
+            }
+
+
+# 프로세스 전체에서 공유하는 답변 캐시
+answer_cache = SemanticAnswerCache()
@@ -0,0 +1,82 @@
+import json
+from typing import List, Optional
+
+# ================================================
+# 스트리밍 답변 파서
+# ================================================
+# LLM 답변은 "본문 ... EOF {"referenced_nodes": [...]}" 형식으로 끝납니다.
+# 토큰이 들어오는 대로 본문은 바로 내보내고, EOF 이후는 referenced_nodes JSON으로 모아 파싱합니다.
+# "EOF"가 토큰 경계에 걸쳐 나뉘어 올 수 있으므로 본문 끝의 몇 글자는 다음 토큰이 올 때까지 보류합니다.
+
+EOF_MARKER = "EOF"
+
+
+def parse_referenced_nodes(json_part: str) -> Optional[List[str]]:
+    """
+    EOF 뒤의 JSON에서 referenced_nodes를 꺼내 '레이블-노드' 형식이면 노드 이름만 남깁니다.
+    JSON이 아직 완성되지 않았거나 잘못되었으면 None
+    """
+    try:
+        payload = json.loads(json_part.strip())
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(payload, dict):
+        return []
+    raw_nodes = payload.get("referenced_nodes", [])
+    return [
+        node.split("-", 1)[1] if "-" in node else node
+        for node in raw_nodes
+    ]
+
+
+class AnswerStreamParser:
+    """
+    토큰 단위로 feed()하면 사용자에게 보여줄 본문 조각을 반환합니다.
+    - EOF 이전: 본문 조각 반환 (EOF 일부일 수 있는 끝 글자는 보류)
+    - EOF 이후: 빈 문자열 반환, JSON이 완성되는 즉시 referenced_nodes 채움
+    """
+
+    def __init__(self):
+        self._pending = ""
+        self._tail = ""
+        self.answer = ""
+        self.eof_seen = False
+        self.referenced_nodes: Optional[List[str]] = None
+
+    def feed(self, token: str) -> str:
+        if self.eof_seen:
+            self._tail += token
+            if self.referenced_nodes is None and "}" in token:
+                self.referenced_nodes = parse_referenced_nodes(self._tail)
+            return ""
+
+        self._pending += token
+        index = self._pending.find(EOF_MARKER)
+        if index >= 0:
+            self.eof_seen = True
+            text = self._pending[:index]
+            self._tail = self._pending[index + len(EOF_MARKER):]
+            self._pending = ""
+            self.referenced_nodes = parse_referenced_nodes(self._tail) if "}" in self._tail else None
+        else:
+            # EOF_MARKER의 앞부분과 겹칠 수 있는 끝 글자만 남기고 내보냄
+            keep = 0
+            for size in range(len(EOF_MARKER) - 1, 0, -1):
+                if self._pending.endswith(EOF_MARKER[:size]):
+                    keep = size
+                    break
+            text = self._pending[:len(self._pending) - keep]
+            self._pending = self._pending[len(self._pending) - keep:]
+        self.answer += text
+        return text
+
+    def finish(self) -> str:
+        """스트림 종료 시 보류한 본문을 내보내고 referenced_nodes를 확정합니다."""
+        text = self._pending
+        self._pending = ""
+        self.answer += text
+        if self.referenced_nodes is None:
+            self.referenced_nodes = parse_referenced_nodes(self._tail) if self.eof_seen else []
+            if self.referenced_nodes is None:
+                self.referenced_nodes = []
+        return text
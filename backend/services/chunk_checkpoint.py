@@ -0,0 +1,73 @@
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlite_db import SQLiteHandler
+from .chunk_service import chunk_hash
+from .llm_concurrency import map_in_order
+
+# ================================================
+# 청크별 추출 체크포인트
+# ================================================
+# 청크마다 추출 결과를 (source_id, 청크 해시, 모델, 프롬프트 버전) 키로 저장해 두고,
+# 같은 소스를 다시 처리할 때는 실패했거나 내용이 바뀐 청크만 LLM에 다시 보냅니다.
+
+ChunkResult = Tuple[List[Dict], List[Dict]]
+
+_db = SQLiteHandler()
+
+
+def extract_chunks(
+    chunks: List[str],
+    source_id: str,
+    provider: str,
+    model: str,
+    prompt_version: str,
+    extract_fn: Callable[[str], ChunkResult],
+    on_chunk_done: Optional[Callable[[], None]] = None,
+    use_cache: bool = True
+) -> Tuple[List[ChunkResult], List[int]]:
+    """
+    청크 목록을 체크포인트를 활용해 추출합니다.
+    Args:
+        extract_fn: 청크 하나를 추출하는 함수. 실패하면 예외를 발생시켜야 함
+        on_chunk_done: 청크 하나가 끝날 때마다(재사용 포함) 호출되는 콜백
+        use_cache: False면 저장된 체크포인트를 재사용하지 않고 모든 청크를 다시 추출 (체크포인트는 덮어씀)
+    Returns:
+        (청크 순서대로 (nodes, edges) 리스트, 추출에 실패한 청크 인덱스 리스트)
+        실패한 청크의 결과는 ([], [])
+    """
+    hashes = [chunk_hash(chunk) for chunk in chunks]
+    saved = _db.get_chunk_checkpoints(source_id, hashes, model, prompt_version) if use_cache else {}
+
+    failed: List[int] = []
+
+    def run(index: int) -> ChunkResult:
+        checkpoint = saved.get(hashes[index])
+        if checkpoint is not None:
+            result = checkpoint["nodes"], checkpoint["edges"]
+        else:
+            try:
+                result = extract_fn(chunks[index])
+                _db.save_chunk_checkpoint(
+                    source_id, hashes[index], model, prompt_version, index,
+                    nodes=result[0], edges=result[1]
+                )
+            except Exception as e:
+                logging.error("청크 %d 추출 실패 (source_id=%s): %s", index, source_id, str(e))
+                _db.save_chunk_checkpoint(
+                    source_id, hashes[index], model, prompt_version, index, error=str(e)
+                )
+                failed.append(index)
+                result = [], []
+        if on_chunk_done:
+            on_chunk_done()
+        return result
+
+    results = map_in_order(provider, run, list(range(len(chunks))))
+
+    reused = sum(1 for h in hashes if h in saved)
+    if reused:
+        logging.info("✅ 체크포인트 재사용: %d/%d개 청크 (source_id=%s)", reused, len(chunks), source_id)
+    if failed:
+        logging.warning("⚠️ 추출 실패 청크 %d/%d개 (source_id=%s)", len(failed), len(chunks), source_id)
+    return results, sorted(failed)
@@ -1,5 +1,10 @@
 from langchain.text_splitter import RecursiveCharacterTextSplitter
+import hashlib
 import logging
+import os
+import re
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+from .model_registry import registry
 
 def chunk_text(text: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> list[str]:
     """
@@ -29,4 +34,223 @@ def chunk_text(text: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> l
         return chunks
     except Exception as e:
         logging.error(f"❌ 텍스트 청킹 중 오류 발생: {str(e)}")
-        raise RuntimeError("텍스트 청킹 중 오류가 발생했습니다.") 
\ No newline at end of file
+        raise RuntimeError("텍스트 청킹 중 오류가 발생했습니다.") 
+
+
+def chunk_hash(chunk: str) -> str:
+    """청크 내용의 sha256 해시 (체크포인트/증분 처리 키로 사용)"""
+    return hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+
+
+# ================================================
+# 토큰 기반 청킹 (한국어 문장 경계 + 프로바이더별 토큰 예산)
+# ================================================
+# 문자 수가 아니라 토크나이저 기준 토큰 수로 청크 크기를 맞추고, 문장 중간에서 자르지 않습니다.
+# 입력은 문자열 또는 문자열 조각의 iterable(페이지 등)이며, 문장 단위로 흘려보내므로
+# 큰 텍스트 전체를 다시 복사해 들고 있지 않습니다.
+
+# 프로바이더별 청크 하나의 목표 토큰 수
+CHUNK_TOKEN_BUDGETS = {
+    "openai": int(os.getenv("CHUNK_TOKENS_OPENAI", "1200")),
+    "ollama": int(os.getenv("CHUNK_TOKENS_OLLAMA", "600")),
+}
+DEFAULT_CHUNK_TOKENS = int(os.getenv("CHUNK_TOKENS_DEFAULT", "800"))
+# 다음 청크로 넘겨줄 겹침 토큰의 최대 비율 (문단 경계에서 끝난 청크는 겹침 없음)
+CHUNK_OVERLAP_RATIO = float(os.getenv("CHUNK_OVERLAP_RATIO", "0.1"))
+# 토큰 계산 방식: auto(openai는 tiktoken → koe5, 그 외는 koe5) | tiktoken | koe5 | heuristic
+CHUNK_TOKENIZER = os.getenv("CHUNK_TOKENIZER", "auto")
+TIKTOKEN_MODEL = "gpt-4o"
+
+# 문장 경계: 마침표류(+닫는 따옴표/괄호) 뒤 공백, 빈 줄(문단), 종결 어미(다/요/음/함) 뒤 줄바꿈
+_SENTENCE_BOUNDARY = re.compile(
+    r"(?<=[.!?…。])\s+|(?<=[.!?…。][\"'”’)\]])\s+|\n[ \t]*\n\s*|(?<=[다요음함])[ \t]*\n\s*"
+)
+_HANGUL = re.compile(r"[가-힣ㄱ-ㅎㅏ-ㅣ]")
+
+
+class TextChunk(NamedTuple):
+    text: str
+    start: int  # 입력 전체(조각을 이어 붙인 것) 기준 시작 문자 오프셋
+    end: int    # 끝 문자 오프셋 (exclusive)
+    tokens: int
+
+
+def _load_koe5_tokenizer():
+    """KoE5 토크나이저만 로드 (모델이 이미 로드되어 있으면 그 토크나이저 재사용)"""
+    from .embedding_service import MODEL_NAME
+    if registry.is_loaded("koe5"):
+        return registry.get("koe5")[0]
+    from transformers import AutoTokenizer
+    return AutoTokenizer.from_pretrained(MODEL_NAME)
+
+
+registry.register("koe5_tokenizer", _load_koe5_tokenizer)
+
+_token_counters: Dict[str, Callable[[str], int]] = {}
+
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저를 쓸 수 없을 때의 근사치 (한글 음절 1토큰, 그 외 4글자당 1토큰)"""
+    hangul = len(_HANGUL.findall(text))
+    return hangul + (len(text) - hangul + 3) // 4
+
+
+def _make_counter(kind: str) -> Callable[[str], int]:
+    if kind == "tiktoken":
+        import tiktoken
+        encoding = tiktoken.encoding_for_model(TIKTOKEN_MODEL)
+        return lambda text: len(encoding.encode(text))
+    if kind == "koe5":
+        tokenizer = registry.get("koe5_tokenizer")
+        return lambda text: len(tokenizer.encode(text, add_special_tokens=False))
+    return estimate_tokens
+
+
+def get_token_counter(provider: str = "openai") -> Callable[[str], int]:
+    """프로바이더에 맞는 토큰 계산 함수를 반환합니다. 토크나이저를 못 쓰면 근사치로 대체합니다."""
+    counter = _token_counters.get(provider)
+    if counter is not None:
+        return counter
+    if CHUNK_TOKENIZER != "auto":
+        candidates = [CHUNK_TOKENIZER]
+    else:
+        candidates = ["tiktoken", "koe5"] if provider == "openai" else ["koe5"]
+    for kind in candidates + ["heuristic"]:
+        try:
+            counter = _make_counter(kind)
+            break
+        except Exception as e:
+            logging.warning("토크나이저(%s) 사용 불가, 다음 방식으로 대체: %s", kind, str(e))
+    _token_counters[provider] = counter
+    return counter
+
+
+def iter_sentences(source: Union[str, Iterable[str]]) -> Iterator[Tuple[str, int, bool]]:
+    """
+    텍스트(또는 텍스트 조각 스트림)를 문장 단위로 나눕니다.
+    Yields:
+        (문장, 입력 전체 기준 시작 오프셋, 문장 뒤가 문단 경계인지)
+    """
+    pieces = (source,) if isinstance(source, str) else source
+    buffer, base = "", 0
+
+    def emit(segment_start: int, segment_end: int, boundary: str):
+        segment = buffer[segment_start:segment_end]
+        stripped = segment.lstrip()
+        sentence = stripped.rstrip()
+        if sentence:
+            yield sentence, base + segment_start + len(segment) - len(stripped), boundary.count("\n") >= 2
+
+    for piece in pieces:
+        buffer = buffer + piece if buffer else piece
+        last = 0
+        for match in _SENTENCE_BOUNDARY.finditer(buffer):
+            # 버퍼 끝에 걸친 경계는 다음 조각과 이어질 수 있으므로 보류
+            if match.end() == len(buffer):
+                break
+            yield from emit(last, match.start(), match.group())
+            last = match.end()
+        buffer, base = buffer[last:], base + last
+
+    last = 0
+    for match in _SENTENCE_BOUNDARY.finditer(buffer):
+        yield from emit(last, match.start(), match.group())
+        last = match.end()
+    yield from emit(last, len(buffer), "\n\n")
+
+
+def _split_long_sentence(sentence: str, start: int, budget: int, count: Callable[[str], int]) -> Iterator[TextChunk]:
+    """예산보다 긴 문장을 공백 단위(공백이 없으면 글자 단위)로 나눕니다."""
+    tokens = count(sentence)
+    if tokens <= budget:
+        yield TextChunk(sentence, start, start + len(sentence), tokens)
+        return
+    words = sentence.split(" ")
+    if len(words) == 1:
+        # 토큰 수에 비례해 글자 수를 잘라냄
+        step = max(1, len(sentence) * budget // tokens)
+        for offset in range(0, len(sentence), step):
+            part = sentence[offset:offset + step]
+            yield TextChunk(part, start + offset, start + offset + len(part), count(part))
+        return
+    offset = 0
+    current: List[str] = []
+    current_tokens = 0
+    current_start = 0
+    for word in words:
+        word_tokens = count(word) + 1
+        if current and current_tokens + word_tokens > budget:
+            part = " ".join(current)
+            yield from _split_long_sentence(part, start + current_start, budget, count)
+            current, current_tokens, current_start = [], 0, offset
+        current.append(word)
+        current_tokens += word_tokens
+        offset += len(word) + 1
+    if current:
+        yield from _split_long_sentence(" ".join(current), start + current_start, budget, count)
+
+
+def _join(window: List[Tuple[TextChunk, bool]]) -> TextChunk:
+    parts = []
+    for index, (sentence, paragraph_end) in enumerate(window):
+        parts.append(sentence.text)
+        if index < len(window) - 1:
+            parts.append("\n\n" if paragraph_end else " ")
+    return TextChunk(
+        "".join(parts), window[0][0].start, window[-1][0].end,
+        sum(sentence.tokens for sentence, _ in window)
+    )
+
+
+def iter_chunks(
+    source: Union[str, Iterable[str]],
+    provider: str = "openai",
+    max_tokens: Optional[int] = None,
+    overlap_ratio: float = CHUNK_OVERLAP_RATIO,
+    count_tokens: Optional[Callable[[str], int]] = None
+) -> Iterator[TextChunk]:
+    """
+    문장 경계를 지키면서 토큰 예산 이하의 청크를 순서대로 생성합니다.
+    - 겹침(adaptive overlap): 청크가 문단 경계에서 끝나면 겹치지 않고,
+      아니면 끝 문장들을 overlap_ratio * 예산 이내에서만 다음 청크 앞에 붙입니다.
+    Args:
+        source: 텍스트 또는 텍스트 조각 iterable (예: PDF 페이지)
+        provider: 토큰 예산/토크나이저를 고를 프로바이더 ("openai", "ollama")
+        max_tokens: 청크당 최대 토큰 수 (기본값은 CHUNK_TOKEN_BUDGETS[provider])
+        count_tokens: 토큰 계산 함수 (기본값은 get_token_counter(provider))
+    Yields:
+        TextChunk(text, start, end, tokens)
+    """
+    budget = max_tokens or CHUNK_TOKEN_BUDGETS.get(provider, DEFAULT_CHUNK_TOKENS)
+    count = count_tokens or get_token_counter(provider)
+    overlap_budget = int(budget * overlap_ratio)
+
+    window: List[Tuple[TextChunk, bool]] = []
+    window_tokens = 0
+    carried = 0  # window 앞쪽의 겹침 문장 수
+    produced = 0
+    for sentence, start, paragraph_end in iter_sentences(source):
+        for piece in _split_long_sentence(sentence, start, budget, count):
+            if len(window) > carried and window_tokens + piece.tokens > budget:
+                yield _join(window)
+                produced += 1
+                # 겹침 문장 선택 (문단 경계에서 끝났으면 겹치지 않음)
+                overlap: List[Tuple[TextChunk, bool]] = []
+                if not window[-1][1]:
+                    overlap_tokens = 0
+                    for item in reversed(window):
+                        if overlap_tokens + item[0].tokens > overlap_budget:
+                            break
+                        overlap.insert(0, item)
+                        overlap_tokens += item[0].tokens
+                # 겹침을 붙여도 새 문장이 들어갈 자리가 없으면 겹침을 버림
+                if sum(item[0].tokens for item in overlap) + piece.tokens > budget:
+                    overlap = []
+                window, carried = overlap, len(overlap)
+                window_tokens = sum(item[0].tokens for item in window)
+            window.append((piece, paragraph_end))
+            window_tokens += piece.tokens
+    if len(window) > carried:
+        yield _join(window)
+        produced += 1
+    logging.info("✅ 텍스트가 %d개의 청크로 분할되었습니다. (토큰 예산 %d, provider=%s)", produced, budget, provider)
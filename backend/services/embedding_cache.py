@@ -0,0 +1,173 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# ================================================
+# 임베딩 캐시 (메모리 LRU + 디스크 SQLite BLOB)
+# ================================================
+
+# 디스크 캐시 기본 경로 (backend/data/embedding_cache.db)
+CACHE_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "embedding_cache.db")
+# 메모리 LRU에 유지할 최대 벡터 수
+MEMORY_CACHE_SIZE = 4096
+
+
+def normalize_text(text: str) -> str:
+    """
+    캐시 키 계산에 쓰일 정규화된 텍스트를 반환합니다.
+    모델에는 정규화하지 않은 원문이 들어가므로, 정규화 결과가 같은 텍스트는 처음 나온 원문의 임베딩을 공유합니다.
+    - 유니코드 NFC 정규화 (조합형/완성형 한글을 같은 키로)
+    - 앞뒤 공백 제거, 연속 공백을 하나로 축약
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def make_cache_key(model_name: str, text: str) -> str:
+    """모델 이름 + 정규화된 텍스트의 sha256 해시를 캐시 키로 사용합니다."""
+    return hashlib.sha256(f"{model_name}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    텍스트 임베딩을 내용 기반 키로 저장하는 2단계 캐시
+    1) 프로세스 메모리의 LRU (OrderedDict)
+    2) data/ 아래 SQLite 테이블 (float32 BLOB)
+
+    조회 순서는 메모리 → 디스크이며, 디스크에서 찾은 값은 메모리로 올립니다.
+    dim을 지정하면 차원이 다른 디스크 항목은 miss로 취급합니다.
+    hit/miss 카운터는 stats()로 확인할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        dim: Optional[int] = None,
+        db_path: Optional[str] = CACHE_DB_PATH,
+        memory_size: int = MEMORY_CACHE_SIZE
+    ):
+        self.model_name = model_name
+        self.dim = dim
+        self.db_path = db_path
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+        self._conn: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._init_db()
+
+    def _init_db(self) -> None:
+        """디스크 캐시 테이블을 생성합니다. 실패하면 메모리 캐시만 사용합니다."""
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL;")
+            self._conn.execute("PRAGMA synchronous=NORMAL;")
+            self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS EmbeddingCache (
+                cache_key TEXT PRIMARY KEY,
+                model_name TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL
+            )
+            ''')
+            self._conn.commit()
+        except Exception as e:
+            logging.warning("임베딩 디스크 캐시 초기화 실패, 메모리 캐시만 사용: %s", str(e))
+            self._conn = None
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        """메모리 LRU에 넣고, 크기를 넘으면 가장 오래된 항목을 버립니다. (lock 보유 상태에서 호출)"""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        여러 텍스트의 캐시된 벡터를 조회합니다.
+        Returns:
+            입력 순서대로 벡터(np.ndarray) 또는 None(miss) 리스트
+        """
+        keys = [make_cache_key(self.model_name, t) for t in texts]
+        results: List[Optional[np.ndarray]] = [None] * len(texts)
+        with self._lock:
+            disk_lookup: Dict[str, List[int]] = {}
+            for i, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    results[i] = vector
+                else:
+                    disk_lookup.setdefault(key, []).append(i)
+
+            if disk_lookup and self._conn is not None:
+                try:
+                    pending = list(disk_lookup.keys())
+                    # SQLite 파라미터 개수 제한을 피하기 위해 나눠서 조회
+                    for start in range(0, len(pending), 500):
+                        part = pending[start:start + 500]
+                        rows = self._conn.execute(
+                            f"SELECT cache_key, dim, vector FROM EmbeddingCache "
+                            f"WHERE cache_key IN ({','.join('?' * len(part))})",
+                            part
+                        ).fetchall()
+                        for key, dim, blob in rows:
+                            if self.dim is not None and dim != self.dim:
+                                continue
+                            vector = np.frombuffer(blob, dtype=np.float32)
+                            self._remember(key, vector)
+                            for i in disk_lookup.pop(key):
+                                results[i] = vector
+                                self._counters["disk_hits"] += 1
+                except Exception as e:
+                    logging.warning("임베딩 디스크 캐시 조회 실패: %s", str(e))
+
+            self._counters["misses"] += sum(len(idx) for idx in disk_lookup.values())
+        return results
+
+    def put_many(self, texts: List[str], vectors: np.ndarray) -> None:
+        """텍스트별 벡터를 메모리와 디스크 캐시에 저장합니다."""
+        rows = []
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                key = make_cache_key(self.model_name, text)
+                vector = np.ascontiguousarray(vector, dtype=np.float32)
+                self._remember(key, vector)
+                rows.append((key, self.model_name, vector.shape[-1], vector.tobytes()))
+            if rows and self._conn is not None:
+                try:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO EmbeddingCache (cache_key, model_name, dim, vector) VALUES (?, ?, ?, ?)",
+                        rows
+                    )
+                    self._conn.commit()
+                except Exception as e:
+                    logging.warning("임베딩 디스크 캐시 저장 실패: %s", str(e))
+            self._counters["writes"] += len(rows)
+
+    def stats(self) -> Dict:
+        """hit/miss 카운터와 현재 메모리 캐시 크기를 반환합니다."""
+        with self._lock:
+            hits = self._counters["memory_hits"] + self._counters["disk_hits"]
+            total = hits + self._counters["misses"]
+            return {
+                **self._counters,
+                "hits": hits,
+                "hit_rate": hits / total if total else 0.0,
+                "memory_entries": len(self._memory),
+                "model_name": self.model_name
+            }
+
+    def clear_memory(self) -> None:
+        """메모리 LRU만 비웁니다. (디스크 캐시는 유지)"""
+        with self._lock:
+            self._memory.clear()
@@ -1,30 +1,68 @@
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
-import torch
-from transformers import AutoTokenizer, AutoModel
 import numpy as np
 import logging
 import os
+import time
 import uuid
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+from .embedding_cache import EmbeddingCache, normalize_text
+from .graph_version import bump_graph_version
+from .model_registry import registry
 
 # ================================================
-# Qdrant 및 KoE5 임베딩 모델 초기화
+# Qdrant 및 KoE5 임베딩 모델 설정
 # ================================================
+# 모델과 클라이언트는 import 시점이 아니라 처음 사용할 때 model_registry를 통해 로드합니다.
 
 # 디스크 기반 Qdrant 저장 경로 설정
 QDRANT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "qdrant")
-os.makedirs(QDRANT_PATH, exist_ok=True)
 
-# Qdrant 클라이언트 생성 (로컬 디스크 모드)
-client = QdrantClient(path=QDRANT_PATH)
-
-# KoE5 임베딩 모델 로드
+# KoE5 임베딩 모델 이름
 MODEL_NAME = "nlpai-lab/KoE5"
-tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-model = AutoModel.from_pretrained(MODEL_NAME)
-# 모델의 hidden size를 벡터 차원으로 사용
-EMBED_DIM = model.config.hidden_size  # 예: 1024
+# encode_texts 한 번의 forward에 넣을 기본 텍스트 수 (CPU 기준)
+EMBED_BATCH_SIZE = 32
+# PointBatchWriter 기본 설정: 이 개수만큼 모이거나 이 시간(초)이 지나면 한 번에 upsert
+UPSERT_BATCH_SIZE = 256
+UPSERT_FLUSH_INTERVAL = 2.0
+
+# 모델 이름 + 정규화된 텍스트 해시를 키로 하는 임베딩 캐시 (메모리 LRU + data/embedding_cache.db)
+embedding_cache = EmbeddingCache(MODEL_NAME)
+
+
+def _load_qdrant_client() -> QdrantClient:
+    """Qdrant 클라이언트 생성 (로컬 디스크 모드)"""
+    os.makedirs(QDRANT_PATH, exist_ok=True)
+    return QdrantClient(path=QDRANT_PATH)
+
+
+def _load_koe5():
+    """KoE5 토크나이저와 모델 로드 (torch/transformers import도 여기서 수행)"""
+    from transformers import AutoTokenizer, AutoModel
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+    model = AutoModel.from_pretrained(MODEL_NAME)
+    model.eval()
+    return tokenizer, model
+
+
+registry.register("qdrant", _load_qdrant_client)
+registry.register("koe5", _load_koe5)
+
+
+def get_client() -> QdrantClient:
+    """공유 Qdrant 클라이언트를 반환합니다. (최초 호출 시 생성)"""
+    return registry.get("qdrant")
+
+
+def get_koe5() -> Tuple:
+    """공유 KoE5 (tokenizer, model) 튜플을 반환합니다. (최초 호출 시 로드)"""
+    return registry.get("koe5")
+
+
+def get_embed_dim() -> int:
+    """모델의 hidden size를 벡터 차원으로 사용 (예: 1024)"""
+    _, model = get_koe5()
+    return model.config.hidden_size
 
 
 def get_collection_name(brain_id: str) -> str:
@@ -42,7 +80,7 @@ def initialize_collection(brain_id: str) -> None:
     """
     Qdrant에서 기존 컬렉션을 삭제하고 새로 생성합니다.
     - 기존 컬렉션이 있으면 삭제
-    - EMBED_DIM 크기, 코사인 거리 기준으로 새 컬렉션 생성
+    - 모델 hidden size 크기, 코사인 거리 기준으로 새 컬렉션 생성
     Args:
         brain_id: 브레인 고유 식별자
     Raises:
@@ -51,16 +89,16 @@ def initialize_collection(brain_id: str) -> None:
     collection_name = get_collection_name(brain_id)
     # 기존 컬렉션 삭제 시도
     try:
-        client.delete_collection(collection_name)
+        get_client().delete_collection(collection_name)
         logging.info("기존 컬렉션 삭제 완료: %s", collection_name)
     except Exception as e:
         logging.warning("컬렉션 %s가 존재하지 않거나 삭제 실패: %s", collection_name, str(e))
     # 새 컬렉션 생성
     try:
-        client.create_collection(
+        get_client().create_collection(
             collection_name=collection_name,
             vectors_config=models.VectorParams(
-                size=EMBED_DIM,
+                size=get_embed_dim(),
                 distance=models.Distance.COSINE
             ),
         )
@@ -73,34 +111,229 @@ def initialize_collection(brain_id: str) -> None:
 def encode_text(text: str) -> List[float]:
     """
     주어진 텍스트를 KoE5 모델로 임베딩하여 벡터 반환
-    - 토크나이저로 입력 전처리
+    - 내부적으로 encode_texts의 배치 경로와 임베딩 캐시를 그대로 사용
     - CLS 토큰 임베딩 추출
     Args:
         text: 입력 텍스트
     Returns:
-        EMBED_DIM 차원의 벡터 리스트
+        모델 hidden size 차원의 벡터 리스트
     Raises:
         RuntimeError: 임베딩 실패 시
     """
+    return encode_texts([text])[0].tolist()
+
+
+def encode_texts(
+    texts: List[str],
+    batch_size: int = EMBED_BATCH_SIZE,
+    use_cache: bool = True
+) -> np.ndarray:
+    """
+    여러 텍스트를 배치 단위로 KoE5 모델에 넣어 임베딩 행렬을 반환합니다.
+
+    처리 순서:
+    1. 정규화한 텍스트를 키로 임베딩 캐시 조회 (use_cache=True인 경우)
+    2. 캐시에 없는 키마다 처음 나온 원문 하나만 _encode_batches로 임베딩
+    3. 새로 계산한 벡터를 캐시에 저장
+    4. 원래 입력 순서대로 행렬 구성
+
+    Args:
+        texts: 입력 텍스트 리스트
+        batch_size: 한 번의 forward에 넣을 최대 텍스트 수
+        use_cache: False면 캐시를 조회/저장하지 않고 항상 모델을 실행
+    Returns:
+        (len(texts), hidden size) 크기의 C-contiguous float32 행렬 (빈 입력이면 (0, 0))
+    Raises:
+        RuntimeError: 임베딩 실패 시
+    """
+    if not texts:
+        # 빈 입력은 모델을 로드하지 않고 바로 반환
+        return np.empty((0, 0), dtype=np.float32)
+    if batch_size < 1:
+        raise ValueError("batch_size는 1 이상이어야 합니다.")
+
+    normalized = [normalize_text(t) for t in texts]
+    cached = embedding_cache.get_many(normalized) if use_cache else [None] * len(texts)
+
+    # 캐시 miss 텍스트를 정규화 키 기준으로 모아 한 번만 임베딩
+    # (정규화는 캐시 키에만 사용하고, 모델에는 처음 나온 원문을 그대로 넣음)
+    missing: Dict[str, List[int]] = {}
+    for i, vector in enumerate(cached):
+        if vector is None:
+            missing.setdefault(normalized[i], []).append(i)
+
+    # 차원은 캐시된 벡터에서 가져오고, 모두 캐시 miss일 때만 모델 설정을 조회 (KoE5 로드)
+    first_hit = next((vector for vector in cached if vector is not None), None)
+    dim = len(first_hit) if first_hit is not None else get_embed_dim()
+    result = np.empty((len(texts), dim), dtype=np.float32)
+    for i, vector in enumerate(cached):
+        if vector is not None:
+            result[i] = vector
+
+    if missing:
+        keys = list(missing.keys())
+        vectors = _encode_batches([texts[missing[key][0]] for key in keys], batch_size)
+        for key, vector in zip(keys, vectors):
+            result[missing[key]] = vector
+        if use_cache:
+            embedding_cache.put_many(keys, vectors)
+
+    logging.info(
+        "임베딩 완료: %d개 텍스트 (캐시 hit %d개, 새로 계산 %d개)",
+        len(texts), len(texts) - sum(len(v) for v in missing.values()), len(missing)
+    )
+    return result
+
+
+def _encode_batches(texts: List[str], batch_size: int) -> np.ndarray:
+    """
+    길이 정렬 + dynamic padding으로 텍스트를 배치 임베딩합니다.
+    1. 전체 텍스트를 패딩 없이 한 번에 토크나이즈
+    2. 토큰 길이 기준으로 정렬해 비슷한 길이끼리 배치 구성
+    3. 배치마다 가장 긴 입력에 맞춰서만 패딩 후 forward
+    4. CLS 토큰 임베딩을 원래 입력 순서 자리에 기록
+    """
+    import torch
+
     try:
-        inputs = tokenizer(text, return_tensors="pt", truncation=True, padding=True)
-        with torch.no_grad():
-            outputs = model(**inputs)
-        # CLS 토큰 인덱스(0) 임베딩 반환
-        return outputs.last_hidden_state[:, 0].squeeze().tolist()
+        tokenizer, model = get_koe5()
+        encoded = tokenizer(list(texts), truncation=True)
+        input_ids = encoded["input_ids"]
+        # 길이 순 정렬: 같은 배치 안의 패딩 낭비를 최소화
+        order = sorted(range(len(texts)), key=lambda i: len(input_ids[i]))
+        result = np.empty((len(texts), model.config.hidden_size), dtype=np.float32)
+
+        for start in range(0, len(order), batch_size):
+            batch_idx = order[start:start + batch_size]
+            features = [
+                {key: encoded[key][i] for key in encoded.keys()}
+                for i in batch_idx
+            ]
+            inputs = tokenizer.pad(features, padding=True, return_tensors="pt")
+            with torch.no_grad():
+                outputs = model(**inputs)
+            # CLS 토큰 인덱스(0) 임베딩을 원래 위치에 기록
+            result[batch_idx] = outputs.last_hidden_state[:, 0].cpu().numpy()
+
+        return result
     except Exception as e:
         logging.error("텍스트 임베딩 생성 실패: %s", str(e))
         raise RuntimeError(f"텍스트 임베딩 생성 실패: {str(e)}")
 
 
+class PointBatchWriter:
+    """
+    한 브레인 컬렉션에 쓸 PointStruct를 버퍼에 모았다가 배치 단위로 upsert합니다.
+    - 버퍼가 batch_size에 도달하거나
+    - 가장 오래된 포인트가 버퍼에 들어온 지 flush_interval초가 지나면
+    한 번의 client.upsert로 저장합니다. with 블록을 벗어날 때 남은 포인트도 저장합니다.
+    백그라운드 타이머는 없으므로 시간 조건은 add()가 호출될 때만 확인합니다.
+    (add가 더 호출되지 않으면 남은 포인트는 flush() 또는 with 블록 종료 시 저장됨)
+
+    사용 예:
+        with PointBatchWriter(brain_id) as writer:
+            writer.add(point)
+        writer.stats()  # {"points_written": ..., "flush_seconds": [...], ...}
+    """
+
+    def __init__(
+        self,
+        brain_id: str,
+        batch_size: int = UPSERT_BATCH_SIZE,
+        flush_interval: float = UPSERT_FLUSH_INTERVAL
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size는 1 이상이어야 합니다.")
+        self.collection_name = get_collection_name(brain_id)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.points_written = 0
+        self.flush_seconds: List[float] = []
+        self._buffer: List[models.PointStruct] = []
+        self._oldest_at: Optional[float] = None
+
+    def add(self, point: models.PointStruct) -> None:
+        """포인트를 버퍼에 추가하고, 조건을 만족하면 flush합니다."""
+        if not self._buffer:
+            self._oldest_at = time.monotonic()
+        self._buffer.append(point)
+        if (len(self._buffer) >= self.batch_size
+                or time.monotonic() - self._oldest_at >= self.flush_interval):
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        버퍼에 쌓인 포인트를 한 번의 upsert로 저장합니다.
+        Returns:
+            이번 flush에서 저장한 포인트 수
+        Raises:
+            RuntimeError: upsert 실패 시
+        """
+        if not self._buffer:
+            return 0
+        count = len(self._buffer)
+        started = time.perf_counter()
+        try:
+            get_client().upsert(collection_name=self.collection_name, points=self._buffer)
+        except Exception as e:
+            logging.error("컬렉션 %s 배치 upsert 실패 (%d개): %s", self.collection_name, count, str(e))
+            raise RuntimeError(f"배치 upsert 실패: {str(e)}")
+        elapsed = time.perf_counter() - started
+
+        self.points_written += count
+        self.flush_seconds.append(elapsed)
+        self._buffer = []
+        self._oldest_at = None
+        logging.info("컬렉션 %s에 %d개 포인트 upsert 완료 (%.3f초)", self.collection_name, count, elapsed)
+        return count
+
+    def stats(self) -> Dict:
+        """지금까지 저장한 포인트 수와 flush별 소요 시간을 반환합니다."""
+        return {
+            "collection": self.collection_name,
+            "points_written": self.points_written,
+            "pending": len(self._buffer),
+            "flush_count": len(self.flush_seconds),
+            "flush_seconds": list(self.flush_seconds),
+            "total_flush_seconds": sum(self.flush_seconds)
+        }
+
+    def __enter__(self) -> "PointBatchWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
+            return
+        # 예외로 빠져나가는 경우에도 이미 모인 포인트는 저장하되, 원래 예외를 가리지 않음
+        try:
+            self.flush()
+        except RuntimeError:
+            pass
+
+
+# description 하나를 임베딩할 때 사용하는 표현 포맷 (포맷 순서가 point_id의 idx)
+EMBED_FORMATS = [
+    "{name}는 {label}이다. {description}",
+    "{name} ({label}): {description}",
+    "{label}인 {name}에 대한 설명: {description}",
+    "{description}"
+]
+
+
+def point_id(source_id: str, idx: int, description: str) -> str:
+    """source_id + 포맷 idx + description으로 결정되는 고유 point_id (uuid5)"""
+    return str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{source_id}_{idx}_{description}"))
+
+
 def update_index_and_get_embeddings(nodes: List[Dict], brain_id: str) -> Dict[str, List[List[float]]]:
     """
     노드 목록을 여러 표현 포맷으로 임베딩하고 Qdrant에 저장
 
     처리 순서:
     1. 필수 필드 검증(source_id, name, label, descriptions)
-    2. 여러 포맷으로 텍스트 생성
-    3. encode_text로 임베딩
+    2. 여러 포맷으로 텍스트 생성 (전체 노드분을 먼저 수집)
+    3. encode_texts로 한 번에 배치 임베딩
     4. uuid5로 point_id 생성
     5. Qdrant upsert로 벡터 및 payload 저장
 
@@ -113,14 +346,9 @@ def update_index_and_get_embeddings(nodes: List[Dict], brain_id: str) -> Dict[st
     collection_name = get_collection_name(brain_id)
     all_embeddings: Dict[str, List[List[float]]] = {}
 
-    # 사용할 표현 포맷 정의
-    formats = [
-        "{name}는 {label}이다. {description}",
-        "{name} ({label}): {description}",
-        "{label}인 {name}에 대한 설명: {description}",
-        "{description}"
-    ]
-
+    # 1) 임베딩할 텍스트와 payload 정보를 먼저 모두 수집
+    texts: List[str] = []
+    entries: List[Dict] = []
     for node in nodes:
         # 필수 키 확인
         if not all(k in node for k in ["source_id", "name", "label", "descriptions"]):
@@ -130,49 +358,64 @@ def update_index_and_get_embeddings(nodes: List[Dict], brain_id: str) -> Dict[st
         source_id = str(node["source_id"])
         name = node["name"]
         label = node["label"]
-        embeddings_for_node: List[List[float]] = []
+        all_embeddings.setdefault(source_id, [])
 
-        # 각 description마다 포맷별 벡터 생성
+        # 각 description마다 포맷별 텍스트 생성
         for desc in node["descriptions"]:
             description = desc.get("description")
             if not description:
                 logging.warning("빈 description 스킵: %s", desc)
                 continue
 
-            for idx, fmt in enumerate(formats):
-                # 텍스트 생성
+            for idx, fmt in enumerate(EMBED_FORMATS):
                 text = fmt.format(name=name, label=label, description=description)
                 logging.info("[임베딩 텍스트] %s", text)
-
-                # 임베딩 생성
-                emb = encode_text(text)
-                embeddings_for_node.append(emb)
-
-                # 고유 point_id 생성(source_id + idx + description)
-                pid = str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{source_id}_{idx}_{description}"))
-
-                # Qdrant에 upsert: 벡터 및 payload 포함
-                client.upsert(
-                    collection_name=collection_name,
-                    points=[
-                        models.PointStruct(
-                            id=pid,
-                            vector=emb,
-                            payload={
-                                "source_id": source_id,
-                                "name": name,
-                                "label": label,
-                                "description": description,
-                                "point_id": pid
-                            }
-                        )
-                    ]
+                texts.append(text)
+                entries.append({
+                    "source_id": source_id,
+                    "name": name,
+                    "label": label,
+                    "description": description,
+                    "idx": idx
+                })
+
+    # 2) 배치 임베딩
+    vectors = encode_texts(texts)
+
+    # 3) Qdrant에 배치 단위로 저장
+    with PointBatchWriter(brain_id) as writer:
+        for entry, vector in zip(entries, vectors):
+            source_id = entry["source_id"]
+            idx = entry["idx"]
+            description = entry["description"]
+            emb = vector.tolist()
+            all_embeddings[source_id].append(emb)
+
+            # 고유 point_id 생성(source_id + idx + description)
+            pid = point_id(source_id, idx, description)
+
+            # 버퍼에 추가: 벡터 및 payload 포함
+            writer.add(
+                models.PointStruct(
+                    id=pid,
+                    vector=emb,
+                    payload={
+                        "source_id": source_id,
+                        "name": entry["name"],
+                        "label": entry["label"],
+                        "description": description,
+                        "point_id": pid
+                    }
                 )
-                logging.info("노드 %s descriptor %d 저장 완료(UUID: %s)", source_id, idx, pid)
-
-        all_embeddings[source_id] = embeddings_for_node
+            )
 
-    logging.info("컬렉션 %s에 %d개의 노드 임베딩 저장 완료", collection_name, len(all_embeddings))
+    bump_graph_version(brain_id)
+    stats = writer.stats()
+    logging.info(
+        "컬렉션 %s에 %d개의 노드 임베딩 저장 완료 (포인트 %d개, flush %d회, %.3f초)",
+        collection_name, len(all_embeddings),
+        stats["points_written"], stats["flush_count"], stats["total_flush_seconds"]
+    )
     return all_embeddings
 
 
@@ -209,7 +452,7 @@ def search_similar_nodes(
         #   Qdrant에 query_vector와 유사도가 높은 순으로 상위 limit*10개 만큼 요청
         #   예: limit=10 -> 상위 100개(0.8 이상이든 0.5~0.8 사이든 무조건 top100 가져옴)
         #   이후 threshold 필터링 및 source_id 그룹핑 수행
-        search_results = client.search(
+        search_results = get_client().search(
             collection_name=collection_name,
             query_vector=embedding,
             limit=limit * 10
@@ -265,7 +508,7 @@ def is_index_ready(brain_id: str) -> bool:
     """
     collection_name = get_collection_name(brain_id)
     try:
-        collections = client.get_collections()
+        collections = get_client().get_collections()
         return any(collection.name == collection_name for collection in collections.collections)
     except Exception as e:
         logging.error("인덱스 준비 상태 확인 실패: %s", str(e))
@@ -283,7 +526,7 @@ def delete_node(source_id: str, brain_id: str) -> None:
     collection_name = get_collection_name(brain_id)
     try:
         # source_id를 payload 필터로 사용하여 모든 관련 벡터 삭제
-        client.delete(
+        get_client().delete(
             collection_name=collection_name,
             points_selector=models.FilterSelector(
                 filter=models.Filter(
@@ -300,6 +543,37 @@ def delete_node(source_id: str, brain_id: str) -> None:
     except Exception as e:
         logging.error("노드 %s 삭제 실패: %s", source_id, str(e))
         raise RuntimeError(f"노드 삭제 실패: {str(e)}")
+    finally:
+        bump_graph_version(brain_id)
+
+
+def delete_descriptions(source_id: str, brain_id: str, descriptions: List[str]) -> None:
+    """source_id의 특정 description들에 해당하는 벡터만 삭제합니다. (증분 재처리용)
+    Args:
+        descriptions: 삭제할 description 텍스트 목록
+    Raises:
+        RuntimeError: 삭제 실패 시
+    """
+    if not descriptions:
+        return
+    collection_name = get_collection_name(brain_id)
+    point_ids = [
+        point_id(str(source_id), idx, description)
+        for description in descriptions
+        for idx in range(len(EMBED_FORMATS))
+    ]
+    try:
+        get_client().delete(
+            collection_name=collection_name,
+            points_selector=models.PointIdsList(points=point_ids)
+        )
+        logging.info("컬렉션 %s에서 source_id %s의 description %d개 벡터 삭제 완료",
+                     collection_name, source_id, len(descriptions))
+    except Exception as e:
+        logging.error("source_id %s description 벡터 삭제 실패: %s", source_id, str(e))
+        raise RuntimeError(f"description 벡터 삭제 실패: {str(e)}")
+    finally:
+        bump_graph_version(brain_id)
 
 
 def delete_collection(brain_id: str) -> None:
@@ -309,10 +583,12 @@ def delete_collection(brain_id: str) -> None:
     """
     collection_name = get_collection_name(brain_id)
     try:
-        client.delete_collection(collection_name)
+        get_client().delete_collection(collection_name)
         logging.info("컬렉션 삭제 완료: %s", collection_name)
     except Exception as e:
         logging.warning("컬렉션 %s가 존재하지 않을 수 있습니다: %s", collection_name, str(e))
+    finally:
+        bump_graph_version(brain_id)
 
 
 def search_similar_descriptions(
@@ -337,7 +613,7 @@ def search_similar_descriptions(
     
     try:
         # 검색 실행
-        search_results = client.search(
+        search_results = get_client().search(
             collection_name=collection_name,
             query_vector=embedding,
             limit=limit * 5  # 중복 제거를 위해 더 많은 결과를 가져옴
@@ -0,0 +1,132 @@
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+# ================================================
+# 워크로드별 실행 풀 (이벤트 루프 밖에서 블로킹 작업 실행)
+# ================================================
+# async 라우트에서 torch 추론, Neo4j/SQLite 동기 호출, Whisper 같은 블로킹 작업을
+# 직접 호출하면 uvicorn 이벤트 루프 전체가 멈춥니다.
+# 워크로드 종류마다 별도 스레드 풀을 두어, 무거운 작업이 몰려도
+# 가벼운 DB 조회(예: /brain 목록)는 자기 풀에서 바로 처리되도록 합니다.
+#
+# torch / Whisper / 네트워크 I/O는 실행 중 GIL을 놓기 때문에 스레드 풀로 충분하고,
+# 모델을 프로세스마다 다시 올릴 필요도 없습니다.
+
+# 워크로드별 최대 워커 수 (환경 변수로 조정 가능)
+POOL_SIZES: Dict[str, int] = {
+    "embedding": int(os.getenv("EMBEDDING_POOL_SIZE", "2")),
+    "llm": int(os.getenv("LLM_POOL_SIZE", "8")),
+    "db": int(os.getenv("DB_POOL_SIZE", "16")),
+    "asr": int(os.getenv("ASR_POOL_SIZE", "1")),
+    "io": int(os.getenv("IO_POOL_SIZE", "4")),
+}
+
+
+class WorkloadPool:
+    """
+    ThreadPoolExecutor에 큐 깊이/대기 시간 카운터를 붙인 래퍼
+    - queued: 제출됐지만 아직 워커를 잡지 못한 작업 수
+    - running: 실행 중인 작업 수
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-pool")
+        self._lock = threading.Lock()
+        self._counters = {"queued": 0, "running": 0, "completed": 0, "failed": 0}
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_run = 0.0
+
+    def _wrap(self, fn: Callable, submitted: float) -> Callable:
+        def task():
+            started = time.perf_counter()
+            with self._lock:
+                self._counters["queued"] -= 1
+                self._counters["running"] += 1
+                wait = started - submitted
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+            ok = False
+            try:
+                result = fn()
+                ok = True
+                return result
+            finally:
+                with self._lock:
+                    self._counters["running"] -= 1
+                    self._counters["completed" if ok else "failed"] += 1
+                    self._total_run += time.perf_counter() - started
+        return task
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """fn(*args, **kwargs)를 이 풀에서 실행하고 결과를 기다립니다."""
+        with self._lock:
+            self._counters["queued"] += 1
+        task = self._wrap(functools.partial(fn, *args, **kwargs), time.perf_counter())
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, task)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            finished = self._counters["completed"] + self._counters["failed"]
+            return {
+                **self._counters,
+                "max_workers": self.max_workers,
+                "avg_wait_seconds": self._total_wait / finished if finished else 0.0,
+                "max_wait_seconds": self._max_wait,
+                "avg_run_seconds": self._total_run / finished if finished else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pools: Dict[str, WorkloadPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(workload: str) -> WorkloadPool:
+    """
+    워크로드 이름에 해당하는 풀을 반환합니다. 처음 호출될 때 생성합니다.
+    Raises:
+        KeyError: POOL_SIZES에 없는 워크로드
+    """
+    pool = _pools.get(workload)
+    if pool is not None:
+        return pool
+    if workload not in POOL_SIZES:
+        raise KeyError(f"알 수 없는 워크로드: {workload}")
+    with _pools_lock:
+        if workload not in _pools:
+            _pools[workload] = WorkloadPool(workload, max(1, POOL_SIZES[workload]))
+        return _pools[workload]
+
+
+async def run_in_pool(workload: str, fn: Callable, *args, **kwargs) -> Any:
+    """
+    블로킹 함수를 워크로드 전용 풀에서 실행합니다.
+    예) nodes, edges = await run_in_pool("llm", ai_service.extract_graph_components, text, source_id)
+    """
+    return await get_pool(workload).run(fn, *args, **kwargs)
+
+
+def get_pool_stats() -> Dict[str, Dict]:
+    """생성된 풀별 큐 깊이/실행 수/대기 시간 통계"""
+    return {name: pool.stats() for name, pool in list(_pools.items())}
+
+
+def shutdown_pools() -> None:
+    """서버 종료 시 모든 풀을 정리합니다. (대기 중인 작업은 취소)"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown()
+        _pools.clear()
+    logging.info("🛑 워크로드 실행 풀 종료")
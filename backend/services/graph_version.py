@@ -0,0 +1,26 @@
+import threading
+from typing import Dict
+
+# ================================================
+# 브레인별 그래프 버전
+# ================================================
+# 그래프(Neo4j)나 벡터(Qdrant)를 바꾸는 모든 쓰기 경로가 쓰기 직후 bump_graph_version()을 호출합니다.
+# 답변 캐시 등 "그래프 내용에 의존하는 결과"는 계산 시작 시점의 버전을 함께 저장해 두고,
+# 버전이 달라지면 무효로 취급합니다. 프로세스 메모리에만 유지하므로 재시작하면 0부터 다시 시작합니다.
+
+_lock = threading.Lock()
+_versions: Dict[str, int] = {}
+
+
+def get_graph_version(brain_id) -> int:
+    """브레인의 현재 그래프 버전을 반환합니다."""
+    with _lock:
+        return _versions.get(str(brain_id), 0)
+
+
+def bump_graph_version(brain_id) -> int:
+    """브레인의 그래프 버전을 1 올리고 새 버전을 반환합니다."""
+    with _lock:
+        key = str(brain_id)
+        _versions[key] = _versions.get(key, 0) + 1
+        return _versions[key]
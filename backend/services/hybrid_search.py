@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlite_db import SQLiteHandler
+from . import embedding_service
+from .executors import run_in_pool
+
+# ================================================
+# 하이브리드 검색 (BM25 + 벡터, Reciprocal Rank Fusion)
+# ================================================
+# 키워드(FTS5 BM25) 검색과 Qdrant 벡터 검색을 동시에 실행하고, 두 순위를 RRF로 합쳐
+# source_id 순위를 만듭니다. 한쪽 검색이 실패해도 나머지 결과만으로 순위를 만듭니다.
+#   RRF 점수 = Σ 가중치 / (HYBRID_RRF_K + 순위)
+
+# RRF 상수 (클수록 하위 순위 결과의 기여가 커짐)
+HYBRID_RRF_K = int(os.getenv("HYBRID_RRF_K", "60"))
+# 검색 방식별 가중치
+HYBRID_LEXICAL_WEIGHT = float(os.getenv("HYBRID_LEXICAL_WEIGHT", "1.0"))
+HYBRID_VECTOR_WEIGHT = float(os.getenv("HYBRID_VECTOR_WEIGHT", "1.0"))
+# 최종 k개를 고르기 위해 각 검색에서 가져오는 후보 수 = k * HYBRID_CANDIDATE_FACTOR
+HYBRID_CANDIDATE_FACTOR = int(os.getenv("HYBRID_CANDIDATE_FACTOR", "3"))
+# 벡터 검색 최소 유사도
+HYBRID_VECTOR_THRESHOLD = float(os.getenv("HYBRID_VECTOR_THRESHOLD", "0.5"))
+
+# 키워드 검색 대상 (그래프의 소스가 되는 종류만, 채팅 제외)
+SOURCE_TYPES = ("memo", "pdf", "text", "md")
+
+_db = SQLiteHandler()
+
+
+def reciprocal_rank_fusion(
+    rankings: Dict[str, List[str]],
+    weights: Optional[Dict[str, float]] = None,
+    rrf_k: int = HYBRID_RRF_K
+) -> List[Tuple[str, float, Dict[str, int]]]:
+    """
+    여러 순위 목록을 RRF로 합칩니다.
+    Args:
+        rankings: {검색 방식: [id, ...]} (앞쪽일수록 관련도 높음, 같은 목록 안의 중복은 첫 순위만 사용)
+        weights: {검색 방식: 가중치}, 없으면 1.0
+    Returns:
+        [(id, RRF 점수, {검색 방식: 순위(1부터)})] 점수 내림차순 (동점이면 먼저 나온 순서)
+    """
+    scores: Dict[str, float] = {}
+    ranks: Dict[str, Dict[str, int]] = {}
+    for method, ids in rankings.items():
+        weight = (weights or {}).get(method, 1.0)
+        for rank, item_id in enumerate(dict.fromkeys(ids), start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + weight / (rrf_k + rank)
+            ranks.setdefault(item_id, {})[method] = rank
+    order = sorted(scores, key=lambda item_id: -scores[item_id])
+    return [(item_id, scores[item_id], ranks[item_id]) for item_id in order]
+
+
+def _lexical_search(query: str, brain_id: str, limit: int) -> List[str]:
+    results = _db.search_documents(query, int(brain_id), types=SOURCE_TYPES, limit=limit)
+    return [str(result["id"]) for result in results]
+
+
+async def _vector_search(query: str, brain_id: str, limit: int, timings: Dict[str, float]) -> List[str]:
+    if not await run_in_pool("db", embedding_service.is_index_ready, brain_id):
+        await run_in_pool("db", embedding_service.initialize_collection, brain_id)
+        logging.info("Qdrant 컬렉션 초기화 완료: %s", brain_id)
+
+    started = time.perf_counter()
+    query_embedding = await run_in_pool("embedding", embedding_service.encode_text, query)
+    timings["embedding_ms"] = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    descriptions = await run_in_pool(
+        "db",
+        embedding_service.search_similar_descriptions,
+        embedding=query_embedding,
+        brain_id=brain_id,
+        limit=limit,
+        threshold=HYBRID_VECTOR_THRESHOLD
+    )
+    timings["vector_search_ms"] = (time.perf_counter() - started) * 1000
+    return [str(desc["source_id"]) for desc in descriptions if desc.get("source_id")]
+
+
+async def _timed(name: str, coro, timings: Dict[str, float]) -> List[str]:
+    """검색 하나를 실행하고 걸린 시간을 기록합니다. 실패하면 빈 결과로 대체"""
+    started = time.perf_counter()
+    try:
+        return await coro
+    except Exception as e:
+        logging.warning("%s 검색 실패, 나머지 결과만 사용합니다: %s", name, str(e))
+        return []
+    finally:
+        timings[f"{name}_ms"] = (time.perf_counter() - started) * 1000
+
+
+async def hybrid_search(
+    query: str,
+    brain_id: str,
+    k: int = 10,
+    lexical_weight: float = HYBRID_LEXICAL_WEIGHT,
+    vector_weight: float = HYBRID_VECTOR_WEIGHT
+) -> Dict:
+    """
+    키워드 검색과 벡터 검색을 동시에 실행하고 RRF로 합친 상위 k개 소스를 반환합니다.
+    Returns:
+        {
+          "results": [{"source_id", "score", "lexical_rank", "vector_rank"}],  # 순위가 없으면 None
+          "timings": {"lexical_ms", "vector_ms", "embedding_ms", "vector_search_ms", "fusion_ms", "total_ms"}
+        }
+    """
+    started = time.perf_counter()
+    timings: Dict[str, float] = {}
+    candidates = k * HYBRID_CANDIDATE_FACTOR
+
+    lexical_ids, vector_ids = await asyncio.gather(
+        _timed("lexical", run_in_pool("db", _lexical_search, query, brain_id, candidates), timings),
+        _timed("vector", _vector_search(query, brain_id, candidates, timings), timings)
+    )
+
+    fusion_started = time.perf_counter()
+    fused = reciprocal_rank_fusion(
+        {"lexical": lexical_ids, "vector": vector_ids},
+        weights={"lexical": lexical_weight, "vector": vector_weight}
+    )[:k]
+    timings["fusion_ms"] = (time.perf_counter() - fusion_started) * 1000
+    timings["total_ms"] = (time.perf_counter() - started) * 1000
+
+    logging.info(
+        "하이브리드 검색: 키워드 %d개, 벡터 %d개 → %d개 (%.1fms)",
+        len(lexical_ids), len(vector_ids), len(fused), timings["total_ms"]
+    )
+    return {
+        "results": [
+            {
+                "source_id": source_id,
+                "score": score,
+                "lexical_rank": ranks.get("lexical"),
+                "vector_rank": ranks.get("vector")
+            }
+            for source_id, score, ranks in fused
+        ],
+        "timings": {name: round(ms, 2) for name, ms in timings.items()}
+    }
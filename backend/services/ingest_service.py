@@ -0,0 +1,465 @@
+import copy
+import json
+import logging
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from services import ai_service, embedding_service
+from services.chunk_service import chunk_hash
+from services.pdf_service import chunk_pdf
+from neo4j_db.Neo4jHandler import Neo4jHandler
+from sqlite_db import SQLiteHandler
+from sqlite_db.job_handler import JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED
+
+# ================================================
+# 텍스트 → 그래프/임베딩 백그라운드 수집(ingest) 작업
+# ================================================
+# /jobs/process_text(또는 /pdfs/{pdf_id}/process)로 등록된 작업을 SQLite(IngestJob 테이블)에서 꺼내
+# 워커 스레드가 청킹 → 추출 → 그래프 저장 → 임베딩 순서로 처리합니다.
+# source_path가 있는 작업은 워커가 PDF를 페이지 단위로 직접 읽어 청킹합니다.
+# 큐가 디스크에 있으므로 서버가 재시작되어도 대기/진행 중이던 작업은 다시 처리됩니다.
+
+# 동시에 처리할 작업 수
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "2"))
+# 새 작업이 없을 때 큐를 다시 확인하는 간격 (초)
+INGEST_POLL_INTERVAL = float(os.getenv("INGEST_POLL_INTERVAL", "2.0"))
+# 작업 하나를 시도하는 최대 횟수 (서버 재시작으로 다시 처리되는 횟수 포함)
+INGEST_MAX_ATTEMPTS = int(os.getenv("INGEST_MAX_ATTEMPTS", "3"))
+
+STAGES = ("chunking", "extraction", "graph_write", "embedding")
+
+_db = SQLiteHandler()
+
+
+class JobCancelled(Exception):
+    """작업 도중 취소 요청을 받았을 때 발생"""
+
+
+class _StageProgress:
+    """단계별 done/total 진행 상황을 모아 report 콜백으로 전달하고, 단계 사이마다 취소 여부를 확인합니다."""
+
+    def __init__(self, report=None, should_cancel=None):
+        self.report = report
+        self.should_cancel = should_cancel
+        self.progress = {stage: {"done": 0, "total": 0} for stage in STAGES}
+        self._lock = threading.Lock()
+
+    def _check_cancel(self) -> None:
+        if self.should_cancel and self.should_cancel():
+            raise JobCancelled()
+
+    def enter(self, stage: str, total: int) -> None:
+        self._check_cancel()
+        self.progress[stage]["total"] = total
+        if self.report:
+            self.report(stage, self.progress)
+
+    def advance(self, stage: str) -> None:
+        with self._lock:
+            self.progress[stage]["done"] += 1
+            snapshot = {k: dict(v) for k, v in self.progress.items()}
+        if self.report:
+            self.report(stage, snapshot)
+        self._check_cancel()
+
+
+def run_ingest(
+    text: str,
+    source_id: str,
+    brain_id: str,
+    neo4j_handler: Optional[Neo4jHandler] = None,
+    report: Optional[Callable[[str, Dict], None]] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+    use_cache: bool = True,
+    source_kind: Optional[str] = None
+) -> Dict:
+    """
+    텍스트 하나를 그래프와 벡터 DB에 반영하는 전체 파이프라인
+    Args:
+        report: (현재 단계, 단계별 진행 상황) 을 받는 콜백
+        should_cancel: True를 반환하면 다음 단계/청크 전에 JobCancelled 발생
+        use_cache: False면 LLM 응답 캐시와 청크 체크포인트를 사용하지 않고 모든 청크를 다시 추출
+        source_kind: 원문을 저장할 SourceText 종류(memo/pdf/text/md). 없으면 같은 ID의 파일 종류를 추정
+    Returns:
+        {"nodes_count", "edges_count", "chunks_count", "failed_chunks"}
+        failed_chunks: 추출에 실패해 그래프/벡터 DB에 반영되지 않은 청크 인덱스
+    """
+    stages = _StageProgress(report, should_cancel)
+    # 원문은 전문 검색(SearchIndex)용으로 저장
+    _db.save_source_text(source_id, brain_id, text, kind=source_kind)
+
+    # 1) 청킹
+    stages.enter("chunking", 1)
+    chunks = ai_service.split_into_chunks(text)
+    stages.advance("chunking")
+
+    return _ingest_chunks(chunks, source_id, brain_id, neo4j_handler or Neo4jHandler(), stages, use_cache)
+
+
+def run_pdf_ingest(
+    pdf_path: str,
+    source_id: str,
+    brain_id: str,
+    neo4j_handler: Optional[Neo4jHandler] = None,
+    report: Optional[Callable[[str, Dict], None]] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+    use_cache: bool = True
+) -> Dict:
+    """
+    PDF 파일을 페이지 단위로 읽어 청킹한 뒤 run_ingest와 같은 단계로 처리합니다.
+    청크 → 페이지 매핑은 SourceChunkPage 테이블에 저장합니다.
+    Returns:
+        {"nodes_count", "edges_count", "chunks_count", "failed_chunks", "pages_count"}
+    """
+    stages = _StageProgress(report, should_cancel)
+
+    # 1) 페이지 단위 추출 + 청킹 (chunking 진행률은 페이지 기준)
+    stages.enter("chunking", 0)
+
+    def on_page(number: int, total: int) -> None:
+        stages.progress["chunking"]["total"] = total
+        stages.advance("chunking")
+
+    page_texts: List[str] = []
+    chunks, page_map = chunk_pdf(pdf_path, provider="openai", on_page=on_page, page_texts=page_texts)
+    _db.save_chunk_pages(source_id, page_map)
+    _db.save_source_text(source_id, brain_id, "\n".join(page_texts), kind="pdf")
+
+    result = _ingest_chunks(chunks, source_id, brain_id, neo4j_handler or Neo4jHandler(), stages, use_cache)
+    return {**result, "pages_count": stages.progress["chunking"]["total"]}
+
+
+def _ingest_chunks(
+    chunks: List[str],
+    source_id: str,
+    brain_id: str,
+    neo4j_handler: Neo4jHandler,
+    stages: _StageProgress,
+    use_cache: bool = True
+) -> Dict:
+    """청킹 이후 단계(추출 → Neo4j 저장 → 임베딩)를 수행합니다."""
+    # 2) 청크별 노드/엣지 추출
+    stages.enter("extraction", len(chunks))
+    results, failed = ai_service.extract_chunk_results(
+        chunks, source_id, on_chunk_done=lambda: stages.advance("extraction"), use_cache=use_cache
+    )
+    nodes, edges = ai_service.merge_chunk_results(results)
+
+    # 3) Neo4j 저장
+    stages.enter("graph_write", 1)
+    neo4j_handler.insert_nodes_and_edges(nodes, edges, brain_id)
+    stages.advance("graph_write")
+
+    # 4) 벡터 DB 임베딩
+    stages.enter("embedding", 1)
+    if not embedding_service.is_index_ready(brain_id):
+        embedding_service.initialize_collection(brain_id)
+    embedding_service.update_index_and_get_embeddings(nodes, brain_id)
+    stages.advance("embedding")
+
+    # 쓰기가 모두 성공한 청크를 증분 재처리의 비교 기준으로 기록
+    _record_applied_chunks(str(source_id), [chunk_hash(chunk) for chunk in chunks], {})
+    return {
+        "nodes_count": len(nodes), "edges_count": len(edges), "chunks_count": len(chunks),
+        "failed_chunks": failed
+    }
+
+
+def _record_applied_chunks(source_id: str, hashes: List[str], applied: Dict[str, Dict]) -> None:
+    """
+    Neo4j/Qdrant 쓰기가 모두 끝난 뒤 호출합니다.
+    이미 반영되어 있던 청크(applied)와 이번에 추출에 성공한 청크를 반영된 청크로 기록하고,
+    현재 청크가 아닌 체크포인트를 정리합니다. 추출에 실패한 청크는 기록하지 않아 다음 재처리 때 다시 추출됩니다.
+    """
+    model, prompt_version = ai_service.EXTRACTION_MODEL, ai_service.PROMPT_VERSION
+    done = _db.get_chunk_checkpoints(source_id, [h for h in hashes if h not in applied], model, prompt_version)
+    # 청크 순서대로 기록해 다음 재처리 때 같은 순서로 병합 (대표 이름이 Neo4j에 저장된 것과 같도록)
+    current = {h: applied.get(h, done.get(h)) for h in hashes if h in applied or h in done}
+    _db.save_applied_chunks(source_id, current, hashes, model, prompt_version)
+
+
+def _collect_descriptions(results) -> Tuple[Set[str], Set[str]]:
+    """
+    청크별 (nodes, edges) 결과에 들어 있는 description을
+    (Neo4j에 저장되는 JSON 문자열 집합, 벡터 point_id 계산에 쓰이는 텍스트 집합)으로 반환합니다.
+    """
+    as_json, as_text = set(), set()
+    for nodes, _ in results:
+        for node in nodes:
+            for desc in node.get("descriptions", []):
+                if isinstance(desc, dict) and desc.get("description"):
+                    as_json.add(json.dumps(desc, ensure_ascii=False))
+                    as_text.add(desc["description"])
+    return as_json, as_text
+
+
+def _merge_results(results) -> Tuple[List[Dict], List[Dict]]:
+    """
+    청크별 결과 전체를 Neo4j에 저장될 때와 같은 대표 이름으로 병합합니다.
+    (merge_chunk_results가 노드의 descriptions를 합치며 입력을 수정하므로 사본을 병합)
+    """
+    return ai_service.merge_chunk_results(copy.deepcopy(results))
+
+
+def _edge_key(edge: Dict) -> Tuple[str, str, str]:
+    return edge["source"], edge["target"], edge["relation"]
+
+
+def _changed_writes(
+    previous: Tuple[List[Dict], List[Dict]],
+    current: Tuple[List[Dict], List[Dict]]
+) -> Tuple[List[Dict], List[Dict]]:
+    """
+    병합된 이전/현재 결과를 비교해 새로 써야 할 노드와 엣지를 반환합니다.
+    - 엣지: 이전에 없던 (source, target, relation)
+    - 노드: 이전에 없었거나 새 description이 생긴 노드 + 새 엣지의 양 끝 노드
+    """
+    prev_nodes, prev_edges = previous
+    nodes, edges = current
+    prev_descriptions = {
+        (node["name"], node["label"]): {json.dumps(d, ensure_ascii=False) for d in node.get("descriptions", [])}
+        for node in prev_nodes
+    }
+    prev_edge_keys = {_edge_key(edge) for edge in prev_edges}
+
+    new_edges = [edge for edge in edges if _edge_key(edge) not in prev_edge_keys]
+    endpoints = {name for edge in new_edges for name in (edge["source"], edge["target"])}
+    new_nodes = [
+        node for node in nodes
+        if (node["name"], node["label"]) not in prev_descriptions
+        or {json.dumps(d, ensure_ascii=False) for d in node.get("descriptions", [])}
+        - prev_descriptions[(node["name"], node["label"])]
+        or node["name"] in endpoints
+    ]
+    return new_nodes, new_edges
+
+
+def run_incremental_ingest(
+    text: str,
+    source_id: str,
+    brain_id: str,
+    neo4j_handler: Optional[Neo4jHandler] = None,
+    report: Optional[Callable[[str, Dict], None]] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+    use_cache: bool = True,
+    source_kind: Optional[str] = None
+) -> Dict:
+    """
+    이미 처리된 소스의 텍스트가 바뀌었을 때, 바뀐 청크만 다시 반영합니다.
+    1) 새 텍스트를 청킹해 청크 해시를 지난번에 그래프/벡터 DB까지 반영된 청크(AppliedChunk)와 비교
+    2) 반영되지 않은(새로 생겼거나 지난번에 실패/취소된) 청크만 추출, 추출 체크포인트가 있으면 재사용
+    3) 사라진 청크에서만 나온 description과 엣지를 Neo4j와 벡터 DB에서 삭제
+       (엣지는 이전/현재 청크 전체를 각각 병합한 대표 이름 기준으로 비교)
+    4) 현재 청크 전체의 병합 결과 중 새로 생기거나 바뀐 노드/엣지만 저장하고 임베딩
+    5) 쓰기가 모두 성공한 뒤에만 반영된 청크 기록을 갱신 (중간에 실패하면 다음 재처리 때 다시 반영)
+    지난번에 반영된 청크 기록이 없으면 소스 전체를 지우고 run_ingest로 처음부터 처리합니다.
+    Returns:
+        {"mode", "chunks_count", "added_chunks", "removed_chunks", "removed_descriptions", "removed_edges",
+         "nodes_count", "edges_count", "failed_chunks"}
+    """
+    source_id = str(source_id)
+    neo4j_handler = neo4j_handler or Neo4jHandler()
+    previous = _db.get_applied_chunks(source_id)
+    if not previous:
+        logging.info("source_id %s의 반영된 청크 기록이 없어 전체 재처리합니다.", source_id)
+        neo4j_handler.delete_descriptions_by_source_id(source_id, brain_id)
+        if embedding_service.is_index_ready(brain_id):
+            embedding_service.delete_node(source_id, brain_id)
+        result = run_ingest(text, source_id, brain_id, neo4j_handler, report, should_cancel, use_cache, source_kind)
+        return {"mode": "full", **result}
+
+    stages = _StageProgress(report, should_cancel)
+    _db.save_source_text(source_id, brain_id, text, kind=source_kind)
+
+    # 1) 청킹 + 해시 비교
+    stages.enter("chunking", 1)
+    chunks = ai_service.split_into_chunks(text)
+    hashes = [chunk_hash(chunk) for chunk in chunks]
+    applied = {
+        c["chunk_hash"]: {"nodes": c["nodes"], "edges": c["edges"]} for c in previous
+        if c["model"] == ai_service.EXTRACTION_MODEL and c["prompt_version"] == ai_service.PROMPT_VERSION
+    }
+    removed_chunks = len({c["chunk_hash"] for c in previous} - set(hashes))
+    stages.advance("chunking")
+
+    # 2) 반영되지 않은 청크만 추출
+    pending = [i for i, h in enumerate(hashes) if h not in applied]
+    stages.enter("extraction", len(pending))
+    fresh, failed = ai_service.extract_chunk_results(
+        [chunks[i] for i in pending], source_id, on_chunk_done=lambda: stages.advance("extraction"),
+        use_cache=use_cache
+    )
+    extracted = dict(zip(pending, fresh))
+    results = [
+        extracted[i] if i in extracted else (applied[h]["nodes"], applied[h]["edges"])
+        for i, h in enumerate(hashes)
+    ]
+
+    # 사라진 청크에서만 나온 description/엣지 (남은 청크에도 있으면 유지)
+    previous_results = [(c["nodes"], c["edges"]) for c in previous]
+    prev_json, prev_text = _collect_descriptions(previous_results)
+    new_json, new_text = _collect_descriptions(results)
+    stale_json = sorted(prev_json - new_json)
+    stale_text = sorted(prev_text - new_text)
+    # 노드 이름은 Neo4j에 저장된 것과 같도록 청크 전체를 병합한 뒤 비교 ("딥 러닝" → "딥러닝" 등)
+    previous_merged = _merge_results(previous_results)
+    current_merged = _merge_results(results)
+    current_edge_keys = {_edge_key(edge) for edge in current_merged[1]}
+    stale_edges = [
+        {"source": source, "target": target, "relation": relation}
+        for source, target, relation in sorted({_edge_key(edge) for edge in previous_merged[1]} - current_edge_keys)
+    ]
+    nodes, edges = _changed_writes(previous_merged, current_merged)
+
+    # 3) Neo4j 반영
+    stages.enter("graph_write", 1)
+    neo4j_handler.remove_edges(source_id, brain_id, stale_edges)
+    neo4j_handler.remove_descriptions(source_id, brain_id, stale_json)
+    if nodes or edges:
+        neo4j_handler.insert_nodes_and_edges(nodes, edges, brain_id)
+    stages.advance("graph_write")
+
+    # 4) 벡터 DB 반영
+    stages.enter("embedding", 1)
+    if not embedding_service.is_index_ready(brain_id):
+        embedding_service.initialize_collection(brain_id)
+    embedding_service.delete_descriptions(source_id, brain_id, stale_text)
+    if nodes:
+        embedding_service.update_index_and_get_embeddings(nodes, brain_id)
+    stages.advance("embedding")
+
+    # 5) 다음 비교를 위해 반영된 청크 기록을 현재 청크 목록으로 갱신
+    _record_applied_chunks(source_id, hashes, applied)
+
+    logging.info(
+        "✅ 증분 재처리 완료: source_id=%s, 청크 %d개 중 추가 %d개, 삭제 %d개, description 삭제 %d개, 엣지 삭제 %d개",
+        source_id, len(chunks), len(pending), removed_chunks, len(stale_json), len(stale_edges)
+    )
+    return {
+        "mode": "incremental",
+        "chunks_count": len(chunks),
+        "added_chunks": len(pending),
+        "removed_chunks": removed_chunks,
+        "removed_descriptions": len(stale_json),
+        "removed_edges": len(stale_edges),
+        "nodes_count": len(nodes),
+        "edges_count": len(edges),
+        "failed_chunks": [pending[i] for i in failed]
+    }
+
+
+class IngestWorkerPool:
+    """
+    IngestJob 큐를 소비하는 워커 스레드 묶음
+    - start(): 중단된(running) 작업을 다시 queued로 돌리고 워커를 시작
+              (INGEST_MAX_ATTEMPTS번 시도한 작업은 failed로 마무리)
+    - notify(): 새 작업이 등록되었음을 알려 대기 중인 워커를 깨움
+    - stop(): 워커 종료 (진행 중인 작업은 running으로 남아 다음 시작 때 재처리)
+    """
+
+    def __init__(
+        self,
+        num_workers: int = INGEST_WORKERS,
+        poll_interval: float = INGEST_POLL_INTERVAL,
+        max_attempts: int = INGEST_MAX_ATTEMPTS,
+        db_path=None
+    ):
+        self.num_workers = max(1, num_workers)
+        self.poll_interval = poll_interval
+        self.max_attempts = max(1, max_attempts)
+        self.db = SQLiteHandler(db_path)
+        self._threads = []
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._active: Dict[str, Optional[int]] = {}
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stopping.clear()
+        self.db.requeue_running_jobs(max_attempts=self.max_attempts)
+        for i in range(self.num_workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"ingest-worker-{i}", daemon=True)
+            self._active[thread.name] = None
+            thread.start()
+            self._threads.append(thread)
+        logging.info("🚚 ingest 워커 %d개 시작", self.num_workers)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._active = {}
+        logging.info("🛑 ingest 워커 종료")
+
+    def notify(self) -> None:
+        self._wakeup.set()
+
+    def stats(self) -> Dict:
+        return {
+            "workers": len(self._threads),
+            "active_jobs": [job_id for job_id in self._active.values() if job_id is not None]
+        }
+
+    def _worker_loop(self) -> None:
+        name = threading.current_thread().name
+        while not self._stopping.is_set():
+            job = self.db.claim_next_job()
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            self._active[name] = job["job_id"]
+            try:
+                self.run_job(job)
+            finally:
+                self._active[name] = None
+
+    def run_job(self, job: Dict) -> None:
+        """작업 하나를 처리하고 결과 상태를 기록합니다."""
+        job_id = job["job_id"]
+        if job["attempts"] > self.max_attempts:
+            logging.warning("최대 시도 횟수 초과로 작업 중단: job_id=%s", job_id)
+            self.db.finish_job(job_id, JOB_FAILED, error=f"최대 시도 횟수({self.max_attempts}회) 초과")
+            return
+        logging.info("작업 시작: job_id=%s (시도 %s/%s회차)", job_id, job["attempts"], self.max_attempts)
+        try:
+            report = lambda stage, progress: self.db.update_job_progress(job_id, stage, progress)
+            should_cancel = lambda: self._stopping.is_set() or self.db.is_cancel_requested(job_id)
+            if job.get("source_path"):
+                result = run_pdf_ingest(
+                    job["source_path"], job["source_id"], job["brain_id"],
+                    report=report, should_cancel=should_cancel, use_cache=job["use_cache"]
+                )
+            else:
+                result = run_ingest(
+                    job["text"], job["source_id"], job["brain_id"],
+                    report=report, should_cancel=should_cancel, use_cache=job["use_cache"],
+                    source_kind=job["source_kind"]
+                )
+            if result.get("failed_chunks"):
+                # 일부 청크만 반영된 작업은 실패로 마무리 (같은 작업을 다시 등록하면 실패한 청크만 재추출)
+                failed = result["failed_chunks"]
+                logging.warning("일부 청크 추출 실패: job_id=%s, 청크 %s", job_id, failed)
+                self.db.finish_job(
+                    job_id, JOB_FAILED, result=result,
+                    error=f"청크 {len(failed)}/{result['chunks_count']}개 추출 실패: {failed}"
+                )
+                return
+            self.db.finish_job(job_id, JOB_SUCCEEDED, result=result)
+        except JobCancelled:
+            if self._stopping.is_set() and not self.db.is_cancel_requested(job_id):
+                # 서버 종료로 중단된 작업은 running으로 남겨 다음 시작 때 다시 처리
+                logging.info("서버 종료로 작업 중단: job_id=%s", job_id)
+                return
+            self.db.finish_job(job_id, JOB_CANCELLED)
+        except Exception as e:
+            logging.error("작업 실패: job_id=%s - %s", job_id, str(e))
+            self.db.finish_job(job_id, JOB_FAILED, error=str(e))
+
+
+# 프로세스 전체에서 공유하는 워커 풀 (main.py lifespan에서 시작/종료)
+ingest_workers = IngestWorkerPool()
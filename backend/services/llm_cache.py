@@ -0,0 +1,176 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+# ================================================
+# LLM 추출 응답 캐시 (디스크 SQLite, TTL + 최대 개수 제한)
+# ================================================
+# 같은 청크를 같은 프롬프트/모델로 다시 추출하는 경우(브레인 간 같은 문서 공유, 삭제 후 재업로드 등)
+# LLM을 다시 호출하지 않고 이전 응답 원문을 재사용합니다.
+# 응답 원문(JSON 문자열)을 저장하므로 source_id와 무관하게 재사용할 수 있습니다.
+
+# 디스크 캐시 기본 경로 (backend/data/llm_cache.db)
+LLM_CACHE_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "llm_cache.db")
+# false면 캐시를 조회/저장하지 않음 (전역 bypass)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+# 항목 유효 기간 (초, 기본 30일)
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(30 * 24 * 3600)))
+# 최대 항목 수 (넘으면 가장 오래 사용하지 않은 항목부터 삭제)
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+# 몇 번 저장할 때마다 만료/초과 항목을 정리할지
+PRUNE_EVERY = 100
+
+
+def make_llm_cache_key(provider: str, model: str, prompt_version: str, chunk: str) -> str:
+    """(프로바이더, 모델, 프롬프트 템플릿 해시, 청크 텍스트 해시)로 캐시 키를 만듭니다."""
+    chunk_digest = hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+    return hashlib.sha256(f"{provider}\x00{model}\x00{prompt_version}\x00{chunk_digest}".encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    LLM 응답 원문을 키 기반으로 저장하는 디스크 캐시
+    - ttl_seconds가 지난 항목은 조회 시 miss로 처리하고 삭제합니다.
+    - max_entries를 넘으면 last_used가 가장 오래된 항목부터 삭제합니다.
+    - hit/miss 카운터는 stats()로 확인할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = LLM_CACHE_DB_PATH,
+        ttl_seconds: float = LLM_CACHE_TTL,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        enabled: bool = LLM_CACHE_ENABLED
+    ):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "expired": 0, "writes": 0, "evictions": 0, "bypassed": 0}
+        self._conn: Optional[sqlite3.Connection] = None
+        if enabled and db_path:
+            self._init_db()
+
+    def _init_db(self) -> None:
+        """캐시 테이블을 생성합니다. 실패하면 캐시를 끕니다."""
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL;")
+            self._conn.execute("PRAGMA synchronous=NORMAL;")
+            self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS LLMResponseCache (
+                cache_key TEXT PRIMARY KEY,
+                provider TEXT NOT NULL,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            ''')
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llmcache_last_used ON LLMResponseCache(last_used)")
+            self._conn.commit()
+        except Exception as e:
+            logging.warning("LLM 응답 캐시 초기화 실패, 캐시 없이 동작: %s", str(e))
+            self._conn = None
+
+    def get(self, provider: str, model: str, prompt_version: str, chunk: str, use_cache: bool = True) -> Optional[str]:
+        """캐시된 응답 원문을 반환합니다. 없거나 만료되었으면 None"""
+        if not use_cache or not self.enabled or self._conn is None:
+            with self._lock:
+                self._counters["bypassed"] += 1
+            return None
+        key = make_llm_cache_key(provider, model, prompt_version, chunk)
+        now = time.time()
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT response, created_at FROM LLMResponseCache WHERE cache_key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self._counters["misses"] += 1
+                    return None
+                response, created_at = row
+                if now - created_at > self.ttl_seconds:
+                    self._conn.execute("DELETE FROM LLMResponseCache WHERE cache_key = ?", (key,))
+                    self._conn.commit()
+                    self._counters["expired"] += 1
+                    self._counters["misses"] += 1
+                    return None
+                self._conn.execute("UPDATE LLMResponseCache SET last_used = ? WHERE cache_key = ?", (now, key))
+                self._conn.commit()
+                self._counters["hits"] += 1
+                return response
+            except Exception as e:
+                logging.warning("LLM 응답 캐시 조회 실패: %s", str(e))
+                self._counters["misses"] += 1
+                return None
+
+    def put(self, provider: str, model: str, prompt_version: str, chunk: str, response: str, use_cache: bool = True) -> None:
+        """응답 원문을 저장합니다. PRUNE_EVERY번마다 만료/초과 항목을 정리합니다."""
+        if not use_cache or not self.enabled or self._conn is None:
+            return
+        key = make_llm_cache_key(provider, model, prompt_version, chunk)
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO LLMResponseCache (cache_key, provider, model, response, created_at, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, provider, model, response, now, now)
+                )
+                self._conn.commit()
+                self._counters["writes"] += 1
+                if self._counters["writes"] % PRUNE_EVERY == 0:
+                    self._prune(now)
+            except Exception as e:
+                logging.warning("LLM 응답 캐시 저장 실패: %s", str(e))
+
+    def _prune(self, now: float) -> None:
+        """만료된 항목과 max_entries를 넘는 오래된 항목을 삭제합니다. (lock 보유 상태에서 호출)"""
+        expired = self._conn.execute(
+            "DELETE FROM LLMResponseCache WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        overflow = self._conn.execute(
+            """
+            DELETE FROM LLMResponseCache WHERE cache_key IN (
+                SELECT cache_key FROM LLMResponseCache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,)
+        ).rowcount
+        self._conn.commit()
+        self._counters["evictions"] += expired + overflow
+
+    def prune(self) -> None:
+        """만료/초과 항목을 즉시 정리합니다."""
+        if self._conn is None:
+            return
+        with self._lock:
+            self._prune(time.time())
+
+    def stats(self) -> Dict:
+        """hit/miss 카운터와 현재 저장된 항목 수를 반환합니다."""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            entries = None
+            if self._conn is not None:
+                try:
+                    entries = self._conn.execute("SELECT COUNT(*) FROM LLMResponseCache").fetchone()[0]
+                except Exception:
+                    pass
+            return {
+                **self._counters,
+                "hit_rate": self._counters["hits"] / lookups if lookups else 0.0,
+                "entries": entries,
+                "enabled": self.enabled and self._conn is not None
+            }
+
+
+# 프로세스 전체에서 공유하는 추출 응답 캐시
+llm_cache = LLMResponseCache()
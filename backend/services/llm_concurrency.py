@@ -0,0 +1,107 @@
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, TypeVar
+
+# ================================================
+# LLM 호출 동시성 제한 + rate limit 백오프
+# ================================================
+# 청크별 추출 호출을 스레드 풀로 병렬 실행하되, 프로바이더별 세마포어로
+# 프로세스 전체의 동시 호출 수를 제한합니다. 결과는 항상 입력 청크 순서대로 반환합니다.
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# 프로바이더별 최대 동시 호출 수 (환경 변수로 조정 가능)
+PROVIDER_CONCURRENCY: Dict[str, int] = {
+    "openai": int(os.getenv("OPENAI_MAX_CONCURRENCY", "4")),
+    "ollama": int(os.getenv("OLLAMA_MAX_CONCURRENCY", "2")),
+}
+DEFAULT_CONCURRENCY = 1
+
+# 백오프 설정
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+BASE_DELAY = 1.0   # 초
+MAX_DELAY = 30.0   # 초
+
+# 재시도할 HTTP 상태 코드 (rate limit + 일시적 서버 오류)
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_semaphores_lock = threading.Lock()
+
+
+def get_concurrency(provider: str) -> int:
+    return max(1, PROVIDER_CONCURRENCY.get(provider, DEFAULT_CONCURRENCY))
+
+
+def _get_semaphore(provider: str) -> threading.BoundedSemaphore:
+    with _semaphores_lock:
+        if provider not in _semaphores:
+            _semaphores[provider] = threading.BoundedSemaphore(get_concurrency(provider))
+        return _semaphores[provider]
+
+
+def _status_code(e: Exception) -> Optional[int]:
+    """openai.APIStatusError / ollama.ResponseError 등에서 HTTP 상태 코드를 꺼냅니다."""
+    code = getattr(e, "status_code", None)
+    if code is None:
+        code = getattr(getattr(e, "response", None), "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def is_retryable_error(e: Exception) -> bool:
+    """rate limit(429), 일시적 서버 오류, 타임아웃/연결 오류면 True"""
+    if _status_code(e) in RETRYABLE_STATUS:
+        return True
+    name = type(e).__name__
+    return name in ("RateLimitError", "APITimeoutError", "APIConnectionError", "ConnectError", "ReadTimeout", "TimeoutException")
+
+
+def _retry_after(e: Exception) -> Optional[float]:
+    """응답 헤더의 Retry-After(초)가 있으면 반환합니다."""
+    headers = getattr(getattr(e, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def call_with_backoff(fn: Callable[[], R], provider: str, max_retries: int = MAX_RETRIES) -> R:
+    """
+    fn()을 프로바이더 세마포어 안에서 실행하고, 재시도 가능한 오류면 지수 백오프 후 다시 시도합니다.
+    - 대기 시간: Retry-After 헤더가 있으면 그 값, 없으면 BASE_DELAY * 2^attempt (+ jitter), 최대 MAX_DELAY
+    - 대기하는 동안에는 세마포어를 반납해 다른 청크가 진행할 수 있게 합니다.
+    Raises:
+        마지막 시도의 예외 또는 재시도 불가능한 예외를 그대로 전달
+    """
+    semaphore = _get_semaphore(provider)
+    for attempt in range(max_retries + 1):
+        try:
+            with semaphore:
+                return fn()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable_error(e):
+                raise
+            delay = _retry_after(e)
+            if delay is None:
+                delay = min(MAX_DELAY, BASE_DELAY * (2 ** attempt)) * (0.5 + random.random() / 2)
+            logging.warning("%s 호출 재시도 %d/%d (%.1f초 후): %s", provider, attempt + 1, max_retries, delay, str(e))
+            time.sleep(delay)
+
+
+def map_in_order(provider: str, fn: Callable[[T], R], items: List[T]) -> List[R]:
+    """
+    items 각각에 fn을 병렬로 적용하고 입력 순서대로 결과를 반환합니다.
+    스레드 수는 프로바이더 동시성 한도와 items 수 중 작은 값입니다.
+    """
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+    workers = min(get_concurrency(provider), len(items))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{provider}-extract") as pool:
+        return list(pool.map(fn, items))
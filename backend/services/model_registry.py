@@ -0,0 +1,108 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# ================================================
+# 모델/클라이언트 지연 로딩 레지스트리
+# ================================================
+# 임베딩 모델, Whisper 파이프라인, Qdrant 클라이언트처럼 생성 비용이 큰 객체를
+# import 시점이 아니라 처음 사용할 때 한 번만 만들고 프로세스 전체에서 공유합니다.
+# main.py의 lifespan에서 warm_up()을 백그라운드로 호출해 미리 올려둘 수도 있습니다.
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._errors: Dict[str, str] = {}
+        self._load_seconds: Dict[str, float] = {}
+        self._warmup_targets: List[str] = []
+        self._registry_lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any]) -> None:
+        """
+        이름과 로더 함수를 등록합니다. 로더는 get()이 처음 호출될 때 실행됩니다.
+        Args:
+            name: 레지스트리 키 (예: "koe5", "qdrant")
+            loader: 인자 없이 객체를 생성해 반환하는 함수
+        """
+        with self._registry_lock:
+            self._loaders[name] = loader
+            self._locks.setdefault(name, threading.Lock())
+
+    def get(self, name: str) -> Any:
+        """
+        등록된 객체를 반환합니다. 아직 로드되지 않았다면 이 호출에서 로드합니다.
+        여러 스레드가 동시에 호출해도 로더는 한 번만 실행됩니다.
+        Raises:
+            KeyError: 등록되지 않은 이름
+            RuntimeError: 로더 실행 실패 시
+        """
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        if name not in self._loaders:
+            raise KeyError(f"등록되지 않은 모델: {name}")
+
+        with self._locks[name]:
+            # 대기하는 동안 다른 스레드가 로드를 끝냈을 수 있음
+            instance = self._instances.get(name)
+            if instance is not None:
+                return instance
+
+            logging.info("⏳ 모델 로딩 시작: %s", name)
+            started = time.perf_counter()
+            try:
+                instance = self._loaders[name]()
+            except Exception as e:
+                self._errors[name] = str(e)
+                logging.error("❌ 모델 로딩 실패: %s - %s", name, str(e))
+                raise RuntimeError(f"모델 로딩 실패({name}): {str(e)}")
+            self._load_seconds[name] = time.perf_counter() - started
+            self._errors.pop(name, None)
+            self._instances[name] = instance
+            logging.info("✅ 모델 로딩 완료: %s (%.1f초)", name, self._load_seconds[name])
+            return instance
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> Dict[str, bool]:
+        """
+        지정한(또는 등록된 전체) 모델을 순서대로 로드합니다.
+        실패한 모델은 건너뛰고 다음 모델을 계속 로드합니다.
+        Returns:
+            {이름: 로드 성공 여부}
+        """
+        targets = list(names) if names is not None else list(self._loaders.keys())
+        self._warmup_targets = targets
+        results = {}
+        for name in targets:
+            try:
+                self.get(name)
+                results[name] = True
+            except (KeyError, RuntimeError) as e:
+                logging.warning("warm-up 건너뜀: %s - %s", name, str(e))
+                results[name] = False
+        return results
+
+    def is_ready(self) -> bool:
+        """warm-up 대상 모델이 모두 로드되었으면 True (warm-up을 하지 않았다면 항상 True)"""
+        return all(name in self._instances for name in self._warmup_targets)
+
+    def status(self) -> Dict[str, Dict]:
+        """등록된 모델별 로드 여부, 소요 시간, 마지막 오류를 반환합니다."""
+        return {
+            name: {
+                "loaded": name in self._instances,
+                "load_seconds": self._load_seconds.get(name),
+                "error": self._errors.get(name)
+            }
+            for name in self._loaders
+        }
+
+
+# 프로세스 전체에서 공유하는 레지스트리
+registry = ModelRegistry()
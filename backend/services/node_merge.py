@@ -0,0 +1,194 @@
+import logging
+import os
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# ================================================
+# 추출 노드 병합 (정확 일치 + 유사 엔티티 해소)
+# ================================================
+# 1) 정확 병합: (name, label) 딕셔너리 인덱스로 O(n)에 descriptions를 합칩니다.
+# 2) 표기 정규화 병합: 공백/대소문자/유니코드 폭만 다른 이름("딥러닝"/"딥 러닝")을 같은 label 안에서 합칩니다.
+# 3) (선택) 임베딩 병합: 같은 label이면서 이름의 문자 bigram을 공유하는 후보 쌍만 골라(blocking)
+#    KoE5 이름 임베딩의 코사인 유사도가 임계값 이상이면 합칩니다.
+# 병합된 이름을 참조하는 엣지는 대표 이름으로 바꾸고, 그 결과 생긴 중복/자기 루프 엣지는 제거합니다.
+
+# true면 3) 임베딩 기반 유사 엔티티 해소까지 수행
+ENTITY_RESOLUTION_ENABLED = os.getenv("ENTITY_RESOLUTION_ENABLED", "false").lower() in ("1", "true", "yes")
+# 같은 엔티티로 볼 최소 코사인 유사도
+ENTITY_RESOLUTION_THRESHOLD = float(os.getenv("ENTITY_RESOLUTION_THRESHOLD", "0.92"))
+# bigram 하나를 공유하는 이름이 이보다 많으면 그 bigram은 후보 생성에 쓰지 않음 (너무 흔한 bigram)
+MAX_BLOCK_SIZE = 200
+
+_SPACE_PATTERN = re.compile(r"[\s_\-·]+")
+
+NodeKey = Tuple[str, str]
+
+
+def normalize_name(name: str) -> str:
+    """비교용 이름 정규화 (NFKC, 소문자, 공백/구분자 제거)"""
+    return _SPACE_PATTERN.sub("", unicodedata.normalize("NFKC", name).lower())
+
+
+def merge_exact_nodes(nodes: List[Dict]) -> List[Dict]:
+    """(name, label)이 같은 노드의 descriptions를 합칩니다. 처음 등장한 순서를 유지합니다."""
+    index: Dict[NodeKey, Dict] = {}
+    unique = []
+    for node in nodes:
+        key = (node["name"], node["label"])
+        existing = index.get(key)
+        if existing is None:
+            index[key] = node
+            unique.append(node)
+        else:
+            existing["descriptions"].extend(node["descriptions"])
+    return unique
+
+
+def remove_duplicate_edges(edges: List[Dict]) -> List[Dict]:
+    """(source, target, relation)이 같은 엣지를 제거합니다."""
+    seen = set()
+    unique = []
+    for edge in edges:
+        key = (edge["source"], edge["target"], edge["relation"])
+        if key not in seen:
+            seen.add(key)
+            unique.append(edge)
+    return unique
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            # 먼저 등장한 노드를 대표로
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def _bigrams(name: str) -> set:
+    return {name[i:i + 2] for i in range(len(name) - 1)} or {name}
+
+
+def _candidate_pairs(nodes: List[Dict], keys: List[str]) -> List[Tuple[int, int]]:
+    """같은 label이면서 정규화된 이름의 bigram을 하나 이상 공유하는 노드 쌍 (blocking)"""
+    blocks: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+    for i, node in enumerate(nodes):
+        for gram in _bigrams(keys[i]):
+            blocks[(node["label"], gram)].append(i)
+
+    pairs = set()
+    for members in blocks.values():
+        if len(members) < 2 or len(members) > MAX_BLOCK_SIZE:
+            continue
+        for a in range(len(members)):
+            for b in range(a + 1, len(members)):
+                pairs.add((members[a], members[b]))
+    return sorted(pairs)
+
+
+def _embedding_unions(
+    nodes: List[Dict],
+    keys: List[str],
+    uf: _UnionFind,
+    threshold: float,
+    encode_fn: Callable[[List[str]], np.ndarray]
+) -> int:
+    """후보 쌍의 이름 임베딩 코사인 유사도가 threshold 이상이면 합칩니다. 합친 쌍 수를 반환합니다."""
+    pairs = [(a, b) for a, b in _candidate_pairs(nodes, keys) if uf.find(a) != uf.find(b)]
+    if not pairs:
+        return 0
+    involved = sorted({i for pair in pairs for i in pair})
+    position = {i: p for p, i in enumerate(involved)}
+    vectors = np.asarray(encode_fn([nodes[i]["name"] for i in involved]), dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = vectors / np.where(norms > 0, norms, 1.0)
+
+    left = np.array([position[a] for a, _ in pairs])
+    right = np.array([position[b] for _, b in pairs])
+    similarities = np.einsum("ij,ij->i", vectors[left], vectors[right])
+    merged = 0
+    for (a, b), similarity in zip(pairs, similarities):
+        if similarity >= threshold and uf.find(a) != uf.find(b):
+            uf.union(a, b)
+            merged += 1
+    return merged
+
+
+def merge_nodes_and_edges(
+    nodes: List[Dict],
+    edges: List[Dict],
+    resolve_entities: bool = ENTITY_RESOLUTION_ENABLED,
+    threshold: float = ENTITY_RESOLUTION_THRESHOLD,
+    encode_fn: Optional[Callable[[List[str]], np.ndarray]] = None
+) -> Tuple[List[Dict], List[Dict]]:
+    """
+    추출된 노드/엣지를 병합합니다.
+    Args:
+        resolve_entities: True면 KoE5 이름 임베딩으로 유사 엔티티까지 병합
+        encode_fn: 이름 리스트 → 임베딩 행렬 (기본값은 embedding_service.encode_texts)
+    Returns:
+        (병합된 노드, 이름을 대표 이름으로 바꾸고 중복을 제거한 엣지)
+    """
+    nodes = merge_exact_nodes(nodes)
+    keys = [normalize_name(node["name"]) for node in nodes]
+    uf = _UnionFind(len(nodes))
+
+    # 표기만 다른 이름은 같은 label 안에서 바로 병합
+    first_by_key: Dict[Tuple[str, str], int] = {}
+    for i, node in enumerate(nodes):
+        block_key = (node["label"], keys[i])
+        if block_key in first_by_key:
+            uf.union(first_by_key[block_key], i)
+        else:
+            first_by_key[block_key] = i
+
+    if resolve_entities and len(nodes) > 1:
+        if encode_fn is None:
+            from .embedding_service import encode_texts
+            encode_fn = encode_texts
+        try:
+            merged = _embedding_unions(nodes, keys, uf, threshold, encode_fn)
+            if merged:
+                logging.info("✅ 유사 엔티티 %d쌍 병합 (임계값 %.2f)", merged, threshold)
+        except Exception as e:
+            logging.warning("유사 엔티티 해소 실패, 정확 병합 결과만 사용: %s", str(e))
+
+    # 그룹별로 대표 노드(먼저 등장한 노드)에 descriptions 병합
+    result = []
+    renamed: Dict[str, set] = defaultdict(set)
+    for i, node in enumerate(nodes):
+        root = uf.find(i)
+        if root == i:
+            result.append(node)
+        else:
+            nodes[root]["descriptions"].extend(node["descriptions"])
+        renamed[node["name"]].add(nodes[root]["name"])
+
+    # 같은 이름이 서로 다른 대표로 병합된 경우(label이 다른 동명 노드)는 엣지를 바꾸지 않음
+    alias = {
+        name: next(iter(targets))
+        for name, targets in renamed.items()
+        if len(targets) == 1 and next(iter(targets)) != name
+    }
+    if alias:
+        rewritten = []
+        for edge in edges:
+            source = alias.get(edge["source"], edge["source"])
+            target = alias.get(edge["target"], edge["target"])
+            if source == target and (edge["source"] in alias or edge["target"] in alias):
+                continue
+            rewritten.append({**edge, "source": source, "target": target})
+        edges = rewritten
+    return result, remove_duplicate_edges(edges)
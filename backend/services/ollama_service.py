@@ -5,22 +5,72 @@ from dotenv import load_dotenv
 
 import logging
 import json
-from typing import Tuple, List, Dict
+import hashlib
+import threading
+import time
+from typing import Tuple, List, Dict, Iterator
 from ollama import chat, pull  # Python Ollama SDK
 from .ai_service import BaseAIService
-from .chunk_service import chunk_text
+from .chunk_service import iter_chunks
+from .llm_concurrency import call_with_backoff
+from .chunk_checkpoint import extract_chunks
+from .llm_cache import llm_cache
+from .node_merge import merge_nodes_and_edges
+from .model_registry import registry
 
 MODEL_NAME = "exaone3.5:2.4b"
-pull(MODEL_NAME)
+# pull이 실패한 뒤 다시 시도하기까지 기다리는 시간 (초), 그동안은 pull 없이 바로 chat을 호출
+OLLAMA_PULL_RETRY_SECONDS = float(os.getenv("OLLAMA_PULL_RETRY_SECONDS", "300"))
 
-class OllamaAIService(BaseAIService):
-    def __init__(self):
-        # 최초에 모델이 로컬에 없으면 내려받습니다. location : C:\Users\<username>\.ollama\models
+# 노드/엣지 추출 프롬프트 (청크 텍스트는 뒤에 붙여서 사용)
+EXTRACTION_SYSTEM_PROMPT = "당신은 노드/엣지 추출 전문가입니다."
+EXTRACTION_PROMPT = (
+    "다음 텍스트에서 노드와 엣지를 추출해 JSON으로 출력해 주세요.\n"
+    "{\n"
+    '  "nodes": [ { "label": "...", "name": "...", "description": "..." }, ... ],\n'
+    '  "edges": [ { "source": "...", "target": "...", "relation": "..." }, ... ]\n'
+    "}\n\n"
+)
+PROMPT_VERSION = hashlib.sha256((EXTRACTION_SYSTEM_PROMPT + EXTRACTION_PROMPT).encode("utf-8")).hexdigest()[:12]
+
+
+def _pull_model() -> str:
+    # 최초에 모델이 로컬에 없으면 내려받습니다. location : C:\Users\<username>\.ollama\models
+    pull(MODEL_NAME)
+    return MODEL_NAME
+
+
+registry.register("ollama", _pull_model)
+
+
+_pull_lock = threading.Lock()
+_pull_failed_at = None
+
+
+def _ensure_model() -> None:
+    """
+    프로세스당 한 번만 pull 합니다. (실패해도 chat 호출은 시도)
+    실패하면 OLLAMA_PULL_RETRY_SECONDS 동안은 다시 pull 하지 않아, 호출마다 pull을 기다리지 않습니다.
+    """
+    global _pull_failed_at
+    if registry.is_loaded("ollama"):
+        return
+    with _pull_lock:
+        if registry.is_loaded("ollama"):
+            return
+        if _pull_failed_at is not None and time.monotonic() - _pull_failed_at < OLLAMA_PULL_RETRY_SECONDS:
+            return
         try:
-            pull(MODEL_NAME)
-            logging.info(f"Ollama 모델 '{MODEL_NAME}' 준비 완료")
-        except Exception as e:
-            logging.warning(f"Ollama 모델 '{MODEL_NAME}' 풀링 오류: {e}")
+            registry.get("ollama")
+            _pull_failed_at = None
+        except RuntimeError as e:
+            _pull_failed_at = time.monotonic()
+            logging.warning(
+                f"Ollama 모델 '{MODEL_NAME}' 풀링 오류 ({OLLAMA_PULL_RETRY_SECONDS:.0f}초 후 다시 시도): {e}"
+            )
+
+
+class OllamaAIService(BaseAIService):
 
     def extract_referenced_nodes(self, llm_response: str) -> List[str]:
         parts = llm_response.split("EOF")
@@ -38,47 +88,48 @@ class OllamaAIService(BaseAIService):
             return []
 
     def extract_graph_components(
-        self, text: str, source_id: str
+        self, text: str, source_id: str, chunks: List[str] = None, on_chunk_done=None, use_cache: bool = True
     ) -> Tuple[List[Dict], List[Dict]]:
         all_nodes, all_edges = [], []
-        chunks = chunk_text(text) if len(text) >= 2000 else [text]
+        if chunks is None:
+            chunks = [chunk.text for chunk in iter_chunks(text, provider="ollama")] or [text]
         logging.info(f"총 {len(chunks)}개 청크로 분할")
-        for idx, chunk in enumerate(chunks, 1):
-            logging.info(f"청크 {idx}/{len(chunks)} 처리")
-            nodes, edges = self._extract_from_chunk(chunk, source_id)
+        # 청크별 추출은 OLLAMA_MAX_CONCURRENCY 한도 안에서 병렬 실행, 병합은 청크 순서대로
+        # 이전에 성공한 청크는 체크포인트에서 재사용
+        results, _ = extract_chunks(
+            chunks, source_id, "ollama", MODEL_NAME, PROMPT_VERSION,
+            lambda chunk: self._request_chunk_extraction(chunk, source_id, use_cache), on_chunk_done, use_cache
+        )
+        for nodes, edges in results:
             all_nodes.extend(nodes)
             all_edges.extend(edges)
 
-        return (
-            self._remove_duplicate_nodes(all_nodes),
-            self._remove_duplicate_edges(all_edges)
-        )
+        return merge_nodes_and_edges(all_nodes, all_edges)
 
-    def _extract_from_chunk(
-        self, chunk: str, source_id: str
+    def _request_chunk_extraction(
+        self, chunk: str, source_id: str, use_cache: bool = True
     ) -> Tuple[List[Dict], List[Dict]]:
-        prompt = (
-            "다음 텍스트에서 노드와 엣지를 추출해 JSON으로 출력해 주세요.\n"
-            "{\n"
-            '  "nodes": [ { "label": "...", "name": "...", "description": "..." }, ... ],\n'
-            '  "edges": [ { "source": "...", "target": "...", "relation": "..." }, ... ]\n'
-            "}\n\n"
-            f"텍스트: {chunk}"
-        )
-        try:
-            resp = chat(
+        """
+        청크 하나를 추출합니다. LLM 호출이나 JSON 파싱이 실패하면 예외를 그대로 발생시킵니다.
+        같은 청크/프롬프트/모델의 응답이 캐시에 있으면 모델을 호출하지 않습니다.
+        """
+        content = llm_cache.get("ollama", MODEL_NAME, PROMPT_VERSION, chunk, use_cache)
+        cached = content is not None
+        if not cached:
+            prompt = EXTRACTION_PROMPT + f"텍스트: {chunk}"
+            _ensure_model()
+            resp = call_with_backoff(lambda: chat(
                 model=MODEL_NAME,
                 messages=[
-                    {"role": "system", "content": "당신은 노드/엣지 추출 전문가입니다."},
+                    {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
                     {"role": "user",   "content": prompt}
                 ],
                 stream=False
-            )
+            ), "ollama")
             content = resp["message"]["content"]
-            data = json.loads(content)
-        except Exception as e:
-            logging.error(f"_extract_from_chunk 오류: {e}")
-            return [], []
+        data = json.loads(content)
+        if not cached:
+            llm_cache.put("ollama", MODEL_NAME, PROMPT_VERSION, chunk, content, use_cache)
 
         # 노드 검증
         valid_nodes = []
@@ -98,6 +149,7 @@ class OllamaAIService(BaseAIService):
         for edge in data.get("edges", []):
             if all(k in edge for k in ("source", "target", "relation")):
                 if edge["source"] in node_names and edge["target"] in node_names:
+                    edge["source_id"] = source_id
                     valid_edges.append(edge)
                 else:
                     logging.warning("잘못된 엣지 참조: %s", edge)
@@ -106,37 +158,18 @@ class OllamaAIService(BaseAIService):
 
         return valid_nodes, valid_edges
 
-    def _remove_duplicate_nodes(self, nodes: List[Dict]) -> List[Dict]:
-        seen = set(); unique = []
-        for node in nodes:
-            key = (node["name"], node["label"])
-            if key in seen:
-                for u in unique:
-                    if (u["name"], u["label"]) == key:
-                        u["descriptions"].extend(node["descriptions"])
-                        break
-            else:
-                seen.add(key)
-                unique.append(node)
-        return unique
-
-    def _remove_duplicate_edges(self, edges: List[Dict]) -> List[Dict]:
-        seen = set(); unique = []
-        for edge in edges:
-            key = (edge["source"], edge["target"], edge["relation"])
-            if key not in seen:
-                seen.add(key)
-                unique.append(edge)
-        return unique
-
-    def generate_answer(self, schema_text: str, question: str) -> str:
-        prompt = (
+    def _build_answer_prompt(self, schema_text: str, question: str) -> str:
+        return (
             "다음 스키마와 질문을 바탕으로 답변을 작성하세요.\n\n"
             f"스키마:\n{schema_text}\n\n"
             f"질문: {question}\n\n"
             "EOF\n"
             "{\n  \"referenced_nodes\": [\"노드1\", \"노드2\", ...]\n}\n"
         )
+
+    def generate_answer(self, schema_text: str, question: str) -> str:
+        prompt = self._build_answer_prompt(schema_text, question)
+        _ensure_model()
         try:
             resp = chat(
                 model=MODEL_NAME,
@@ -148,6 +181,23 @@ class OllamaAIService(BaseAIService):
             logging.error(f"generate_answer 오류: {e}")
             raise
 
+    def generate_answer_stream(self, schema_text: str, question: str) -> Iterator[str]:
+        """generate_answer의 스트리밍 버전 (토큰 조각을 도착하는 대로 반환)"""
+        prompt = self._build_answer_prompt(schema_text, question)
+        _ensure_model()
+        try:
+            for part in chat(
+                model=MODEL_NAME,
+                messages=[{"role": "user", "content": prompt}],
+                stream=True
+            ):
+                content = part["message"]["content"]
+                if content:
+                    yield content
+        except Exception as e:
+            logging.error(f"generate_answer_stream 오류: {e}")
+            raise
+
     def generate_schema_text(
         self,
         nodes: List[Dict],
@@ -194,6 +244,7 @@ class OllamaAIService(BaseAIService):
         단일 프롬프트를 Ollama LLM에 보내고,
         모델 응답 문자열만 리턴합니다.
         """
+        _ensure_model()
         try:
             resp = chat(
                 model=MODEL_NAME,
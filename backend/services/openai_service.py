@@ -3,6 +3,8 @@ import logging
 from openai import OpenAI           # OpenAI 클라이언트 임포트
 import json
 from .chunk_service import chunk_text
+from .llm_concurrency import call_with_backoff, map_in_order
+from .node_merge import merge_exact_nodes, remove_duplicate_edges
 from .ai_service import BaseAIService
 from typing import List
 
@@ -67,10 +69,11 @@ class OpenAIService() :
             chunks = chunk_text(text)
             logging.info(f"✅ 텍스트가 {len(chunks)}개의 청크로 분할되어 처리됩니다.")
             
-            # 각 청크별로 노드와 엣지 추출
-            for i, chunk in enumerate(chunks, 1):
-                logging.info(f"청크 {i}/{len(chunks)} 처리 중...")
-                nodes, edges = _extract_from_chunk(chunk, source_id)
+            # 각 청크를 동시성 한도 안에서 병렬로 추출하고, 결과는 청크 순서대로 병합
+            results = map_in_order(
+                "openai", lambda chunk: _extract_from_chunk(chunk, source_id), chunks
+            )
+            for nodes, edges in results:
                 all_nodes.extend(nodes)
                 all_edges.extend(edges)
         else:
@@ -106,7 +109,8 @@ class OpenAIService() :
         f"텍스트: {chunk}"
         )
         try:
-            completion = client.chat.completions.create(
+            # rate limit(429) 등 일시적 오류는 백오프 후 재시도
+            completion = call_with_backoff(lambda: client.chat.completions.create(
                 model="gpt-4o",
                 messages=[
                     {"role": "system", "content": "너는 텍스트에서 구조화된 노드와 엣지를 추출하는 전문가야. 엣지의 source와 target은 반드시 노드의 name을 참조해야 해."},
@@ -116,7 +120,7 @@ class OpenAIService() :
                 temperature=0.3,
                 # JSON만 돌려주도록 강제
                 response_format={"type": "json_object"}
-            )
+            ), "openai")
 
             # print("response: ", response)
             # data = json.loads(response)
@@ -169,31 +173,12 @@ class OpenAIService() :
             return [], []
 
     def _remove_duplicate_nodes(nodes: list) -> list:
-        """중복된 노드를 제거합니다."""
-        seen = set()
-        unique_nodes = []
-        for node in nodes:
-            node_key = (node["name"], node["label"])
-            if node_key not in seen:
-                seen.add(node_key)
-                unique_nodes.append(node)
-            else:
-                # 같은 이름의 노드가 있으면 descriptions만 추가
-                for existing_node in unique_nodes:
-                    if existing_node["name"] == node["name"] and existing_node["label"] == node["label"]:
-                        existing_node["descriptions"].extend(node["descriptions"])
-        return unique_nodes
+        """중복된 노드를 제거합니다. (같은 이름의 노드가 있으면 descriptions만 추가)"""
+        return merge_exact_nodes(nodes)
 
     def _remove_duplicate_edges(edges: list) -> list:
         """중복된 엣지를 제거합니다."""
-        seen = set()
-        unique_edges = []
-        for edge in edges:
-            edge_key = (edge["source"], edge["target"], edge["relation"])
-            if edge_key not in seen:
-                seen.add(edge_key)
-                unique_edges.append(edge)
-        return unique_edges
+        return remove_duplicate_edges(edges)
 
     def generate_answer(schema_text: str, question: str) -> str:
         """
@@ -0,0 +1,94 @@
+import logging
+from bisect import bisect_right
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .chunk_service import chunk_hash, iter_chunks
+
+# ================================================
+# 서버 측 PDF 텍스트 추출
+# ================================================
+# 업로드된 PDF를 페이지 단위로 읽어 바로 청커(iter_chunks)에 흘려보냅니다.
+# 전체 텍스트를 한 문자열로 만들지 않으며, 청크마다 어느 페이지(문자 오프셋)에서 왔는지 기록합니다.
+
+# 페이지 사이 구분자 (문장이 페이지를 넘어 이어질 수 있으므로 문단 경계로 취급하지 않음)
+PAGE_SEPARATOR = "\n"
+
+
+def _open_reader(path: str):
+    try:
+        from pypdf import PdfReader
+    except ImportError as e:
+        raise RuntimeError("PDF 텍스트 추출에는 pypdf 패키지가 필요합니다. (pip install pypdf)") from e
+    try:
+        return PdfReader(path)
+    except Exception as e:
+        logging.error("PDF 열기 실패 (%s): %s", path, str(e))
+        raise RuntimeError(f"PDF 열기 실패: {str(e)}")
+
+
+def iter_pdf_pages(path: str) -> Iterator[Tuple[int, int, str]]:
+    """
+    PDF를 한 페이지씩 읽어 텍스트를 반환합니다. 텍스트를 추출하지 못한 페이지는 빈 문자열
+    Yields:
+        (페이지 번호(1부터), 전체 페이지 수, 페이지 텍스트)
+    Raises:
+        RuntimeError: pypdf가 없거나 PDF를 열 수 없을 때
+    """
+    reader = _open_reader(path)
+    total = len(reader.pages)
+    for number, page in enumerate(reader.pages, start=1):
+        try:
+            text = page.extract_text() or ""
+        except Exception as e:
+            logging.warning("PDF %s %d페이지 텍스트 추출 실패: %s", path, number, str(e))
+            text = ""
+        yield number, total, text
+
+
+def chunk_pdf(
+    path: str,
+    provider: str = "openai",
+    on_page: Optional[Callable[[int, int], None]] = None,
+    max_tokens: Optional[int] = None,
+    count_tokens: Optional[Callable[[str], int]] = None,
+    page_texts: Optional[List[str]] = None
+) -> Tuple[List[str], List[Dict]]:
+    """
+    PDF를 페이지 단위로 읽으면서 청킹합니다.
+    Args:
+        on_page: 페이지 하나를 읽을 때마다 (페이지 번호, 전체 페이지 수)로 호출되는 콜백
+        max_tokens, count_tokens: iter_chunks에 그대로 전달
+        page_texts: 리스트를 주면 읽은 페이지 텍스트를 순서대로 추가 (전문 검색용 원문 저장)
+    Returns:
+        (청크 텍스트 목록, 청크별 매핑 [{"chunk_index", "chunk_hash", "char_start", "char_end", "page_start", "page_end"}])
+        char_*는 페이지 텍스트를 PAGE_SEPARATOR로 이어 붙였을 때의 오프셋
+    """
+    page_starts: List[int] = []
+
+    def pages() -> Iterator[str]:
+        offset = 0
+        for number, total, text in iter_pdf_pages(path):
+            page_starts.append(offset)
+            if page_texts is not None:
+                page_texts.append(text)
+            piece = text + PAGE_SEPARATOR
+            offset += len(piece)
+            if on_page:
+                on_page(number, total)
+            yield piece
+
+    chunks: List[str] = []
+    page_map: List[Dict] = []
+    for index, chunk in enumerate(iter_chunks(pages(), provider=provider, max_tokens=max_tokens, count_tokens=count_tokens)):
+        chunks.append(chunk.text)
+        page_map.append({
+            "chunk_index": index,
+            "chunk_hash": chunk_hash(chunk.text),
+            "char_start": chunk.start,
+            "char_end": chunk.end,
+            # page_starts는 청크가 만들어질 때까지 읽은 페이지까지 채워져 있음
+            "page_start": bisect_right(page_starts, chunk.start),
+            "page_end": bisect_right(page_starts, max(chunk.start, chunk.end - 1))
+        })
+    logging.info("✅ PDF %s: %d페이지 → %d개 청크", path, len(page_starts), len(chunks))
+    return chunks, page_map
@@ -0,0 +1,91 @@
+import hashlib
+import logging
+import os
+import uuid
+from typing import BinaryIO, Dict
+
+from fastapi import UploadFile
+
+from .executors import run_in_pool
+
+# ================================================
+# 업로드 파일 스트리밍 저장
+# ================================================
+# 업로드 파일을 통째로 메모리에 읽지 않고 UPLOAD_CHUNK_SIZE씩 임시 파일에 쓰면서
+# sha256 해시와 크기를 함께 계산합니다. 다 쓰면 fsync 후 "<해시><확장자>" 이름으로 rename하므로
+# 중간에 실패해도 반쯤 쓰인 파일이 최종 경로에 남지 않고, 내용이 같은 파일은 한 번만 저장됩니다.
+
+# 한 번에 읽고 쓰는 크기 (요청당 메모리 사용량 상한)
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+# 파일 하나의 최대 크기 (바이트, 기본 200MB)
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(200 * 1024 * 1024)))
+
+
+class UploadTooLargeError(Exception):
+    """업로드 파일이 MAX_UPLOAD_BYTES를 넘을 때 발생"""
+
+
+def _fsync_dir(directory: str) -> None:
+    """rename 결과가 디스크에 반영되도록 디렉터리도 fsync (지원하지 않는 OS는 무시)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_stream(source: BinaryIO, upload_dir: str, ext: str, max_bytes: int = MAX_UPLOAD_BYTES) -> Dict:
+    """
+    파일 객체를 청크 단위로 복사해 upload_dir/<sha256><ext>에 원자적으로 저장합니다.
+    Returns:
+        {"path", "sha256", "size", "deduplicated"}
+    Raises:
+        UploadTooLargeError: max_bytes를 넘는 경우 (임시 파일은 삭제)
+    """
+    os.makedirs(upload_dir, exist_ok=True)
+    temp_path = os.path.join(upload_dir, f".{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(temp_path, "wb") as out:
+            while True:
+                chunk = source.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(f"파일 크기가 최대 {max_bytes} 바이트를 넘습니다.")
+                digest.update(chunk)
+                out.write(chunk)
+            out.flush()
+            os.fsync(out.fileno())
+
+        final_path = os.path.join(upload_dir, f"{digest.hexdigest()}{ext}")
+        deduplicated = os.path.exists(final_path)
+        if deduplicated:
+            os.remove(temp_path)
+        else:
+            os.replace(temp_path, final_path)
+            _fsync_dir(upload_dir)
+        return {"path": final_path, "sha256": digest.hexdigest(), "size": size, "deduplicated": deduplicated}
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+async def save_upload(file: UploadFile, upload_dir: str, ext: str, max_bytes: int = MAX_UPLOAD_BYTES) -> Dict:
+    """
+    UploadFile을 io 풀에서 스트리밍 저장합니다. (multipart 파서가 만든 임시 파일을 청크 단위로 복사)
+    Returns:
+        write_stream과 같음
+    """
+    saved = await run_in_pool("io", write_stream, file.file, upload_dir, ext, max_bytes)
+    if saved["deduplicated"]:
+        logging.info("같은 내용의 파일이 이미 있어 재사용: %s (%s)", saved["path"], file.filename)
+    return saved
@@ -1,26 +1,40 @@
 import subprocess
 import tempfile
-from transformers import pipeline
-import torch
-import librosa
 import logging
 import os
+from .model_registry import registry
+
+ASR_MODEL_NAME = "o0dimplz0o/Fine-Tuned-Whisper-Large-v2-Zeroth-STT-KO"
+
+
+def _load_asr_pipeline():
+    """Whisper pipeline 로드 (torch/transformers import도 여기서 수행)"""
+    import torch
+    from transformers import pipeline
+
+    device = 0 if torch.cuda.is_available() else -1
+    return pipeline(
+        "automatic-speech-recognition",
+        model=ASR_MODEL_NAME,
+        device=device,
+        chunk_length_s=30,
+        stride_length_s=5,
+        return_timestamps=False,
+        generate_kwargs={"language": "ko"}
+    )
+
+
+registry.register("whisper", _load_asr_pipeline)
+
 
 def transcribe(audio_path: str) -> str:
     try:
+        import librosa
+
         logging.info(f"[Transcribe] 시작: {audio_path}")
-        device = 0 if torch.cuda.is_available() else -1
-
-        # Whisper pipeline
-        asr = pipeline(
-            "automatic-speech-recognition",
-            model="o0dimplz0o/Fine-Tuned-Whisper-Large-v2-Zeroth-STT-KO",
-            device=device,
-            chunk_length_s=30,
-            stride_length_s=5,
-            return_timestamps=False,
-            generate_kwargs={"language": "ko"}
-        )
+
+        # Whisper pipeline (프로세스당 한 번만 로드)
+        asr = registry.get("whisper")
 
         # webm/mp3 → wav 변환
         with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp_wav:
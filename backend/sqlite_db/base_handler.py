@@ -1,5 +1,8 @@
 import sqlite3, json, logging, os, hashlib, datetime
+from contextlib import AbstractContextManager
 from typing import List, Dict, Any, Optional
+from .connection import connections
+from .migrations import LATEST_VERSION, apply_migrations
 
 
 class BaseHandler:
@@ -11,133 +14,184 @@ class BaseHandler:
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         else:
             self.db_path = db_path
+
+    def _conn(self) -> sqlite3.Connection:
+        """현재 스레드의 공유 연결 (읽기용, autocommit)"""
+        return connections.get(self.db_path)
+
+    def _transaction(self, immediate: bool = True) -> AbstractContextManager:
+        """쓰기 트랜잭션 블록 (정상 종료 시 COMMIT, 예외 시 ROLLBACK)"""
+        return connections.transaction(self.db_path, immediate)
     
     def _init_db(self):
         """SQLite 데이터베이스와 테이블 초기화"""
         try:
-            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
-            conn.execute("PRAGMA journal_mode=WAL;")
-            conn.execute("PRAGMA busy_timeout=30000;")
-            cursor = conn.cursor()
-            
-            # 시퀀스 테이블 생성
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Sequence (
-                name TEXT PRIMARY KEY,
-                value INTEGER NOT NULL DEFAULT 0
-            )
-            ''')
-            
-            # 초기 시퀀스 값 설정
-            cursor.execute('''
-            INSERT OR IGNORE INTO Sequence (name, value) VALUES ('content_id', 0)
-            ''')
-            
-            # Brain 테이블 생성
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Brain (
-                brain_id   INTEGER PRIMARY KEY AUTOINCREMENT,
-                brain_name TEXT    NOT NULL,
-                created_at TEXT
-            )
-            ''')
-            
-            # Memo 테이블 생성
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Memo (
-                memo_id INTEGER PRIMARY KEY,
-                memo_text TEXT,
-                memo_title TEXT,
-                memo_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-                is_source BOOLEAN DEFAULT 0,
-                type TEXT,          
-                brain_id INTEGER,
-                FOREIGN KEY (brain_id) REFERENCES Brain(brain_id)
-            )
-            ''')
+            with self._transaction() as conn:
+                self._create_tables(conn.cursor())
+                # 기존 DB의 컬럼 추가, 인덱스 등 버전별 스키마 변경 (sqlite_db/migrations.py)
+                apply_migrations(conn)
+            logging.info("SQLite 데이터베이스 초기화 완료: %s (스키마 v%d)", self.db_path, LATEST_VERSION)
+        except Exception as e:
+            logging.error("SQLite 데이터베이스 초기화 오류: %s", str(e))
 
-            # PDF 테이블 생성
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Pdf (
-                pdf_id INTEGER PRIMARY KEY,
-                pdf_title TEXT,
-                pdf_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-                pdf_path TEXT,
-                brain_id INTEGER,
-                type TEXT,
-                FOREIGN KEY (brain_id) REFERENCES Brain(brain_id)
-            )
-            ''')
+    def _create_tables(self, cursor: sqlite3.Cursor):
+        """테이블 생성 (_init_db의 트랜잭션 안에서 호출)"""
+        # 시퀀스 테이블 생성
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS Sequence (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        )
+        ''')
+        
+        # 초기 시퀀스 값 설정
+        cursor.execute('''
+        INSERT OR IGNORE INTO Sequence (name, value) VALUES ('content_id', 0)
+        ''')
+        
+        # Brain 테이블 생성
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS Brain (
+            brain_id   INTEGER PRIMARY KEY AUTOINCREMENT,
+            brain_name TEXT    NOT NULL,
+            created_at TEXT
+        )
+        ''')
+        
+        # Memo 테이블 생성
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS Memo (
+            memo_id INTEGER PRIMARY KEY,
+            memo_text TEXT,
+            memo_title TEXT,
+            memo_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+            is_source BOOLEAN DEFAULT 0,
+            type TEXT,          
+            brain_id INTEGER,
+            FOREIGN KEY (brain_id) REFERENCES Brain(brain_id)
+        )
+        ''')
 
-            # TextFile 테이블 생성
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS TextFile (
-                txt_id INTEGER PRIMARY KEY,
-                txt_title TEXT,
-                txt_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-                txt_path TEXT,
-                brain_id INTEGER,
-                type TEXT,
-                FOREIGN KEY (brain_id) REFERENCES Brain(brain_id)
-            )
-            ''')
+        # PDF 테이블 생성
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS Pdf (
+            pdf_id INTEGER PRIMARY KEY,
+            pdf_title TEXT,
+            pdf_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+            pdf_path TEXT,
+            brain_id INTEGER,
+            type TEXT,
+            FOREIGN KEY (brain_id) REFERENCES Brain(brain_id)
+        )
+        ''')
 
-            # MDFile 테이블 생성
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS MDFile (
-                md_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                md_title TEXT NOT NULL,
-                md_path TEXT NOT NULL,
-                md_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-                type TEXT,
-                brain_id INTEGER,
-                FOREIGN KEY (brain_id) REFERENCES Brain(brain_id)
-            )
-            ''')
+        # TextFile 테이블 생성
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS TextFile (
+            txt_id INTEGER PRIMARY KEY,
+            txt_title TEXT,
+            txt_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+            txt_path TEXT,
+            brain_id INTEGER,
+            type TEXT,
+            FOREIGN KEY (brain_id) REFERENCES Brain(brain_id)
+        )
+        ''')
 
-            # Chat 테이블 생성
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Chat (
-                chat_id INTEGER PRIMARY KEY,
-                is_ai BOOLEAN NOT NULL,
-                message TEXT,
-                brain_id INTEGER,
-                referenced_nodes TEXT,
-                FOREIGN KEY (brain_id) REFERENCES Brain(brain_id)
-            )
-            ''')
+        # MDFile 테이블 생성
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS MDFile (
+            md_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            md_title TEXT NOT NULL,
+            md_path TEXT NOT NULL,
+            md_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+            type TEXT,
+            brain_id INTEGER,
+            FOREIGN KEY (brain_id) REFERENCES Brain(brain_id)
+        )
+        ''')
 
-            conn.commit()
-            conn.close()
-            logging.info("SQLite 데이터베이스 초기화 완료: %s", self.db_path)
-        except Exception as e:
-            logging.error("SQLite 데이터베이스 초기화 오류: %s", str(e))
-        finally:
-            if conn:
-                conn.close()
+        # Chat 테이블 생성
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS Chat (
+            chat_id INTEGER PRIMARY KEY,
+            is_ai BOOLEAN NOT NULL,
+            message TEXT,
+            brain_id INTEGER,
+            referenced_nodes TEXT,
+            FOREIGN KEY (brain_id) REFERENCES Brain(brain_id)
+        )
+        ''')
+
+        # IngestJob 테이블 생성 (텍스트 → 그래프/임베딩 백그라운드 작업 큐)
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS IngestJob (
+            job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            brain_id TEXT NOT NULL,
+            source_id TEXT NOT NULL,
+            text TEXT NOT NULL,
+            source_path TEXT,
+            use_cache BOOLEAN NOT NULL DEFAULT 1,
+            source_kind TEXT,
+            status TEXT NOT NULL DEFAULT 'queued',
+            stage TEXT,
+            progress TEXT,
+            result TEXT,
+            error TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            cancel_requested BOOLEAN NOT NULL DEFAULT 0,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        ''')
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_ingestjob_status ON IngestJob(status, job_id)
+        ''')
+
+        # ChunkCheckpoint 테이블 생성 (청크별 추출 결과 체크포인트)
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ChunkCheckpoint (
+            source_id TEXT NOT NULL,
+            chunk_hash TEXT NOT NULL,
+            model TEXT NOT NULL,
+            prompt_version TEXT NOT NULL,
+            chunk_index INTEGER,
+            status TEXT NOT NULL,
+            nodes TEXT,
+            edges TEXT,
+            error TEXT,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (source_id, chunk_hash, model, prompt_version)
+        )
+        ''')
+
+        # SourceChunkPage 테이블 생성 (서버에서 추출한 PDF의 청크 → 페이지/문자 오프셋 매핑)
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS SourceChunkPage (
+            source_id TEXT NOT NULL,
+            chunk_index INTEGER NOT NULL,
+            chunk_hash TEXT NOT NULL,
+            char_start INTEGER NOT NULL,
+            char_end INTEGER NOT NULL,
+            page_start INTEGER NOT NULL,
+            page_end INTEGER NOT NULL,
+            PRIMARY KEY (source_id, chunk_index)
+        )
+        ''')
     
-    def _get_next_id(self) -> int:
-        """다음 ID 값을 가져옵니다."""
+    def _get_next_id(self, conn: sqlite3.Connection) -> int:
+        """
+        content_id 시퀀스에서 다음 ID를 발급합니다. (Memo/Pdf/TextFile/MDFile/Chat이 같은 시퀀스를 공유해 ID가 겹치지 않음)
+        INSERT와 같은 트랜잭션(conn) 안에서 UPDATE ... RETURNING 한 문장으로 증가시키므로
+        별도 커밋이 없고, INSERT가 롤백되면 발급한 ID도 함께 롤백됩니다.
+        """
+        if not conn.in_transaction:
+            raise RuntimeError("ID 생성 오류: _get_next_id는 쓰기 트랜잭션 안에서 호출해야 합니다.")
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # 트랜잭션 시작
-            cursor.execute("BEGIN TRANSACTION")
-            
-            # 현재 값 조회
-            cursor.execute("SELECT value FROM Sequence WHERE name = 'content_id'")
-            current_value = cursor.fetchone()[0]
-            
-            # 값 증가
-            new_value = current_value + 1
-            cursor.execute("UPDATE Sequence SET value = ? WHERE name = 'content_id'", (new_value,))
-            
-            # 트랜잭션 커밋
-            conn.commit()
-            conn.close()
-            
-            return new_value
+            row = conn.execute(
+                "UPDATE Sequence SET value = value + 1 WHERE name = 'content_id' RETURNING value"
+            ).fetchone()
+            return row[0]
         except Exception as e:
             logging.error("ID 생성 오류: %s", str(e))
-            raise RuntimeError(f"ID 생성 오류: {str(e)}") 
\ No newline at end of file
+            raise RuntimeError(f"ID 생성 오류: {str(e)}")
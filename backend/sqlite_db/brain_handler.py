@@ -11,19 +11,16 @@ class BrainHandler(BaseHandler):
             if created_at is None:
                 created_at = datetime.date.today().isoformat()   # '2025-05-07'
 
-            conn = sqlite3.connect(self.db_path)
-            cur  = conn.cursor()
-            cur.execute(
-                """INSERT INTO Brain
-                     (brain_name, created_at)
-                   VALUES (?, ?)""",
-                (
-                    brain_name,
-                    created_at
-                )
-            )
-            brain_id = cur.lastrowid
-            conn.commit(); conn.close()
+            with self._transaction() as conn:
+                brain_id = conn.execute(
+                    """INSERT INTO Brain
+                         (brain_name, created_at)
+                       VALUES (?, ?)""",
+                    (
+                        brain_name,
+                        created_at
+                    )
+                ).lastrowid
 
             return {
                 "brain_id":   brain_id,
@@ -35,71 +32,69 @@ class BrainHandler(BaseHandler):
             raise
     
     def delete_brain(self, brain_id: int) -> bool:
-        """브레인과 관련된 모든 데이터 삭제"""
+        """
+        브레인과 관련된 모든 데이터 삭제
+        업로드 파일은 내용 해시 이름으로 저장되어 여러 브레인이 같은 파일을 공유할 수 있으므로,
+        DB 행을 지운 뒤 더 이상 어떤 행도 참조하지 않는 파일만 삭제합니다.
+        """
         try:
-            # 1. PDF/텍스트 파일 실제 파일 삭제
             from .pdf_handler import PdfHandler
             from .textfile_handler import TextFileHandler
+            from .mdfile_handler import MDFileHandler
             pdf_handler = PdfHandler(self.db_path)
             textfile_handler = TextFileHandler(self.db_path)
-            pdfs = pdf_handler.get_pdfs_by_brain(brain_id)
-            txts = textfile_handler.get_textfiles_by_brain(brain_id)
-            for pdf in pdfs:
-                file_path = pdf.get('pdf_path')
-                if file_path and os.path.exists(file_path):
-                    try:
-                        os.remove(file_path)
-                        logging.info(f"✅ PDF 로컬 파일 삭제 완료: {file_path}")
-                    except Exception as e:
-                        logging.error(f"❌ PDF 파일 삭제 실패: {file_path}, {e}")
-            for txt in txts:
-                file_path = txt.get('txt_path')
-                if file_path and os.path.exists(file_path):
-                    try:
-                        os.remove(file_path)
-                        logging.info(f"✅ TXT 로컬 파일 삭제 완료: {file_path}")
-                    except Exception as e:
-                        logging.error(f"❌ TXT 파일 삭제 실패: {file_path}, {e}")
-
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # 트랜잭션 시작
-            cursor.execute("BEGIN TRANSACTION")
-            
+            mdfile_handler = MDFileHandler(self.db_path)
+            # (종류, 파일 경로 목록, 경로를 참조하는 행 수를 세는 함수)
+            files = [
+                ("PDF", {pdf.get('pdf_path') for pdf in pdf_handler.get_pdfs_by_brain(brain_id)}, pdf_handler.count_pdfs_by_path),
+                ("TXT", {txt.get('txt_path') for txt in textfile_handler.get_textfiles_by_brain(brain_id)}, textfile_handler.count_textfiles_by_path),
+                ("MD", {md.get('md_path') for md in mdfile_handler.get_mds_by_brain(brain_id)}, mdfile_handler.count_mdfiles_by_path),
+            ]
+
             try:
-                logging.info("🧹 Pdf 테이블에서 brain_id=%s 삭제 시도", brain_id)
-                cursor.execute("DELETE FROM Pdf WHERE brain_id = ?", (brain_id,))
-                
-                logging.info("🧹 TextFile 테이블에서 brain_id=%s 삭제 시도", brain_id)
-                cursor.execute("DELETE FROM TextFile WHERE brain_id = ?", (brain_id,))
-
-                logging.info("🧹 Memo 테이블에서 brain_id=%s 삭제 시도", brain_id)
-                cursor.execute("DELETE FROM Memo WHERE brain_id = ?", (brain_id,))
-                
-                logging.info("🧹 Chat 테이블에서 brain_id=%s 삭제 시도", brain_id)
-                cursor.execute("DELETE FROM Chat WHERE brain_id = ?", (brain_id,))
-                
-                logging.info("🧹 Brain 테이블에서 brain_id=%s 삭제 시도", brain_id)
-                cursor.execute("DELETE FROM Brain WHERE brain_id = ?", (brain_id,))
-                deleted = cursor.rowcount > 0
-                
-                conn.commit()
-                
-                if deleted:
-                    logging.info("✅ 브레인 및 관련 데이터 삭제 완료: brain_id=%s", brain_id)
-                else:
-                    logging.warning("⚠️ 브레인 삭제 실패: 존재하지 않는 brain_id=%s", brain_id)
-                
-                return deleted
-            
+                # 하나의 트랜잭션으로 삭제 (중간에 실패하면 전부 롤백)
+                with self._transaction() as conn:
+                    logging.info("🧹 Pdf 테이블에서 brain_id=%s 삭제 시도", brain_id)
+                    conn.execute("DELETE FROM Pdf WHERE brain_id = ?", (brain_id,))
+
+                    logging.info("🧹 TextFile 테이블에서 brain_id=%s 삭제 시도", brain_id)
+                    conn.execute("DELETE FROM TextFile WHERE brain_id = ?", (brain_id,))
+
+                    logging.info("🧹 MDFile 테이블에서 brain_id=%s 삭제 시도", brain_id)
+                    conn.execute("DELETE FROM MDFile WHERE brain_id = ?", (brain_id,))
+
+                    logging.info("🧹 Memo 테이블에서 brain_id=%s 삭제 시도", brain_id)
+                    conn.execute("DELETE FROM Memo WHERE brain_id = ?", (brain_id,))
+
+                    logging.info("🧹 Chat 테이블에서 brain_id=%s 삭제 시도", brain_id)
+                    conn.execute("DELETE FROM Chat WHERE brain_id = ?", (brain_id,))
+
+                    logging.info("🧹 Brain 테이블에서 brain_id=%s 삭제 시도", brain_id)
+                    deleted = conn.execute("DELETE FROM Brain WHERE brain_id = ?", (brain_id,)).rowcount > 0
             except Exception as e:
-                conn.rollback()
                 logging.error("❌ DELETE 중 오류 발생: %s", str(e))
                 raise e
-            
-            finally:
-                conn.close()
+
+            # 실제 파일 삭제 (다른 브레인의 행이 같은 파일을 참조하면 유지)
+            for kind, paths, count_by_path in files:
+                for file_path in paths:
+                    if not file_path:
+                        continue
+                    if count_by_path(file_path) > 0:
+                        logging.info(f"다른 브레인이 사용 중인 {kind} 파일이라 유지: {file_path}")
+                    elif os.path.exists(file_path):
+                        try:
+                            os.remove(file_path)
+                            logging.info(f"✅ {kind} 로컬 파일 삭제 완료: {file_path}")
+                        except Exception as e:
+                            logging.error(f"❌ {kind} 파일 삭제 실패: {file_path}, {e}")
+
+            if deleted:
+                logging.info("✅ 브레인 및 관련 데이터 삭제 완료: brain_id=%s", brain_id)
+            else:
+                logging.warning("⚠️ 브레인 삭제 실패: 존재하지 않는 brain_id=%s", brain_id)
+
+            return deleted
         
         except Exception as e:
             logging.error("❌ 브레인 삭제 오류: %s", str(e))
@@ -108,17 +103,11 @@ class BrainHandler(BaseHandler):
     def update_brain_name(self, brain_id: int, new_brain_name: str) -> bool:
         """브레인 이름 업데이트"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute(
-                "UPDATE Brain SET brain_name = ? WHERE brain_id = ?",
-                (new_brain_name, brain_id)
-            )
-            updated = cursor.rowcount > 0
-            
-            conn.commit()
-            conn.close()
+            with self._transaction() as conn:
+                updated = conn.execute(
+                    "UPDATE Brain SET brain_name = ? WHERE brain_id = ?",
+                    (new_brain_name, brain_id)
+                ).rowcount > 0
             
             if updated:
                 logging.info("브레인 이름 업데이트 완료: brain_id=%s, new_brain_name=%s", brain_id, new_brain_name)
@@ -130,17 +119,36 @@ class BrainHandler(BaseHandler):
             logging.error("브레인 이름 업데이트 오류: %s", str(e))
             raise RuntimeError(f"브레인 이름 업데이트 오류: {str(e)}")
     
+    def update_brain(self, brain_id: int, brain_name: str | None = None, created_at: str | None = None) -> bool:
+        """브레인의 이름/생성일 중 주어진 필드만 업데이트"""
+        fields = {"brain_name": brain_name, "created_at": created_at}
+        updates = {column: value for column, value in fields.items() if value is not None}
+        if not updates:
+            return False
+        try:
+            with self._transaction() as conn:
+                updated = conn.execute(
+                    f"UPDATE Brain SET {', '.join(f'{column} = ?' for column in updates)} WHERE brain_id = ?",
+                    (*updates.values(), brain_id)
+                ).rowcount > 0
+
+            if updated:
+                logging.info("브레인 업데이트 완료: brain_id=%s, fields=%s", brain_id, list(updates))
+            else:
+                logging.warning("브레인 업데이트 실패: 존재하지 않는 brain_id=%s", brain_id)
+
+            return updated
+        except Exception as e:
+            logging.error("브레인 업데이트 오류: %s", str(e))
+            raise RuntimeError(f"브레인 업데이트 오류: {str(e)}")
+
     def get_brain(self, brain_id: int) -> dict | None:
         try:
-            conn = sqlite3.connect(self.db_path)
-            cur  = conn.cursor()
-            cur.execute(
+            row = self._conn().execute(
                 """SELECT brain_id, brain_name, created_at
                    FROM Brain WHERE brain_id=?""",
                 (brain_id,)
-            )
-            row = cur.fetchone()
-            conn.close()
+            ).fetchone()
             if not row:
                 return None
             return {
@@ -155,13 +163,10 @@ class BrainHandler(BaseHandler):
     def get_all_brains(self) -> List[dict]:
         """시스템의 모든 브레인"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cur  = conn.cursor()
-            cur.execute(
+            rows = self._conn().execute(
                 """SELECT brain_id, brain_name, created_at
                      FROM Brain"""
-            )
-            rows = cur.fetchall(); conn.close()
+            ).fetchall()
             return [
                 {
                     "brain_id":   r[0],
@@ -7,22 +7,17 @@ class ChatHandler(BaseHandler):
     def save_chat(self, is_ai: bool, message: str, brain_id: int, referenced_nodes: List[str] = None) -> int:
         """채팅 메시지를 저장합니다."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # referenced_nodes를 텍스트 형식으로 변환
             referenced_nodes_text = ", ".join(referenced_nodes) if referenced_nodes else None
-            
-            # 새 ID 생성
-            chat_id = self._get_next_id()
-            
-            cursor.execute(
-                "INSERT INTO Chat (chat_id, is_ai, message, brain_id, referenced_nodes) VALUES (?, ?, ?, ?, ?)",
-                (chat_id, 1 if is_ai else 0, message, brain_id, referenced_nodes_text)
-            )
-            
-            conn.commit()
-            conn.close()
+
+            with self._transaction() as conn:
+                # 새 ID 생성
+                chat_id = self._get_next_id(conn)
+
+                conn.execute(
+                    "INSERT INTO Chat (chat_id, is_ai, message, brain_id, referenced_nodes) VALUES (?, ?, ?, ?, ?)",
+                    (chat_id, 1 if is_ai else 0, message, brain_id, referenced_nodes_text)
+                )
             
             logging.info("채팅 저장 완료: chat_id=%s, is_ai=%s, brain_id=%s", chat_id, is_ai, brain_id)
             return chat_id
@@ -41,12 +36,8 @@ class ChatHandler(BaseHandler):
             bool: 삭제 성공 여부
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM Chat WHERE chat_id = ?", (chat_id,))
-            deleted = cursor.rowcount > 0
-            conn.commit()
-            conn.close()
+            with self._transaction() as conn:
+                deleted = conn.execute("DELETE FROM Chat WHERE chat_id = ?", (chat_id,)).rowcount > 0
             
             if deleted:
                 logging.info("채팅 삭제 완료: chat_id=%s", chat_id)
@@ -63,12 +54,8 @@ class ChatHandler(BaseHandler):
         특정 brain_id에 해당하는 모든 채팅을 삭제합니다.
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM Chat WHERE brain_id = ?", (brain_id,))
-            deleted = cursor.rowcount > 0
-            conn.commit()
-            conn.close()
+            with self._transaction() as conn:
+                deleted = conn.execute("DELETE FROM Chat WHERE brain_id = ?", (brain_id,)).rowcount > 0
             if deleted:
                 logging.info("모든 채팅 삭제 완료: brain_id=%s", brain_id)
             else:
@@ -89,13 +76,7 @@ class ChatHandler(BaseHandler):
             str | None: 참고 노드 목록 문자열 (쉼표로 구분) 또는 None
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("SELECT referenced_nodes FROM Chat WHERE chat_id = ?", (chat_id,))
-            result = cursor.fetchone()
-            
-            conn.close()
+            result = self._conn().execute("SELECT referenced_nodes FROM Chat WHERE chat_id = ?", (chat_id,)).fetchone()
             
             return result[0] if result else None
         except Exception as e:
@@ -113,18 +94,12 @@ class ChatHandler(BaseHandler):
             List[Dict] | None: 채팅 목록 (각 채팅은 chat_id, is_ai, message, referenced_nodes 정보를 포함) 또는 None
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
+            rows = self._conn().execute("""
                 SELECT chat_id, is_ai, message, referenced_nodes 
                 FROM Chat 
                 WHERE brain_id = ? 
                 ORDER BY chat_id ASC
-            """, (brain_id,))
-            
-            rows = cursor.fetchall()
-            conn.close()
+            """, (brain_id,)).fetchall()
             
             if not rows:
                 return []
@@ -0,0 +1,249 @@
+import sqlite3, json, logging
+from typing import List, Dict, Optional
+from .base_handler import BaseHandler
+
+# 체크포인트 상태
+CHUNK_DONE = "done"
+CHUNK_FAILED = "failed"
+
+
+class ChunkCheckpointHandler(BaseHandler):
+    def get_chunk_checkpoints(self, source_id: str, chunk_hashes: List[str], model: str, prompt_version: str) -> Dict[str, Dict]:
+        """
+        추출이 끝난(done) 청크의 결과를 조회합니다.
+        Returns:
+            {chunk_hash: {"nodes": [...], "edges": [...]}}
+        """
+        if not chunk_hashes:
+            return {}
+        try:
+            conn = self._conn()
+            results = {}
+            unique = list(dict.fromkeys(chunk_hashes))
+            # SQLite 파라미터 개수 제한을 피하기 위해 나눠서 조회
+            for start in range(0, len(unique), 500):
+                part = unique[start:start + 500]
+                rows = conn.execute(
+                    f"""
+                    SELECT chunk_hash, nodes, edges FROM ChunkCheckpoint
+                    WHERE source_id = ? AND model = ? AND prompt_version = ? AND status = ?
+                    AND chunk_hash IN ({','.join('?' * len(part))})
+                    """,
+                    [str(source_id), model, prompt_version, CHUNK_DONE, *part]
+                ).fetchall()
+                for chunk_hash, nodes, edges in rows:
+                    results[chunk_hash] = {"nodes": json.loads(nodes or "[]"), "edges": json.loads(edges or "[]")}
+            return results
+        except Exception as e:
+            logging.error("청크 체크포인트 조회 오류: %s", str(e))
+            return {}
+
+    def save_chunk_checkpoint(
+        self,
+        source_id: str,
+        chunk_hash: str,
+        model: str,
+        prompt_version: str,
+        chunk_index: int,
+        nodes: Optional[List[Dict]] = None,
+        edges: Optional[List[Dict]] = None,
+        error: Optional[str] = None
+    ) -> bool:
+        """청크 하나의 추출 결과(성공) 또는 오류(실패)를 저장합니다."""
+        try:
+            with self._transaction() as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO ChunkCheckpoint
+                    (source_id, chunk_hash, model, prompt_version, chunk_index, status, nodes, edges, error, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    """,
+                    (
+                        str(source_id), chunk_hash, model, prompt_version, chunk_index,
+                        CHUNK_FAILED if error else CHUNK_DONE,
+                        None if error else json.dumps(nodes or [], ensure_ascii=False),
+                        None if error else json.dumps(edges or [], ensure_ascii=False),
+                        error
+                    )
+                )
+            return True
+        except Exception as e:
+            logging.error("청크 체크포인트 저장 오류: %s", str(e))
+            return False
+
+    def get_source_checkpoints(self, source_id: str) -> List[Dict]:
+        """소스의 모든 청크 체크포인트(상태, 추출 결과 포함)를 chunk_index 순서로 조회합니다."""
+        try:
+            rows = self._conn().execute(
+                """
+                SELECT chunk_hash, model, prompt_version, chunk_index, status, nodes, edges, error, updated_at
+                FROM ChunkCheckpoint WHERE source_id = ? ORDER BY chunk_index
+                """,
+                (str(source_id),)
+            ).fetchall()
+            checkpoints = []
+            for row in rows:
+                checkpoint = dict(row)
+                checkpoint["nodes"] = json.loads(row["nodes"] or "[]")
+                checkpoint["edges"] = json.loads(row["edges"] or "[]")
+                checkpoints.append(checkpoint)
+            return checkpoints
+        except Exception as e:
+            logging.error("소스 체크포인트 조회 오류: %s", str(e))
+            return []
+
+    def delete_chunk_checkpoints(self, source_id: str, chunk_hashes: Optional[List[str]] = None) -> int:
+        """소스의 체크포인트를 삭제합니다. chunk_hashes를 주면 해당 청크만 삭제합니다."""
+        try:
+            with self._transaction() as conn:
+                if chunk_hashes is None:
+                    deleted = conn.execute("DELETE FROM ChunkCheckpoint WHERE source_id = ?", (str(source_id),)).rowcount
+                else:
+                    deleted = 0
+                    for start in range(0, len(chunk_hashes), 500):
+                        part = chunk_hashes[start:start + 500]
+                        deleted += conn.execute(
+                            f"DELETE FROM ChunkCheckpoint WHERE source_id = ? AND chunk_hash IN ({','.join('?' * len(part))})",
+                            [str(source_id), *part]
+                        ).rowcount
+            return deleted
+        except Exception as e:
+            logging.error("청크 체크포인트 삭제 오류: %s", str(e))
+            return 0
+
+    def prune_chunk_checkpoints(self, source_id: str, keep_hashes: List[str], model: str, prompt_version: str) -> int:
+        """
+        소스의 체크포인트 중 현재 청크(keep_hashes + 같은 모델/프롬프트 버전)가 아닌 것을 모두 삭제합니다.
+        증분 재처리 후 '지난번에 저장된 청크 목록'을 현재 텍스트 기준으로 맞출 때 사용합니다.
+        """
+        try:
+            keep = set(keep_hashes)
+            with self._transaction() as conn:
+                rows = conn.execute(
+                    "SELECT chunk_hash, model, prompt_version FROM ChunkCheckpoint WHERE source_id = ?",
+                    (str(source_id),)
+                ).fetchall()
+                stale = [
+                    tuple(row) for row in rows
+                    if row[0] not in keep or row[1] != model or row[2] != prompt_version
+                ]
+                conn.executemany(
+                    "DELETE FROM ChunkCheckpoint WHERE source_id = ? AND chunk_hash = ? AND model = ? AND prompt_version = ?",
+                    [(str(source_id), *row) for row in stale]
+                )
+            return len(stale)
+        except Exception as e:
+            logging.error("청크 체크포인트 정리 오류: %s", str(e))
+            return 0
+
+    def get_applied_chunks(self, source_id: str) -> List[Dict]:
+        """
+        그래프/벡터 DB에 반영이 끝난 청크 목록을 저장된 순서(청크 순서)대로 조회합니다. (증분 재처리의 비교 기준)
+        Returns:
+            [{"chunk_hash", "model", "prompt_version", "nodes", "edges"}]
+        """
+        try:
+            rows = self._conn().execute(
+                "SELECT chunk_hash, model, prompt_version, nodes, edges FROM AppliedChunk WHERE source_id = ? ORDER BY rowid",
+                (str(source_id),)
+            ).fetchall()
+            return [
+                {
+                    "chunk_hash": row["chunk_hash"],
+                    "model": row["model"],
+                    "prompt_version": row["prompt_version"],
+                    "nodes": json.loads(row["nodes"] or "[]"),
+                    "edges": json.loads(row["edges"] or "[]")
+                }
+                for row in rows
+            ]
+        except Exception as e:
+            logging.error("반영된 청크 조회 오류: %s", str(e))
+            return []
+
+    def save_applied_chunks(
+        self,
+        source_id: str,
+        applied: Dict[str, Dict],
+        keep_hashes: List[str],
+        model: str,
+        prompt_version: str
+    ) -> bool:
+        """
+        Neo4j/Qdrant 쓰기가 끝난 뒤 호출해, 소스의 반영된 청크 기록을 applied로 통째로 교체합니다.
+        같은 트랜잭션에서 현재 청크(keep_hashes)가 아닌 체크포인트도 정리합니다.
+        Args:
+            applied: {chunk_hash: {"nodes": [...], "edges": [...]}} 청크 순서대로
+                     (병합 시 먼저 나온 노드가 대표 이름이 되므로 조회할 때 같은 순서를 유지)
+        """
+        try:
+            with self._transaction() as conn:
+                conn.execute("DELETE FROM AppliedChunk WHERE source_id = ?", (str(source_id),))
+                conn.executemany(
+                    """
+                    INSERT INTO AppliedChunk (source_id, chunk_hash, model, prompt_version, nodes, edges)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (
+                            str(source_id), chunk_hash, model, prompt_version,
+                            json.dumps(result["nodes"], ensure_ascii=False),
+                            json.dumps(result["edges"], ensure_ascii=False)
+                        )
+                        for chunk_hash, result in applied.items()
+                    ]
+                )
+                self.prune_chunk_checkpoints(source_id, keep_hashes, model, prompt_version)
+            return True
+        except Exception as e:
+            logging.error("반영된 청크 저장 오류: %s", str(e))
+            return False
+
+    def delete_applied_chunks(self, source_id: str) -> int:
+        """소스의 반영된 청크 기록을 삭제합니다. (그래프/벡터 DB에서 소스를 지웠을 때)"""
+        try:
+            with self._transaction() as conn:
+                return conn.execute("DELETE FROM AppliedChunk WHERE source_id = ?", (str(source_id),)).rowcount
+        except Exception as e:
+            logging.error("반영된 청크 삭제 오류: %s", str(e))
+            return 0
+
+    def save_chunk_pages(self, source_id: str, page_map: List[Dict]) -> bool:
+        """
+        소스의 청크 → 페이지 매핑을 통째로 교체 저장합니다.
+        page_map 항목: {"chunk_index", "chunk_hash", "char_start", "char_end", "page_start", "page_end"}
+        """
+        try:
+            with self._transaction() as conn:
+                conn.execute("DELETE FROM SourceChunkPage WHERE source_id = ?", (str(source_id),))
+                conn.executemany(
+                    """
+                    INSERT INTO SourceChunkPage
+                    (source_id, chunk_index, chunk_hash, char_start, char_end, page_start, page_end)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (str(source_id), row["chunk_index"], row["chunk_hash"], row["char_start"],
+                         row["char_end"], row["page_start"], row["page_end"])
+                        for row in page_map
+                    ]
+                )
+            return True
+        except Exception as e:
+            logging.error("청크 페이지 매핑 저장 오류: %s", str(e))
+            return False
+
+    def get_chunk_pages(self, source_id: str) -> List[Dict]:
+        """소스의 청크 → 페이지 매핑을 chunk_index 순서로 조회합니다."""
+        try:
+            rows = self._conn().execute(
+                """
+                SELECT chunk_index, chunk_hash, char_start, char_end, page_start, page_end
+                FROM SourceChunkPage WHERE source_id = ? ORDER BY chunk_index
+                """,
+                (str(source_id),)
+            ).fetchall()
+            return [dict(row) for row in rows]
+        except Exception as e:
+            logging.error("청크 페이지 매핑 조회 오류: %s", str(e))
+            return []
@@ -0,0 +1,115 @@
+import os, sqlite3, logging, threading, weakref
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+# ================================================
+# SQLite 연결 관리자
+# ================================================
+# 핸들러 메서드마다 sqlite3.connect()를 새로 열고 닫지 않고, 스레드마다 DB 파일별 연결 하나를
+# 만들어 재사용합니다. 연결을 열 때 PRAGMA를 한 번에 적용하므로 모든 연결이 같은 설정(WAL,
+# busy_timeout 등)을 갖고, sqlite3의 문장 캐시(cached_statements) 덕분에 같은 SQL은 다시
+# 준비(prepare)하지 않습니다.
+#
+# 연결은 autocommit 모드(isolation_level=None)로 열립니다.
+# - 읽기: get()으로 받은 연결에서 바로 실행
+# - 쓰기: transaction() 블록 안에서 실행 (BEGIN IMMEDIATE → 정상 종료 시 COMMIT, 예외 시 ROLLBACK)
+
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "30000"))
+# 페이지 캐시 크기 (KiB, PRAGMA cache_size에는 음수로 전달)
+SQLITE_CACHE_SIZE_KIB = int(os.getenv("SQLITE_CACHE_SIZE_KIB", "16384"))
+# 메모리 매핑 I/O 크기 (바이트, 0이면 사용 안 함)
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+# 연결마다 준비된 문장을 캐시할 개수
+SQLITE_STATEMENT_CACHE = int(os.getenv("SQLITE_STATEMENT_CACHE", "256"))
+
+
+class ConnectionManager:
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # 종료 시 정리를 위해 (스레드 약한 참조, 연결) 목록을 유지
+        self._registry: List[Tuple[weakref.ref, sqlite3.Connection]] = []
+        # close_all()마다 증가. 스레드 로컬 연결의 세대가 다르면 이미 닫힌 연결이므로 새로 엶
+        self._generation = 0
+
+    def _open(self, db_path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            db_path,
+            timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=SQLITE_STATEMENT_CACHE
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        conn.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KIB}")
+        conn.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+
+        with self._lock:
+            self._prune_dead_threads()
+            self._registry.append((weakref.ref(threading.current_thread()), conn))
+        logging.debug("SQLite 연결 생성: %s (%s)", db_path, threading.current_thread().name)
+        return conn
+
+    def _prune_dead_threads(self) -> None:
+        """종료된 스레드가 쓰던 연결을 닫습니다. (_lock을 잡은 상태에서 호출)"""
+        alive = []
+        for thread_ref, conn in self._registry:
+            thread = thread_ref()
+            if thread is not None and thread.is_alive():
+                alive.append((thread_ref, conn))
+            else:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+        self._registry = alive
+
+    def get(self, db_path: str) -> sqlite3.Connection:
+        """현재 스레드의 db_path 연결을 반환합니다. 없으면 새로 엽니다."""
+        conns: Dict[str, sqlite3.Connection] = getattr(self._local, "conns", None)
+        if conns is None or self._local.generation != self._generation:
+            conns = self._local.conns = {}
+            self._local.generation = self._generation
+        conn = conns.get(db_path)
+        if conn is None:
+            conn = conns[db_path] = self._open(db_path)
+        return conn
+
+    @contextmanager
+    def transaction(self, db_path: str, immediate: bool = True) -> Iterator[sqlite3.Connection]:
+        """
+        쓰기 트랜잭션 블록. 이미 트랜잭션 안이면 바깥 트랜잭션에 합류합니다.
+        immediate=True면 시작할 때 쓰기 잠금을 잡아, 읽기 → 쓰기 승격 중 "database is locked"가 나지 않게 합니다.
+        """
+        conn = self.get(db_path)
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+
+    def close_all(self) -> None:
+        """모든 스레드의 연결을 닫습니다. (서버 종료 시 호출)"""
+        with self._lock:
+            registry, self._registry = self._registry, []
+            self._generation += 1
+        for _, conn in registry:
+            try:
+                conn.close()
+            except Exception as e:
+                logging.warning("SQLite 연결 종료 실패: %s", str(e))
+        logging.info("SQLite 연결 %d개 종료", len(registry))
+
+
+# 전역 연결 관리자
+connections = ConnectionManager()
@@ -0,0 +1,208 @@
+import sqlite3, json, logging
+from typing import List, Dict, Optional
+from .base_handler import BaseHandler
+
+# 작업 상태
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATUSES = (JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED)
+
+
+def _row_to_job(row: sqlite3.Row, include_text: bool = False) -> Dict:
+    job = {
+        "job_id": row["job_id"],
+        "brain_id": row["brain_id"],
+        "source_id": row["source_id"],
+        "source_path": row["source_path"],
+        "use_cache": bool(row["use_cache"]),
+        "source_kind": row["source_kind"],
+        "status": row["status"],
+        "stage": row["stage"],
+        "progress": json.loads(row["progress"]) if row["progress"] else {},
+        "result": json.loads(row["result"]) if row["result"] else None,
+        "error": row["error"],
+        "attempts": row["attempts"],
+        "cancel_requested": bool(row["cancel_requested"]),
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"]
+    }
+    if include_text:
+        job["text"] = row["text"]
+    return job
+
+
+class JobHandler(BaseHandler):
+    def create_job(
+        self, brain_id: str, source_id: str, text: str, source_path: Optional[str] = None, use_cache: bool = True,
+        source_kind: Optional[str] = None
+    ) -> Dict:
+        """
+        텍스트 처리 작업을 큐에 등록합니다.
+        source_path를 주면 text 대신 워커가 해당 파일(PDF)에서 텍스트를 직접 추출합니다.
+        use_cache가 False면 워커가 LLM 응답 캐시와 청크 체크포인트를 사용하지 않고 다시 추출합니다.
+        source_kind(memo/pdf/text/md)는 원문을 저장할 SourceText 종류입니다. (없으면 종류를 추정)
+        """
+        try:
+            with self._transaction() as conn:
+                row = conn.execute(
+                    """
+                    INSERT INTO IngestJob (brain_id, source_id, text, source_path, use_cache, source_kind, status)
+                    VALUES (?, ?, ?, ?, ?, ?, ?) RETURNING *
+                    """,
+                    (str(brain_id), str(source_id), text, source_path, int(use_cache), source_kind, JOB_QUEUED)
+                ).fetchone()
+            job_id = row["job_id"]
+
+            logging.info("작업 등록 완료: job_id=%s, brain_id=%s, source_id=%s", job_id, brain_id, source_id)
+            return _row_to_job(row)
+        except Exception as e:
+            logging.error("작업 등록 오류: %s", str(e))
+            raise RuntimeError(f"작업 등록 오류: {str(e)}")
+
+    def get_job(self, job_id: int, include_text: bool = False) -> Optional[Dict]:
+        """작업 상태를 조회합니다."""
+        try:
+            row = self._conn().execute("SELECT * FROM IngestJob WHERE job_id = ?", (job_id,)).fetchone()
+            return _row_to_job(row, include_text) if row else None
+        except Exception as e:
+            logging.error("작업 조회 오류: %s", str(e))
+            return None
+
+    def get_jobs(self, brain_id: Optional[str] = None, status: Optional[str] = None, limit: int = 100) -> List[Dict]:
+        """작업 목록을 최신순으로 조회합니다."""
+        try:
+            query = "SELECT * FROM IngestJob WHERE 1 = 1"
+            params = []
+            if brain_id is not None:
+                query += " AND brain_id = ?"
+                params.append(str(brain_id))
+            if status is not None:
+                query += " AND status = ?"
+                params.append(status)
+            query += " ORDER BY job_id DESC LIMIT ?"
+            params.append(limit)
+
+            rows = self._conn().execute(query, params).fetchall()
+            return [_row_to_job(row) for row in rows]
+        except Exception as e:
+            logging.error("작업 목록 조회 오류: %s", str(e))
+            return []
+
+    def claim_next_job(self) -> Optional[Dict]:
+        """
+        가장 오래된 queued 작업 하나를 running으로 바꾸고 반환합니다.
+        UPDATE ... RETURNING 한 문장으로 처리하므로 여러 워커가 같은 작업을 가져가지 않습니다.
+        """
+        try:
+            with self._transaction() as conn:
+                row = conn.execute(
+                    """
+                    UPDATE IngestJob
+                    SET status = ?, attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+                    WHERE job_id = (
+                        SELECT job_id FROM IngestJob
+                        WHERE status = ? ORDER BY job_id LIMIT 1
+                    )
+                    RETURNING *
+                    """,
+                    (JOB_RUNNING, JOB_QUEUED)
+                ).fetchone()
+            return _row_to_job(row, include_text=True) if row else None
+        except Exception as e:
+            logging.error("작업 가져오기 오류: %s", str(e))
+            return None
+
+    def update_job_progress(self, job_id: int, stage: str, progress: Dict) -> bool:
+        """현재 단계와 단계별 진행 상황을 저장합니다."""
+        try:
+            with self._transaction() as conn:
+                updated = conn.execute(
+                    "UPDATE IngestJob SET stage = ?, progress = ?, updated_at = CURRENT_TIMESTAMP WHERE job_id = ?",
+                    (stage, json.dumps(progress, ensure_ascii=False), job_id)
+                ).rowcount > 0
+            return updated
+        except Exception as e:
+            logging.error("작업 진행 상황 저장 오류: %s", str(e))
+            return False
+
+    def finish_job(self, job_id: int, status: str, result: Optional[Dict] = None, error: Optional[str] = None) -> bool:
+        """작업을 succeeded / failed / cancelled 상태로 마칩니다."""
+        try:
+            with self._transaction() as conn:
+                updated = conn.execute(
+                    "UPDATE IngestJob SET status = ?, result = ?, error = ?, updated_at = CURRENT_TIMESTAMP WHERE job_id = ?",
+                    (status, json.dumps(result, ensure_ascii=False) if result is not None else None, error, job_id)
+                ).rowcount > 0
+            logging.info("작업 종료: job_id=%s, status=%s", job_id, status)
+            return updated
+        except Exception as e:
+            logging.error("작업 종료 처리 오류: %s", str(e))
+            return False
+
+    def cancel_job(self, job_id: int) -> Optional[Dict]:
+        """
+        작업 취소를 요청합니다.
+        - queued 작업은 바로 cancelled로 바뀝니다.
+        - running 작업은 cancel_requested만 표시하고, 워커가 다음 단계 전에 중단합니다.
+        - 이미 끝난 작업은 그대로 둡니다.
+        """
+        try:
+            with self._transaction() as conn:
+                conn.execute(
+                    "UPDATE IngestJob SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE job_id = ? AND status = ?",
+                    (JOB_CANCELLED, job_id, JOB_QUEUED)
+                )
+                conn.execute(
+                    "UPDATE IngestJob SET cancel_requested = 1, updated_at = CURRENT_TIMESTAMP WHERE job_id = ? AND status = ?",
+                    (job_id, JOB_RUNNING)
+                )
+            return self.get_job(job_id)
+        except Exception as e:
+            logging.error("작업 취소 오류: %s", str(e))
+            raise RuntimeError(f"작업 취소 오류: {str(e)}")
+
+    def is_cancel_requested(self, job_id: int) -> bool:
+        try:
+            row = self._conn().execute("SELECT cancel_requested FROM IngestJob WHERE job_id = ?", (job_id,)).fetchone()
+            return bool(row and row[0])
+        except Exception as e:
+            logging.error("작업 취소 여부 조회 오류: %s", str(e))
+            return False
+
+    def requeue_running_jobs(self, max_attempts: Optional[int] = None) -> int:
+        """
+        서버가 작업 도중 종료되어 running으로 남은 작업을 다시 queued로 돌립니다. (시작 시 호출)
+        취소 요청된 작업은 cancelled로 마무리합니다.
+        max_attempts를 주면 이미 그 횟수만큼 시도한 작업은 다시 넣지 않고 failed로 마무리합니다.
+        (처리 중 서버를 죽이는 작업이 재시작마다 반복 실행되는 것을 막음)
+        """
+        try:
+            with self._transaction() as conn:
+                conn.execute(
+                    "UPDATE IngestJob SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE status = ? AND cancel_requested = 1",
+                    (JOB_CANCELLED, JOB_RUNNING)
+                )
+                exhausted = 0
+                if max_attempts is not None:
+                    exhausted = conn.execute(
+                        """
+                        UPDATE IngestJob SET status = ?, error = ?, updated_at = CURRENT_TIMESTAMP
+                        WHERE status = ? AND attempts >= ?
+                        """,
+                        (JOB_FAILED, f"최대 시도 횟수({max_attempts}회) 초과", JOB_RUNNING, max_attempts)
+                    ).rowcount
+                requeued = conn.execute(
+                    "UPDATE IngestJob SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE status = ?",
+                    (JOB_QUEUED, JOB_RUNNING)
+                ).rowcount
+            if exhausted:
+                logging.warning("최대 시도 횟수를 넘긴 작업 %d개를 failed로 처리했습니다.", exhausted)
+            if requeued:
+                logging.info("중단된 작업 %d개를 다시 큐에 넣었습니다.", requeued)
+            return requeued
+        except Exception as e:
+            logging.error("작업 재등록 오류: %s", str(e))
+            return 0
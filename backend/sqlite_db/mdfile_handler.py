@@ -6,17 +6,14 @@ class MDFileHandler(BaseHandler):
     def create_mdfile(self, md_title: str, md_path: str, type: Optional[str] = None, brain_id: Optional[int] = None) -> dict:
         """새 MD 파일 생성"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT INTO MDFile (md_title, md_path, type, brain_id) VALUES (?, ?, ?, ?)",
-                (md_title, md_path, type, brain_id)
-            )
-            md_id = cursor.lastrowid
-            cursor.execute("SELECT md_date FROM MDFile WHERE md_id = ?", (md_id,))
-            md_date = cursor.fetchone()[0]
-            conn.commit()
-            conn.close()
+            with self._transaction() as conn:
+                # 다른 소스와 ID가 겹치지 않도록 content_id 시퀀스에서 발급
+                md_id = self._get_next_id(conn)
+                conn.execute(
+                    "INSERT INTO MDFile (md_id, md_title, md_path, type, brain_id) VALUES (?, ?, ?, ?, ?)",
+                    (md_id, md_title, md_path, type, brain_id)
+                )
+                md_date = conn.execute("SELECT md_date FROM MDFile WHERE md_id = ?", (md_id,)).fetchone()[0]
             logging.info("MD 파일 생성 완료: md_id=%s, md_title=%s, brain_id=%s", md_id, md_title, brain_id)
             return {
                 "md_id": md_id,
@@ -33,12 +30,8 @@ class MDFileHandler(BaseHandler):
     def delete_mdfile(self, md_id: int) -> bool:
         """MD 파일 삭제"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM MDFile WHERE md_id = ?", (md_id,))
-            deleted = cursor.rowcount > 0
-            conn.commit()
-            conn.close()
+            with self._transaction() as conn:
+                deleted = conn.execute("DELETE FROM MDFile WHERE md_id = ?", (md_id,)).rowcount > 0
             if deleted:
                 logging.info("MD 파일 삭제 완료: md_id=%s", md_id)
             else:
@@ -59,8 +52,6 @@ class MDFileHandler(BaseHandler):
                 brain_handler = BrainHandler(self.db_path)
                 if not brain_handler.get_brain(brain_id):
                     raise ValueError(f"존재하지 않는 Brain ID: {brain_id}")
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
             update_fields = []
             params = []
             if md_title is not None:
@@ -78,15 +69,12 @@ class MDFileHandler(BaseHandler):
                 update_fields.append("brain_id = ?")
                 params.append(brain_id)
             if not update_fields:
-                conn.close()
                 return False
             update_fields.append("md_date = CURRENT_TIMESTAMP")
             query = f"UPDATE MDFile SET {', '.join(update_fields)} WHERE md_id = ?"
             params.append(md_id)
-            cursor.execute(query, params)
-            updated = cursor.rowcount > 0
-            conn.commit()
-            conn.close()
+            with self._transaction() as conn:
+                updated = conn.execute(query, params).rowcount > 0
             if updated:
                 logging.info("MD 파일 업데이트 완료: md_id=%s", md_id)
             else:
@@ -99,14 +87,10 @@ class MDFileHandler(BaseHandler):
     def get_mdfile(self, md_id: int) -> Optional[dict]:
         """MD 파일 정보 조회"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute(
+            mdfile = self._conn().execute(
                 "SELECT md_id, md_title, md_path, md_date, type, brain_id FROM MDFile WHERE md_id = ?",
                 (md_id,)
-            )
-            mdfile = cursor.fetchone()
-            conn.close()
+            ).fetchone()
             if mdfile:
                 return {
                     "md_id": mdfile[0],
@@ -124,8 +108,6 @@ class MDFileHandler(BaseHandler):
 
     def get_mds_by_brain(self, brain_id: int) -> List[dict]:
         """특정 brain_id에 해당하는 모든 MD 파일 목록 반환"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
         sql = """
             SELECT
                 md_id,
@@ -138,8 +120,14 @@ class MDFileHandler(BaseHandler):
             WHERE brain_id = ?
             ORDER BY md_date DESC
         """
-        cursor.execute(sql, (brain_id,))
-        rows = cursor.fetchall()
-        cols = [c[0] for c in cursor.description]
-        conn.close()
-        return [dict(zip(cols, row)) for row in rows] 
\ No newline at end of file
+        rows = self._conn().execute(sql, (brain_id,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def count_mdfiles_by_path(self, md_path: str) -> int:
+        """같은 파일 경로를 사용하는 MD 파일 수 (내용이 같은 업로드는 파일 하나를 공유)"""
+        try:
+            return self._conn().execute("SELECT COUNT(*) FROM MDFile WHERE md_path = ?", (md_path,)).fetchone()[0]
+        except Exception as e:
+            logging.error("MD 파일 경로 조회 오류: %s", str(e))
+            # 확인할 수 없으면 파일을 지우지 않도록 사용 중으로 간주
+            return 1
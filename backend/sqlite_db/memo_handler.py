@@ -15,23 +15,17 @@ class MemoHandler(BaseHandler):
                 if not brain:
                     raise ValueError(f"존재하지 않는 브레인 ID: {brain_id}")
                     
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # 새 ID 생성
-            memo_id = self._get_next_id()
-            
-            cursor.execute(
-                "INSERT INTO Memo (memo_id, memo_title, memo_text, is_source, type, brain_id) VALUES (?, ?, ?, ?, ?, ?)",
-                (memo_id, memo_title, memo_text, 1 if is_source else 0, type, brain_id)
-            )
-            
-            # 현재 날짜 가져오기 (자동 생성됨)
-            cursor.execute("SELECT memo_date FROM Memo WHERE memo_id = ?", (memo_id,))
-            memo_date = cursor.fetchone()[0]
-            
-            conn.commit()
-            conn.close()
+            with self._transaction() as conn:
+                # 새 ID 생성
+                memo_id = self._get_next_id(conn)
+
+                conn.execute(
+                    "INSERT INTO Memo (memo_id, memo_title, memo_text, is_source, type, brain_id) VALUES (?, ?, ?, ?, ?, ?)",
+                    (memo_id, memo_title, memo_text, 1 if is_source else 0, type, brain_id)
+                )
+
+                # 현재 날짜 가져오기 (자동 생성됨)
+                memo_date = conn.execute("SELECT memo_date FROM Memo WHERE memo_id = ?", (memo_id,)).fetchone()[0]
             
             logging.info("메모 생성 완료: memo_id=%s, memo_title=%s, brain_id=%s", 
                         memo_id, memo_title, brain_id)
@@ -54,14 +48,8 @@ class MemoHandler(BaseHandler):
     def delete_memo(self, memo_id: int) -> bool:
         """메모 삭제"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("DELETE FROM Memo WHERE memo_id = ?", (memo_id,))
-            deleted = cursor.rowcount > 0
-            
-            conn.commit()
-            conn.close()
+            with self._transaction() as conn:
+                deleted = conn.execute("DELETE FROM Memo WHERE memo_id = ?", (memo_id,)).rowcount > 0
             
             if deleted:
                 logging.info("메모 삭제 완료: memo_id=%s", memo_id)
@@ -88,9 +76,6 @@ class MemoHandler(BaseHandler):
                 if not brain:
                     raise ValueError(f"존재하지 않는 Brain ID: {brain_id}")
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # 업데이트할 필드 지정
             update_fields = []
             params = []
@@ -129,11 +114,8 @@ class MemoHandler(BaseHandler):
             query = f"UPDATE Memo SET {', '.join(update_fields)} WHERE memo_id = ?"
             params.append(memo_id)
             
-            cursor.execute(query, params)
-            updated = cursor.rowcount > 0
-            
-            conn.commit()
-            conn.close()
+            with self._transaction() as conn:
+                updated = conn.execute(query, params).rowcount > 0
             
             if updated:
                 logging.info("메모 업데이트 완료: memo_id=%s", memo_id)
@@ -151,15 +133,10 @@ class MemoHandler(BaseHandler):
     def get_memo(self, memo_id: int) -> Optional[dict]:
         """메모 정보 조회"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute(
+            memo = self._conn().execute(
                 "SELECT memo_id, memo_title, memo_text, memo_date, is_source, type, brain_id FROM Memo WHERE memo_id = ?", 
                 (memo_id,)
-            )
-            memo = cursor.fetchone()
-            conn.close()
+            ).fetchone()
             
             if memo:
                 return {
@@ -182,9 +159,6 @@ class MemoHandler(BaseHandler):
         특정 brain_id에 해당하는 메모들을 반환합니다.
         - is_source가 지정되면 해당 조건도 함께 적용됩니다.
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
         # 기본 조건: brain_id
         where_clauses = ["brain_id = ?"]
         params = [brain_id]
@@ -209,11 +183,8 @@ class MemoHandler(BaseHandler):
             WHERE {where_clause}
             ORDER BY memo_date DESC
         """
-        cursor.execute(sql, params)
-        rows = cursor.fetchall()
-        cols = [c[0] for c in cursor.description]
-        conn.close()
-        return [dict(zip(cols, r)) for r in rows]
+        rows = self._conn().execute(sql, params).fetchall()
+        return [dict(r) for r in rows]
 
 
 # Import at the end to avoid circular imports
@@ -0,0 +1,118 @@
+import sqlite3, logging
+from typing import Callable, List, Tuple, Union
+from .search_index import create_search_index, key_source_text_by_kind
+
+# ================================================
+# SQLite 스키마 마이그레이션
+# ================================================
+# _init_db가 기본 테이블을 만든 뒤 같은 트랜잭션에서 apply_migrations()를 호출합니다.
+# 적용된 버전은 PRAGMA user_version에 저장되므로, 이미 적용된 마이그레이션은 다시 실행되지 않습니다.
+# 새 마이그레이션은 MIGRATIONS 끝에 다음 버전 번호로 추가합니다. (기존 항목은 수정하지 않음)
+
+
+def _add_ingestjob_source_path(conn: sqlite3.Connection) -> None:
+    # 이전 버전 DB에는 source_path 컬럼(서버에서 텍스트를 추출할 파일 경로)이 없음
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(IngestJob)")}
+    if "source_path" not in columns:
+        conn.execute("ALTER TABLE IngestJob ADD COLUMN source_path TEXT")
+
+
+def _add_ingestjob_use_cache(conn: sqlite3.Connection) -> None:
+    # 작업별로 LLM 응답 캐시/청크 체크포인트 사용 여부를 저장 (기존 작업은 캐시 사용)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(IngestJob)")}
+    if "use_cache" not in columns:
+        conn.execute("ALTER TABLE IngestJob ADD COLUMN use_cache BOOLEAN NOT NULL DEFAULT 1")
+
+
+def _add_ingestjob_source_kind(conn: sqlite3.Connection) -> None:
+    # 원문을 저장할 SourceText 종류(memo/pdf/text/md)를 작업에 함께 저장 (기존 작업은 NULL → 종류 추정)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(IngestJob)")}
+    if "source_kind" not in columns:
+        conn.execute("ALTER TABLE IngestJob ADD COLUMN source_kind TEXT")
+
+
+def _create_search_index(conn: sqlite3.Connection) -> None:
+    tokenizer = create_search_index(conn)
+    logging.info("전문 검색 인덱스 생성 (토크나이저: %s)", tokenizer)
+
+
+def _key_source_text_by_kind(conn: sqlite3.Connection) -> None:
+    # MD 파일도 content_id 시퀀스로 ID를 발급하므로, 기존 md_id와 겹치지 않도록 시퀀스를 앞당김
+    conn.execute(
+        "UPDATE Sequence SET value = MAX(value, (SELECT COALESCE(MAX(md_id), 0) FROM MDFile)) WHERE name = 'content_id'"
+    )
+    key_source_text_by_kind(conn)
+
+
+# (버전, 설명, SQL 목록 또는 conn을 받는 함수)
+MIGRATIONS: List[Tuple[int, str, Union[List[str], Callable[[sqlite3.Connection], None]]]] = [
+    (1, "IngestJob.source_path 컬럼 추가", _add_ingestjob_source_path),
+    (2, "브레인별 목록 조회용 인덱스", [
+        # get_memos_by_brain: brain_id 조건 + memo_date 정렬 (is_source 조건이 있으면 두 번째 인덱스)
+        "CREATE INDEX IF NOT EXISTS idx_memo_brain_date ON Memo(brain_id, memo_date)",
+        "CREATE INDEX IF NOT EXISTS idx_memo_brain_source_date ON Memo(brain_id, is_source, memo_date)",
+        # get_pdfs_by_brain / get_textfiles_by_brain / get_mds_by_brain
+        "CREATE INDEX IF NOT EXISTS idx_pdf_brain_date ON Pdf(brain_id, pdf_date)",
+        "CREATE INDEX IF NOT EXISTS idx_textfile_brain_date ON TextFile(brain_id, txt_date)",
+        "CREATE INDEX IF NOT EXISTS idx_mdfile_brain_date ON MDFile(brain_id, md_date)",
+        # get_chat_list: brain_id 조건 + chat_id 정렬
+        "CREATE INDEX IF NOT EXISTS idx_chat_brain_id ON Chat(brain_id, chat_id)",
+        # count_pdfs_by_path: 같은 업로드 파일을 공유하는 PDF 확인
+        "CREATE INDEX IF NOT EXISTS idx_pdf_path ON Pdf(pdf_path)",
+        # get_jobs(brain_id=...): 최신순 작업 목록
+        "CREATE INDEX IF NOT EXISTS idx_ingestjob_brain ON IngestJob(brain_id, job_id)",
+    ]),
+    (3, "FTS5 전문 검색 인덱스(SearchIndex)와 소스 추출 텍스트(SourceText)", _create_search_index),
+    (4, "업로드 파일 경로 인덱스", [
+        # count_textfiles_by_path / count_mdfiles_by_path: 브레인 삭제 시 공유 파일 확인
+        "CREATE INDEX IF NOT EXISTS idx_textfile_path ON TextFile(txt_path)",
+        "CREATE INDEX IF NOT EXISTS idx_mdfile_path ON MDFile(md_path)",
+    ]),
+    (5, "SourceText를 (kind, source_id) 키로 변경, MD 파일 ID를 content_id 시퀀스로 발급", _key_source_text_by_kind),
+    (6, "그래프/벡터 DB에 반영이 끝난 청크 기록(AppliedChunk)", [
+        # 증분 재처리의 비교 기준: 추출 체크포인트와 달리 Neo4j/Qdrant 쓰기가 성공한 뒤에만 갱신
+        """
+        CREATE TABLE IF NOT EXISTS AppliedChunk (
+            source_id TEXT NOT NULL,
+            chunk_hash TEXT NOT NULL,
+            model TEXT NOT NULL,
+            prompt_version TEXT NOT NULL,
+            nodes TEXT,
+            edges TEXT,
+            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (source_id, chunk_hash)
+        )
+        """,
+    ]),
+    (7, "IngestJob.use_cache 컬럼 추가", _add_ingestjob_use_cache),
+    (8, "IngestJob.source_kind 컬럼 추가", _add_ingestjob_source_kind),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations(conn: sqlite3.Connection) -> int:
+    """
+    아직 적용되지 않은 마이그레이션을 버전 순서대로 적용합니다. (호출한 쪽의 트랜잭션 안에서 실행)
+    Returns:
+        적용한 마이그레이션 수
+    """
+    current = get_schema_version(conn)
+    applied = 0
+    for version, description, migration in MIGRATIONS:
+        if version <= current:
+            continue
+        if callable(migration):
+            migration(conn)
+        else:
+            for statement in migration:
+                conn.execute(statement)
+        # PRAGMA는 파라미터 바인딩을 지원하지 않음 (version은 코드에 정의된 정수)
+        conn.execute(f"PRAGMA user_version = {int(version)}")
+        applied += 1
+        logging.info("🛠️ SQLite 마이그레이션 v%d 적용: %s", version, description)
+    return applied
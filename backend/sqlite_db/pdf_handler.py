@@ -13,23 +13,17 @@ class PdfHandler(BaseHandler):
                 brain = brain_handler.get_brain(brain_id)
                 if not brain:
                     raise ValueError(f"존재하지 않는 Brain ID: {brain_id}")
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # 새 ID 생성
-            pdf_id = self._get_next_id()
-            
-            cursor.execute(
-                "INSERT INTO Pdf (pdf_id, pdf_title, pdf_path, type, brain_id) VALUES (?, ?, ?, ?, ?)",
-                (pdf_id, pdf_title, pdf_path, type, brain_id)
-            )
-            
-            # 현재 날짜 가져오기 (자동 생성됨)
-            cursor.execute("SELECT pdf_date FROM Pdf WHERE pdf_id = ?", (pdf_id,))
-            pdf_date = cursor.fetchone()[0]
-            
-            conn.commit()
-            conn.close()
+            with self._transaction() as conn:
+                # 새 ID 생성
+                pdf_id = self._get_next_id(conn)
+
+                conn.execute(
+                    "INSERT INTO Pdf (pdf_id, pdf_title, pdf_path, type, brain_id) VALUES (?, ?, ?, ?, ?)",
+                    (pdf_id, pdf_title, pdf_path, type, brain_id)
+                )
+
+                # 현재 날짜 가져오기 (자동 생성됨)
+                pdf_date = conn.execute("SELECT pdf_date FROM Pdf WHERE pdf_id = ?", (pdf_id,)).fetchone()[0]
             
             logging.info(
                 "PDF 생성 완료: pdf_id=%s, pdf_title=%s, brain_id=%s",
@@ -54,14 +48,8 @@ class PdfHandler(BaseHandler):
     def delete_pdf(self, pdf_id: int) -> bool:
         """PDF 삭제"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("DELETE FROM Pdf WHERE pdf_id = ?", (pdf_id,))
-            deleted = cursor.rowcount > 0
-            
-            conn.commit()
-            conn.close()
+            with self._transaction() as conn:
+                deleted = conn.execute("DELETE FROM Pdf WHERE pdf_id = ?", (pdf_id,)).rowcount > 0
             
             if deleted:
                 logging.info("PDF 삭제 완료: pdf_id=%s", pdf_id)
@@ -78,9 +66,6 @@ class PdfHandler(BaseHandler):
         주어진 brain_id에 해당하는 모든 PDF 파일 목록을 반환합니다.
         폴더 여부와 관계없이 brain_id로만 필터링합니다.
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
         # 폴더 조건 없이 brain_id만 기준으로 조회
         sql = """
             SELECT
@@ -94,12 +79,8 @@ class PdfHandler(BaseHandler):
             WHERE brain_id = ?
             ORDER BY pdf_date DESC
         """
-        cursor.execute(sql, (brain_id,))
-        rows = cursor.fetchall()
-        cols = [c[0] for c in cursor.description]
-
-        conn.close()
-        return [dict(zip(cols, row)) for row in rows]
+        rows = self._conn().execute(sql, (brain_id,)).fetchall()
+        return [dict(row) for row in rows]
 
     def update_pdf(self, pdf_id: int, pdf_title: str = None, pdf_path: str = None, type: Optional[str] = None, brain_id: Optional[int] = None) -> bool:
         """PDF 정보 업데이트"""
@@ -115,9 +96,6 @@ class PdfHandler(BaseHandler):
                 if not brain_handler.get_brain(brain_id):
                     raise ValueError(f"존재하지 않는 Brain ID: {brain_id}")
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # 업데이트할 필드 지정
             update_fields = []
             params = []
@@ -144,7 +122,6 @@ class PdfHandler(BaseHandler):
                 update_fields.append("brain_id = ?")
                 params.append(brain_id)
             if not update_fields:
-                conn.close()
                 return False
 
             # 날짜 자동 업데이트
@@ -154,11 +131,8 @@ class PdfHandler(BaseHandler):
             query = f"UPDATE Pdf SET {', '.join(update_fields)} WHERE pdf_id = ?"
             params.append(pdf_id)
             
-            cursor.execute(query, params)
-            updated = cursor.rowcount > 0
-            
-            conn.commit()
-            conn.close()
+            with self._transaction() as conn:
+                updated = conn.execute(query, params).rowcount > 0
             
             if updated:
                 logging.info("PDF 업데이트 완료: pdf_id=%s", pdf_id)
@@ -176,16 +150,10 @@ class PdfHandler(BaseHandler):
     def get_pdf(self, pdf_id: int) -> Optional[dict]:
         """PDF 정보 조회"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute(
+            pdf = self._conn().execute(
                 "SELECT pdf_id, pdf_title, pdf_path, pdf_date, type, brain_id FROM Pdf WHERE pdf_id = ?", 
                 (pdf_id,)
-            )
-            pdf = cursor.fetchone()
-            
-            conn.close()
+            ).fetchone()
             
             if pdf:
                 return {
@@ -202,6 +170,15 @@ class PdfHandler(BaseHandler):
             logging.error("PDF 조회 오류: %s", str(e))
             return None
 
+    def count_pdfs_by_path(self, pdf_path: str) -> int:
+        """같은 파일 경로를 사용하는 PDF 수 (내용이 같은 업로드는 파일 하나를 공유)"""
+        try:
+            return self._conn().execute("SELECT COUNT(*) FROM Pdf WHERE pdf_path = ?", (pdf_path,)).fetchone()[0]
+        except Exception as e:
+            logging.error("PDF 경로 조회 오류: %s", str(e))
+            # 확인할 수 없으면 파일을 지우지 않도록 사용 중으로 간주
+            return 1
+
 
 # Import at the end to avoid circular imports
 from .brain_handler import BrainHandler 
\ No newline at end of file
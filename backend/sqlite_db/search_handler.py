@@ -1,45 +1,140 @@
 import sqlite3, logging
-from typing import List, Dict
+from typing import List, Dict, Optional, Sequence
 from .base_handler import BaseHandler
+from .search_index import FILE_KINDS, SEARCH_KINDS, build_match_expression, like_pattern, make_snippet, split_query
 
 
 class SearchHandler(BaseHandler):
-    def search_titles_by_query(self, query: str, brain_id: int) -> List[Dict]:
-        """query를 포함하는 제목 검색
-        
+    def save_source_text(self, source_id: str, brain_id: int, content: str, kind: Optional[str] = None) -> bool:
+        """
+        소스 파일(pdf/txt/md)에서 추출한 텍스트를 저장합니다.
+        트리거가 SearchIndex의 해당 파일 행 본문을 갱신하므로 저장 즉시 본문 검색에 반영됩니다.
+        kind(pdf/text/md)를 모르면 같은 ID와 브레인의 파일이 있는 종류를 찾아 저장합니다.
+        (메모처럼 파일이 아닌 소스는 본문이 이미 색인되어 있으므로 저장하지 않음)
+        """
+        if kind in SEARCH_KINDS and kind not in FILE_KINDS:
+            return False
+        try:
+            with self._transaction() as conn:
+                kinds = [kind] if kind else self._find_file_kinds(conn, source_id, brain_id)
+                for file_kind in kinds:
+                    if file_kind not in FILE_KINDS:
+                        raise ValueError(f"알 수 없는 파일 종류: {file_kind}")
+                    conn.execute(
+                        """
+                        INSERT INTO SourceText (kind, source_id, brain_id, content) VALUES (?, ?, ?, ?)
+                        ON CONFLICT(kind, source_id) DO UPDATE SET
+                            brain_id = excluded.brain_id, content = excluded.content, updated_at = CURRENT_TIMESTAMP
+                        """,
+                        (file_kind, str(source_id), int(brain_id), content)
+                    )
+            return bool(kinds)
+        except Exception as e:
+            logging.error("소스 텍스트 저장 오류: %s", str(e))
+            return False
+
+    def _find_file_kinds(self, conn: sqlite3.Connection, source_id: str, brain_id: int) -> List[str]:
+        """source_id와 brain_id가 같은 파일이 있는 종류 목록 (새 ID는 종류 간에 겹치지 않아 보통 하나)"""
+        try:
+            file_id = int(source_id)
+        except (TypeError, ValueError):
+            return []
+        query = " UNION ALL ".join(
+            f"SELECT '{kind}' FROM {SEARCH_KINDS[kind][1]} WHERE {SEARCH_KINDS[kind][2]} = ? AND brain_id IS ?"
+            for kind in FILE_KINDS
+        )
+        rows = conn.execute(query, [file_id, int(brain_id)] * len(FILE_KINDS)).fetchall()
+        return [row[0] for row in rows]
+
+    def search_documents(
+        self,
+        query: str,
+        brain_id: int,
+        types: Optional[Sequence[str]] = None,
+        limit: int = 20,
+        columns: Optional[List[str]] = None
+    ) -> List[Dict]:
+        """
+        메모, 소스 파일(제목 + 추출 텍스트), 채팅을 전문 검색합니다.
+
         Args:
-            query (str): 검색할 키워드
+            query (str): 검색어 (공백으로 나눈 단어를 모두 포함하는 문서를 찾음,
+                         1~2글자 단어만 있으면 색인 없이 LIKE로 훑으므로 느림)
             brain_id (int): 브레인 ID
-            
+            types: 검색할 종류 (memo/pdf/text/md/chat), None이면 전체
+            limit (int): 최대 결과 수
+            columns: 검색할 컬럼 (title/body), None이면 전체
+
         Returns:
-            List[Dict]: 검색 결과 목록. 각 항목은 type(pdf/text), id, title을 포함
+            List[Dict]: BM25 점수가 높은 순서의 결과. 각 항목은 type, id, title, snippet, score를 포함
         """
+        long_terms, short_terms = split_query(query)
+        if not long_terms and not short_terms:
+            return []
+        search_columns = columns or ["title", "body"]
+
+        where = ["brain_id = ?"]
+        params: list = [int(brain_id)]
+        if types:
+            where.append(f"kind IN ({','.join('?' * len(types))})")
+            params.extend(types)
+        # trigram 색인으로 찾을 수 없는 짧은 단어는 LIKE로 거름
+        for term in short_terms:
+            where.append("(" + " OR ".join(f"{column} LIKE ? ESCAPE '\\'" for column in search_columns) + ")")
+            params.extend([like_pattern(term)] * len(search_columns))
+
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # PDF와 TextFile 테이블에서 제목 검색
-            cursor.execute("""
-                SELECT 'pdf' as type, pdf_id as id, pdf_title as title
-                FROM Pdf 
-                WHERE brain_id = ? AND pdf_title LIKE ?
-                UNION ALL
-                SELECT 'text' as type, txt_id as id, txt_title as title
-                FROM TextFile 
-                WHERE brain_id = ? AND txt_title LIKE ?
-            """, (brain_id, f'%{query}%', brain_id, f'%{query}%'))
-            
-            results = cursor.fetchall()
-            conn.close()
-            
+            if long_terms:
+                rows = self._conn().execute(
+                    f"""
+                    SELECT kind, ref_id, title,
+                           snippet(SearchIndex, -1, '<b>', '</b>', '…', 16) AS snippet,
+                           bm25(SearchIndex, 5.0, 1.0) AS rank
+                    FROM SearchIndex
+                    WHERE SearchIndex MATCH ? AND {' AND '.join(where)}
+                    ORDER BY rank
+                    LIMIT ?
+                    """,
+                    [build_match_expression(long_terms, columns), *params, limit]
+                ).fetchall()
+                return [
+                    {"type": row["kind"], "id": row["ref_id"], "title": row["title"],
+                     "snippet": row["snippet"] or "", "score": -row["rank"]}
+                    for row in rows
+                ]
+
+            # 짧은 단어만 있는 경우 BM25 순위 없이 최신순
+            rows = self._conn().execute(
+                f"""
+                SELECT kind, ref_id, title, body FROM SearchIndex
+                WHERE {' AND '.join(where)}
+                ORDER BY ref_id DESC
+                LIMIT ?
+                """,
+                [*params, limit]
+            ).fetchall()
             return [
-                {
-                    "type": row[0],
-                    "id": row[1],
-                    "title": row[2]
-                }
-                for row in results
+                {"type": row["kind"], "id": row["ref_id"], "title": row["title"],
+                 "snippet": make_snippet(row["body"] or row["title"], short_terms), "score": 0.0}
+                for row in rows
             ]
         except Exception as e:
-            logging.error("제목 검색 오류: %s", str(e))
-            return [] 
\ No newline at end of file
+            logging.error("전문 검색 오류: %s", str(e))
+            return []
+
+    def search_titles_by_query(self, query: str, brain_id: int) -> List[Dict]:
+        """query를 포함하는 제목 검색
+
+        Args:
+            query (str): 검색할 키워드
+            brain_id (int): 브레인 ID
+
+        Returns:
+            List[Dict]: 검색 결과 목록. 각 항목은 type(pdf/text), id, title을 포함
+        """
+        results = self.search_documents(query, brain_id, types=("pdf", "text"), limit=100, columns=["title"])
+        return [{"type": r["type"], "id": r["id"], "title": r["title"]} for r in results]
+
+    def search_mds(self, brain_id: int, query: str) -> List[Dict]:
+        """브레인 내 MD 파일을 제목과 본문으로 검색합니다."""
+        return self.search_documents(query, brain_id, types=("md",))
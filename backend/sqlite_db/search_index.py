@@ -0,0 +1,221 @@
+import sqlite3, logging, re
+from typing import Dict, List, Optional, Tuple
+
+# ================================================
+# FTS5 전문 검색 인덱스 (SearchIndex)
+# ================================================
+# 메모 본문, 소스 파일(pdf/txt/md)의 제목과 추출 텍스트, 채팅 메시지를 하나의 FTS5 테이블에 색인합니다.
+# 원본 테이블의 트리거가 INSERT/UPDATE/DELETE를 그대로 반영하므로 애플리케이션 코드에서 따로 갱신하지 않습니다.
+# - 행 rowid = 종류 코드 * KIND_STRIDE + 원본 ID → 갱신/삭제가 rowid 조회 한 번으로 끝남
+# - 파일의 본문은 SourceText(소스별 추출 텍스트) 테이블에서 가져옴
+#   (이전 DB의 MD 파일 ID는 다른 종류와 겹칠 수 있으므로 SourceText는 (kind, source_id)로 구분)
+# - trigram 토크나이저: 띄어쓰기/조사와 관계없이 한국어 부분 문자열 검색 가능 (3글자 이상)
+#   trigram을 지원하지 않는 SQLite에서는 unicode61로 대체
+# - 1~2글자 검색어는 trigram 색인으로 찾을 수 없어 LIKE로 거름 (split_query 참고)
+
+KIND_STRIDE = 1 << 40
+
+# 검색 결과 type → (종류 코드, 원본 테이블, ID 컬럼, 제목 컬럼, 본문 컬럼)
+# 본문 컬럼이 None인 파일 종류는 SourceText.content를 본문으로 사용
+SEARCH_KINDS: Dict[str, Tuple[int, str, str, Optional[str], Optional[str]]] = {
+    "memo": (1, "Memo", "memo_id", "memo_title", "memo_text"),
+    "pdf": (2, "Pdf", "pdf_id", "pdf_title", None),
+    "text": (3, "TextFile", "txt_id", "txt_title", None),
+    "md": (4, "MDFile", "md_id", "md_title", None),
+    "chat": (5, "Chat", "chat_id", None, "message"),
+}
+FILE_KINDS = ("pdf", "text", "md")
+
+# trigram 토크나이저는 3글자 미만 검색어를 MATCH로 찾을 수 없음
+TRIGRAM_MIN_CHARS = 3
+
+
+def _row_values(kind: str, ref: str) -> str:
+    """트리거/백필용 INSERT 값 목록 (ref는 'new', 'old' 또는 테이블 별칭)"""
+    code, _, id_col, title_col, body_col = SEARCH_KINDS[kind]
+    title = f"{ref}.{title_col}" if title_col else "NULL"
+    if body_col:
+        body = f"{ref}.{body_col}"
+    else:
+        body = (
+            f"(SELECT content FROM SourceText WHERE kind = '{kind}' AND source_id = CAST({ref}.{id_col} AS TEXT) "
+            f"AND brain_id IS {ref}.brain_id)"
+        )
+    return f"{code} * {KIND_STRIDE} + {ref}.{id_col}, {title}, {body}, '{kind}', {ref}.{id_col}, {ref}.brain_id"
+
+
+def _create_source_text(conn: sqlite3.Connection, table: str = "SourceText") -> None:
+    conn.execute(f'''
+    CREATE TABLE IF NOT EXISTS {table} (
+        kind TEXT NOT NULL,
+        source_id TEXT NOT NULL,
+        brain_id INTEGER,
+        content TEXT NOT NULL,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (kind, source_id)
+    )
+    ''')
+
+
+def _trigger_names() -> List[str]:
+    names = [
+        f"trg_{table.lower()}_search_{event}"
+        for _, table, _, _, _ in SEARCH_KINDS.values()
+        for event in ("insert", "update", "delete")
+    ]
+    return names + ["trg_sourcetext_search_insert", "trg_sourcetext_search_update"]
+
+
+def _create_triggers(conn: sqlite3.Connection) -> None:
+    columns = "rowid, title, body, kind, ref_id, brain_id"
+    for kind, (code, table, id_col, _, _) in SEARCH_KINDS.items():
+        name = table.lower()
+        conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_{name}_search_insert AFTER INSERT ON {table} BEGIN
+            INSERT INTO SearchIndex ({columns}) VALUES ({_row_values(kind, "new")});
+        END
+        ''')
+        conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_{name}_search_update AFTER UPDATE ON {table} BEGIN
+            DELETE FROM SearchIndex WHERE rowid = {code} * {KIND_STRIDE} + old.{id_col};
+            INSERT INTO SearchIndex ({columns}) VALUES ({_row_values(kind, "new")});
+        END
+        ''')
+        # 소스가 삭제되면 색인 행과 같은 종류의 추출 텍스트도 함께 삭제
+        cleanup = "" if kind == "chat" else (
+            f"DELETE FROM SourceText WHERE kind = '{kind}' AND source_id = CAST(old.{id_col} AS TEXT) "
+            f"AND brain_id IS old.brain_id;"
+        )
+        conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_{name}_search_delete AFTER DELETE ON {table} BEGIN
+            DELETE FROM SearchIndex WHERE rowid = {code} * {KIND_STRIDE} + old.{id_col};
+            {cleanup}
+        END
+        ''')
+
+    # 추출 텍스트가 저장/변경되면 같은 종류, 같은 브레인의 파일 색인 행 본문만 갱신 (rowid 조회 한 번)
+    code = "CASE new.kind " + " ".join(f"WHEN '{kind}' THEN {SEARCH_KINDS[kind][0]}" for kind in FILE_KINDS) + " END"
+    for event in ("INSERT", "UPDATE"):
+        conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_sourcetext_search_{event.lower()} AFTER {event} ON SourceText BEGIN
+            UPDATE SearchIndex SET body = new.content
+            WHERE rowid = ({code}) * {KIND_STRIDE} + CAST(new.source_id AS INTEGER) AND brain_id IS new.brain_id;
+        END
+        ''')
+
+
+def _reindex_kind(conn: sqlite3.Connection, kind: str) -> None:
+    code, table, _, _, _ = SEARCH_KINDS[kind]
+    conn.execute(
+        "DELETE FROM SearchIndex WHERE rowid >= ? AND rowid < ?",
+        (code * KIND_STRIDE, (code + 1) * KIND_STRIDE)
+    )
+    conn.execute(
+        f"INSERT INTO SearchIndex (rowid, title, body, kind, ref_id, brain_id) "
+        f"SELECT {_row_values(kind, 't')} FROM {table} AS t"
+    )
+
+
+def create_search_index(conn: sqlite3.Connection) -> str:
+    """
+    SourceText, SearchIndex와 동기화 트리거를 만들고 기존 데이터를 색인합니다. (마이그레이션에서 호출)
+    Returns:
+        사용한 토크나이저 이름
+    """
+    _create_source_text(conn)
+
+    tokenizer = "trigram"
+    try:
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS SearchIndex "
+            "USING fts5(title, body, kind UNINDEXED, ref_id UNINDEXED, brain_id UNINDEXED, tokenize='trigram')"
+        )
+    except sqlite3.OperationalError as e:
+        logging.warning("trigram 토크나이저를 사용할 수 없어 unicode61로 대체합니다: %s", str(e))
+        tokenizer = "unicode61"
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS SearchIndex "
+            "USING fts5(title, body, kind UNINDEXED, ref_id UNINDEXED, brain_id UNINDEXED, "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+
+    _create_triggers(conn)
+    for kind in SEARCH_KINDS:
+        _reindex_kind(conn, kind)
+    return tokenizer
+
+
+def key_source_text_by_kind(conn: sqlite3.Connection) -> None:
+    """
+    source_id만 키로 쓰던 이전 SourceText를 (kind, source_id) 키로 바꾸고 트리거를 다시 만듭니다. (마이그레이션에서 호출)
+    이전 행은 같은 ID와 브레인의 파일이 있는 종류마다 복사합니다.
+    """
+    for name in _trigger_names():
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(SourceText)")}
+    if "kind" not in columns:
+        _create_source_text(conn, "SourceText_new")
+        for kind in FILE_KINDS:
+            _, table, id_col, _, _ = SEARCH_KINDS[kind]
+            conn.execute(f"""
+                INSERT INTO SourceText_new (kind, source_id, brain_id, content, updated_at)
+                SELECT '{kind}', s.source_id, s.brain_id, s.content, s.updated_at FROM SourceText AS s
+                WHERE EXISTS (
+                    SELECT 1 FROM {table} AS t
+                    WHERE CAST(t.{id_col} AS TEXT) = s.source_id AND t.brain_id IS s.brain_id
+                )
+            """)
+        conn.execute("DROP TABLE SourceText")
+        conn.execute("ALTER TABLE SourceText_new RENAME TO SourceText")
+
+    _create_triggers(conn)
+    for kind in FILE_KINDS:
+        _reindex_kind(conn, kind)
+
+
+def _quote(term: str) -> str:
+    """FTS5 문자열 리터럴로 감싸기 (연산자/특수문자를 그대로 검색)"""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def split_query(query: str) -> Tuple[List[str], List[str]]:
+    """
+    검색어를 공백 기준으로 나눠 (MATCH로 찾을 단어, LIKE로 찾을 짧은 단어)로 분류합니다.
+    trigram은 3글자 미만 단어를 색인으로 찾을 수 없어 LIKE 조건으로 거릅니다.
+    - 3글자 이상 단어가 함께 있으면 MATCH로 찾은 행에만 LIKE를 적용하므로 빠름
+    - 짧은 단어만 있으면(예: "회의") 색인을 쓰지 못하고 SearchIndex 전체를 훑음
+      (브레인 5만 건 기준 약 200ms, brain_id도 UNINDEXED 컬럼이라 범위를 줄이지 못함)
+    """
+    terms = [term for term in re.split(r"\s+", query.strip()) if term]
+    long_terms = [term for term in terms if len(term) >= TRIGRAM_MIN_CHARS]
+    short_terms = [term for term in terms if len(term) < TRIGRAM_MIN_CHARS]
+    return long_terms, short_terms
+
+
+def build_match_expression(terms: List[str], columns: Optional[List[str]] = None) -> str:
+    """단어들을 AND로 묶은 MATCH 식. columns를 주면 해당 컬럼에서만 검색"""
+    expression = " AND ".join(_quote(term) for term in terms)
+    if columns:
+        return "{" + " ".join(columns) + "} : (" + expression + ")"
+    return expression
+
+
+def like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def make_snippet(text: Optional[str], terms: List[str], width: int = 48) -> str:
+    """MATCH를 쓰지 않은 결과(LIKE 검색)의 스니펫: 첫 번째로 찾은 단어 주변을 잘라 <b>로 표시"""
+    if not text:
+        return ""
+    lowered = text.lower()
+    positions = [(lowered.find(term.lower()), term) for term in terms]
+    positions = [(pos, term) for pos, term in positions if pos >= 0]
+    if not positions:
+        return text[:width * 2] + ("…" if len(text) > width * 2 else "")
+    pos, term = min(positions)
+    start, end = max(0, pos - width), min(len(text), pos + len(term) + width)
+    snippet = text[start:pos] + "<b>" + text[pos:pos + len(term)] + "</b>" + text[pos + len(term):end]
+    return ("…" if start > 0 else "") + snippet + ("…" if end < len(text) else "")
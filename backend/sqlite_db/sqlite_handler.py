@@ -10,9 +10,11 @@ from .textfile_handler import TextFileHandler
 from .mdfile_handler import MDFileHandler
 from .chat_handler import ChatHandler
 from .search_handler import SearchHandler
+from .job_handler import JobHandler
+from .checkpoint_handler import ChunkCheckpointHandler
 
 
-class SQLiteHandler(BrainHandler, MemoHandler, PdfHandler, TextFileHandler, MDFileHandler, ChatHandler, SearchHandler):
+class SQLiteHandler(BrainHandler, MemoHandler, PdfHandler, TextFileHandler, MDFileHandler, ChatHandler, SearchHandler, JobHandler, ChunkCheckpointHandler):
     """
     통합 SQLite 핸들러 클래스
     모든 도메인별 핸들러의 기능을 상속받아 제공합니다.
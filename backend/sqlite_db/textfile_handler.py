@@ -7,21 +7,15 @@ class TextFileHandler(BaseHandler):
     def create_textfile(self, txt_title: str, txt_path: str, type: Optional[str] = None, brain_id: Optional[int] = None) -> dict:
         """새 텍스트 파일 생성"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            txt_id = self._get_next_id()
-            
-            cursor.execute(
-                "INSERT INTO TextFile (txt_id, txt_title, txt_path, type, brain_id) VALUES (?, ?, ?, ?, ?)",
-                (txt_id, txt_title, txt_path, type, brain_id)
-            )
-            
-            cursor.execute("SELECT txt_date FROM TextFile WHERE txt_id = ?", (txt_id,))
-            txt_date = cursor.fetchone()[0]
-            
-            conn.commit()
-            conn.close()
+            with self._transaction() as conn:
+                txt_id = self._get_next_id(conn)
+
+                conn.execute(
+                    "INSERT INTO TextFile (txt_id, txt_title, txt_path, type, brain_id) VALUES (?, ?, ?, ?, ?)",
+                    (txt_id, txt_title, txt_path, type, brain_id)
+                )
+
+                txt_date = conn.execute("SELECT txt_date FROM TextFile WHERE txt_id = ?", (txt_id,)).fetchone()[0]
             
             logging.info("텍스트 파일 생성 완료: txt_id=%s, txt_title=%s, brain_id=%s", 
                         txt_id, txt_title, brain_id)
@@ -43,14 +37,8 @@ class TextFileHandler(BaseHandler):
     def delete_textfile(self, txt_id: int) -> bool:
         """텍스트 파일 삭제"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("DELETE FROM TextFile WHERE txt_id = ?", (txt_id,))
-            deleted = cursor.rowcount > 0
-            
-            conn.commit()
-            conn.close()
+            with self._transaction() as conn:
+                deleted = conn.execute("DELETE FROM TextFile WHERE txt_id = ?", (txt_id,)).rowcount > 0
             
             if deleted:
                 logging.info("텍스트 파일 삭제 완료: txt_id=%s", txt_id)
@@ -76,9 +64,6 @@ class TextFileHandler(BaseHandler):
                 if not brain_handler.get_brain(brain_id):
                     raise ValueError(f"존재하지 않는 Brain ID: {brain_id}")
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             update_fields = []
             params = []
             
@@ -102,7 +87,6 @@ class TextFileHandler(BaseHandler):
                 params.append(brain_id)
 
             if not update_fields:
-                conn.close()
                 return False  # 변경할 내용 없음
             
             update_fields.append("txt_date = CURRENT_TIMESTAMP")
@@ -110,11 +94,8 @@ class TextFileHandler(BaseHandler):
             query = f"UPDATE TextFile SET {', '.join(update_fields)} WHERE txt_id = ?"
             params.append(txt_id)
             
-            cursor.execute(query, params)
-            updated = cursor.rowcount > 0
-            
-            conn.commit()
-            conn.close()
+            with self._transaction() as conn:
+                updated = conn.execute(query, params).rowcount > 0
             
             if updated:
                 logging.info("텍스트 파일 업데이트 완료: txt_id=%s", txt_id)
@@ -132,16 +113,10 @@ class TextFileHandler(BaseHandler):
     def get_textfile(self, txt_id: int) -> Optional[dict]:
         """텍스트 파일 정보 조회"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute(
+            textfile = self._conn().execute(
                 "SELECT txt_id, txt_title, txt_path, txt_date, type, brain_id FROM TextFile WHERE txt_id = ?", 
                 (txt_id,)
-            )
-            textfile = cursor.fetchone()
-            
-            conn.close()
+            ).fetchone()
             
             if textfile:
                 return {
@@ -163,9 +138,6 @@ class TextFileHandler(BaseHandler):
         주어진 brain_id에 해당하는 모든 텍스트 파일(txt) 목록을 반환합니다.
         폴더 여부와 관계없이 brain_id로만 필터링합니다.
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
         sql = """
             SELECT
                 txt_id,
@@ -178,12 +150,17 @@ class TextFileHandler(BaseHandler):
             WHERE brain_id = ?
             ORDER BY txt_date DESC
         """
-        cursor.execute(sql, (brain_id,))
-        rows = cursor.fetchall()
-        cols = [c[0] for c in cursor.description]
+        rows = self._conn().execute(sql, (brain_id,)).fetchall()
+        return [dict(row) for row in rows]
 
-        conn.close()
-        return [dict(zip(cols, row)) for row in rows]
+    def count_textfiles_by_path(self, txt_path: str) -> int:
+        """같은 파일 경로를 사용하는 텍스트 파일 수 (내용이 같은 업로드는 파일 하나를 공유)"""
+        try:
+            return self._conn().execute("SELECT COUNT(*) FROM TextFile WHERE txt_path = ?", (txt_path,)).fetchone()[0]
+        except Exception as e:
+            logging.error("텍스트 파일 경로 조회 오류: %s", str(e))
+            # 확인할 수 없으면 파일을 지우지 않도록 사용 중으로 간주
+            return 1
 
 
 # Import at the end to avoid circular imports
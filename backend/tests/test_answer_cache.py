@@ -0,0 +1,29 @@
+from services.answer_cache import SemanticAnswerCache
+from services.graph_version import bump_graph_version, get_graph_version
+
+
+def test_near_duplicate_hit_and_version_invalidation():
+    cache = SemanticAnswerCache(threshold=0.95)
+    brain_id = "answer-cache-test"
+    version = get_graph_version(brain_id)
+    cache.store(brain_id, version, "딥러닝이 뭐야?", [1.0, 0.0, 0.1], "답변", ["딥러닝"])
+
+    # 거의 같은 방향의 임베딩이면 hit, 다른 방향이면 miss
+    hit = cache.lookup(brain_id, [0.99, 0.01, 0.1])
+    assert hit["answer"] == "답변" and hit["referenced_nodes"] == ["딥러닝"]
+    assert cache.lookup(brain_id, [0.0, 1.0, 0.0]) is None
+    # 다른 브레인과는 공유하지 않음
+    assert cache.lookup("other-brain", [1.0, 0.0, 0.1]) is None
+
+    # 쓰기 경로가 버전을 올리면 이전 답변은 무효
+    bump_graph_version(brain_id)
+    assert cache.lookup(brain_id, [1.0, 0.0, 0.1]) is None
+
+    # 답변 계산 도중 버전이 바뀌었다면 저장하지 않음
+    stale_version = get_graph_version(brain_id)
+    bump_graph_version(brain_id)
+    assert not cache.store(brain_id, stale_version, "q", [1.0, 0.0, 0.1], "오래된 답변", [])
+    assert cache.lookup(brain_id, [1.0, 0.0, 0.1]) is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["invalidations"] == 1 and stats["stale_writes"] == 1
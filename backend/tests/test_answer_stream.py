@@ -0,0 +1,51 @@
+import json
+from fastapi.testclient import TestClient
+from main import app
+from routers import brainGraph
+from services import ai_service
+from services.answer_stream import AnswerStreamParser
+from sqlite_db import SQLiteHandler
+
+client = TestClient(app)
+
+
+def test_parser_handles_eof_split_across_tokens():
+    parser = AnswerStreamParser()
+    tokens = ["딥러닝은 ", "신경망 기반", "입니다.\nE", "O", 'F\n{"referenced_', 'nodes": ["개념-딥러닝"]}']
+    emitted = "".join(parser.feed(token) for token in tokens)
+    emitted += parser.finish()
+
+    assert emitted == "딥러닝은 신경망 기반입니다.\n"
+    assert parser.referenced_nodes == ["딥러닝"]
+    # EOF가 없으면 보류한 끝 글자까지 모두 본문
+    parser = AnswerStreamParser()
+    assert parser.feed("답변 E") == "답변 "
+    assert parser.finish() == "E" and parser.referenced_nodes == []
+
+
+def test_answer_stream_endpoint(monkeypatch):
+    async def fake_prepare(question, brain_id, neo4j_handler):
+        return {"question_embedding": [1.0, 0.0], "graph_version": -1, "cached": None, "schema_text": "스키마"}
+
+    saved = []
+    monkeypatch.setattr(brainGraph, "_prepare_answer", fake_prepare)
+    monkeypatch.setattr(ai_service, "generate_answer_stream",
+                        lambda schema_text, question: iter(["안녕", "하세요 EOF", ' {"referenced_nodes": ["인사"]}']))
+    monkeypatch.setattr(SQLiteHandler, "save_chat",
+                        lambda self, is_ai, message, brain_id, referenced_nodes=None: saved.append((is_ai, message)) or len(saved))
+
+    response = client.post("/brainGraph/answer/stream", json={"question": "인사해줘", "brain_id": "1"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        event, data = block.split("\n", 1)
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+
+    assert "".join(data["text"] for event, data in events if event == "token") == "안녕하세요 "
+    assert ("referenced_nodes", {"referenced_nodes": ["인사"]}) in events
+    event, done = events[-1]
+    assert event == "done" and done["chat_id"] == 2
+    assert done["answer"].startswith("안녕하세요") and "- 인사" in done["answer"]
+    assert saved == [(False, "인사해줘"), (True, done["answer"])]
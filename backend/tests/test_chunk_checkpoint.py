@@ -0,0 +1,56 @@
+from sqlite_db import SQLiteHandler
+from services import chunk_checkpoint
+from services.chunk_checkpoint import extract_chunks
+
+
+def test_only_failed_or_changed_chunks_are_rerun(tmp_path, monkeypatch):
+    db = SQLiteHandler(str(tmp_path / "checkpoint.db"))
+    db._init_db()
+    monkeypatch.setattr(chunk_checkpoint, "_db", db)
+
+    calls = []
+    failing = {"청크2"}
+
+    def flaky_extract(chunk):
+        calls.append(chunk)
+        if chunk in failing:
+            failing.discard(chunk)
+            raise RuntimeError("LLM 오류")
+        return [{"name": chunk}], []
+
+    first, failed = extract_chunks(["청크1", "청크2", "청크3"], "7", "openai", "m", "v1", flaky_extract)
+    assert first == [([{"name": "청크1"}], []), ([], []), ([{"name": "청크3"}], [])]
+    assert failed == [1]
+    assert [c["status"] for c in db.get_source_checkpoints("7")] == ["done", "failed", "done"]
+
+    # 실패한 청크2와 새 청크4만 다시 추출
+    calls.clear()
+    second, failed = extract_chunks(["청크1", "청크2", "청크4"], "7", "openai", "m", "v1", flaky_extract)
+    assert sorted(calls) == ["청크2", "청크4"] and failed == []
+    assert [nodes[0]["name"] for nodes, _ in second] == ["청크1", "청크2", "청크4"]
+
+    # 프롬프트 버전이 바뀌면 체크포인트를 재사용하지 않음
+    calls.clear()
+    extract_chunks(["청크1"], "7", "openai", "m", "v2", flaky_extract)
+    assert calls == ["청크1"]
+
+
+def test_use_cache_false_reruns_and_overwrites(tmp_path, monkeypatch):
+    db = SQLiteHandler(str(tmp_path / "checkpoint.db"))
+    db._init_db()
+    monkeypatch.setattr(chunk_checkpoint, "_db", db)
+
+    extract_chunks(["청크1"], "7", "openai", "m", "v1", lambda chunk: ([{"name": "이전"}], []))
+
+    # use_cache=False면 저장된 체크포인트가 있어도 다시 추출하고 새 결과로 덮어씀
+    calls = []
+    def extract(chunk):
+        calls.append(chunk)
+        return [{"name": "새 결과"}], []
+
+    result = extract_chunks(["청크1"], "7", "openai", "m", "v1", extract, use_cache=False)
+    assert calls == ["청크1"] and result == ([([{"name": "새 결과"}], [])], [])
+
+    calls.clear()
+    assert extract_chunks(["청크1"], "7", "openai", "m", "v1", extract) == ([([{"name": "새 결과"}], [])], [])
+    assert calls == []
@@ -0,0 +1,30 @@
+from services.chunk_service import estimate_tokens, iter_chunks, iter_sentences
+
+
+def test_sentences_keep_korean_boundaries_across_pieces():
+    text = "딥러닝은 신경망을 쓴다. 머신러닝의 한 분야이다!\n\n두 번째 문단이다\n목록 항목"
+    sentences = list(iter_sentences(text))
+    assert [s for s, _, _ in sentences] == [
+        "딥러닝은 신경망을 쓴다.", "머신러닝의 한 분야이다!", "두 번째 문단이다", "목록 항목"
+    ]
+    assert [text[start:start + len(s)] for s, start, _ in sentences] == [s for s, _, _ in sentences]
+    assert sentences[1][2] is True
+
+    # 페이지처럼 나뉘어 들어와도 같은 문장/오프셋
+    pieces = [text[:15], text[15:33], text[33:]]
+    assert list(iter_sentences(pieces)) == sentences
+
+
+def test_chunks_respect_budget_and_adaptive_overlap():
+    text = " ".join(f"{i}번째 문장은 조금 길게 작성된 문장이다." for i in range(8))
+    chunks = list(iter_chunks(text, max_tokens=60, overlap_ratio=0.4, count_tokens=estimate_tokens))
+    assert all(chunk.tokens <= 60 for chunk in chunks)
+    assert chunks[0].text.endswith("2번째 문장은 조금 길게 작성된 문장이다.")
+    # 문단 경계가 아니면 마지막 문장이 다음 청크 앞에 겹침
+    assert chunks[1].text.startswith("2번째")
+    assert chunks[-1].text.endswith("7번째 문장은 조금 길게 작성된 문장이다.")
+
+    # 문단 경계에서 끝난 청크는 겹치지 않음
+    paragraphs = "\n\n".join(f"{i}번째 문단은 조금 길게 작성된 문장이다." for i in range(4))
+    chunks = list(iter_chunks(paragraphs, max_tokens=40, overlap_ratio=0.5, count_tokens=estimate_tokens))
+    assert [chunk.text[0] for chunk in chunks] == ["0", "2"]
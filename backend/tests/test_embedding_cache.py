@@ -0,0 +1,72 @@
+import numpy as np
+from services.embedding_cache import EmbeddingCache, make_cache_key, normalize_text
+
+
+def test_normalize_text_collapses_whitespace():
+    assert normalize_text("  딥러닝   모델\n설명 ") == "딥러닝 모델 설명"
+    assert make_cache_key("m", "a  b") == make_cache_key("m", "a b")
+    assert make_cache_key("m1", "a") != make_cache_key("m2", "a")
+
+
+def test_memory_and_disk_hits(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    cache = EmbeddingCache("test-model", dim=3, db_path=db_path)
+    vectors = np.array([[1, 2, 3], [4, 5, 6]], dtype=np.float32)
+
+    assert cache.get_many(["가", "나"]) == [None, None]
+    cache.put_many(["가", "나"], vectors)
+    hits = cache.get_many(["가", "나", "다"])
+    assert np.array_equal(hits[0], vectors[0])
+    assert np.array_equal(hits[1], vectors[1])
+    assert hits[2] is None
+
+    stats = cache.stats()
+    assert stats["memory_hits"] == 2
+    assert stats["misses"] == 3
+
+    # 새 인스턴스는 메모리가 비어 있으므로 디스크에서 읽어야 함
+    reopened = EmbeddingCache("test-model", dim=3, db_path=db_path)
+    assert np.array_equal(reopened.get_many(["나"])[0], vectors[1])
+    assert reopened.stats()["disk_hits"] == 1
+
+
+def test_lru_eviction():
+    cache = EmbeddingCache("test-model", dim=1, db_path=None, memory_size=2)
+    cache.put_many(["a", "b", "c"], np.array([[1], [2], [3]], dtype=np.float32))
+    assert cache.get_many(["a"]) == [None]
+    assert cache.stats()["memory_entries"] == 2
+
+
+def test_encode_texts_embeds_original_text(tmp_path, monkeypatch):
+    from services import embedding_service
+
+    encoded = []
+
+    def fake_encode(texts, batch_size):
+        encoded.extend(texts)
+        return np.arange(len(texts) * 2, dtype=np.float32).reshape(len(texts), 2)
+
+    monkeypatch.setattr(embedding_service, "embedding_cache", EmbeddingCache("test-model", dim=2, db_path=None))
+    monkeypatch.setattr(embedding_service, "get_embed_dim", lambda: 2)
+    monkeypatch.setattr(embedding_service, "_encode_batches", fake_encode)
+
+    result = embedding_service.encode_texts(["딥러닝\n 모델", "딥러닝 모델", "역전파"])
+    # 정규화 키가 같은 텍스트는 한 번만, 처음 나온 원문 그대로 임베딩
+    assert encoded == ["딥러닝\n 모델", "역전파"]
+    assert np.array_equal(result[0], result[1])
+
+
+def test_encode_texts_skips_model_when_cached(monkeypatch):
+    from services import embedding_service
+
+    def no_model(*args):
+        raise AssertionError("모델을 로드하면 안 됨")
+
+    cache = EmbeddingCache("test-model", dim=2, db_path=None)
+    cache.put_many(["가"], np.array([[1, 2]], dtype=np.float32))
+    monkeypatch.setattr(embedding_service, "embedding_cache", cache)
+    monkeypatch.setattr(embedding_service, "get_embed_dim", no_model)
+    monkeypatch.setattr(embedding_service, "_encode_batches", no_model)
+
+    assert embedding_service.encode_texts([]).shape == (0, 0)
+    assert embedding_service.encode_texts(["가", " 가 "]).tolist() == [[1, 2], [1, 2]]
@@ -0,0 +1,28 @@
+import asyncio
+import time
+
+from services.executors import get_pool_stats, run_in_pool
+
+
+def test_run_in_pool_does_not_block_event_loop():
+    async def scenario():
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        async def blocking():
+            await run_in_pool("db", time.sleep, 0.2)
+            return time.perf_counter()
+
+        finished_at, _ = await asyncio.gather(blocking(), ticker())
+        return finished_at, ticks
+
+    finished_at, ticks = asyncio.run(scenario())
+    # 블로킹 sleep(0.2)이 끝나기 전에 ticker가 모두 실행되어야 함
+    assert len(ticks) == 5 and ticks[-1] < finished_at
+    stats = get_pool_stats()["db"]
+    assert stats["completed"] >= 1
+    assert stats["queued"] == 0 and stats["running"] == 0
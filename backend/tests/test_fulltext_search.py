@@ -0,0 +1,80 @@
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from routers import searchRouter
+from sqlite_db import SQLiteHandler
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    path = str(tmp_path / "search.db")
+    handler = SQLiteHandler(path)
+    handler._init_db()
+    monkeypatch.setattr(searchRouter, "SQLiteHandler", lambda: SQLiteHandler(path))
+    return handler
+
+
+def test_index_follows_memo_file_and_chat_changes(db):
+    brain_id = db.create_brain("검색")["brain_id"]
+    memo = db.create_memo("딥러닝 메모", "딥러닝은 신경망을 쓰는 머신러닝의 한 분야이다.", brain_id=brain_id)
+    pdf = db.create_pdf("그래프 논문.pdf", "/tmp/graph.pdf", brain_id=brain_id)
+    db.save_chat(False, "신경망이 뭐야?", brain_id)
+
+    assert {r["type"] for r in db.search_documents("신경망", brain_id)} == {"memo", "chat"}
+
+    # 추출 텍스트를 저장하면 파일 본문도 검색됨 (스니펫에 검색어 표시)
+    db.save_source_text(pdf["pdf_id"], brain_id, "그래프 데이터베이스는 엔티티와 관계를 저장한다.")
+    [hit] = db.search_documents("데이터베이스", brain_id)
+    assert hit["type"] == "pdf" and hit["title"] == "그래프 논문.pdf"
+    assert "<b>데이터베이스</b>" in hit["snippet"]
+
+    # 수정/삭제가 트리거로 반영됨
+    db.update_memo(memo["memo_id"], memo_text="강화학습 메모", brain_id=brain_id)
+    assert [r["type"] for r in db.search_documents("신경망", brain_id)] == ["chat"]
+    db.delete_pdf(pdf["pdf_id"])
+    assert db.search_documents("데이터베이스", brain_id) == []
+
+    # 다른 브레인 결과는 나오지 않음
+    assert db.search_documents("강화학습", brain_id + 1) == []
+
+
+def test_short_terms_and_search_route(db):
+    brain_id = db.create_brain("검색")["brain_id"]
+    db.create_textfile("회의록.txt", "/tmp/a.txt", brain_id=brain_id)
+    db.create_mdfile("노트.md", "/tmp/a.md", brain_id=brain_id)
+
+    # trigram으로 찾을 수 없는 2글자 검색어도 찾음
+    assert [r["type"] for r in db.search_titles_by_query("회의", brain_id)] == ["text"]
+    assert [r["title"] for r in db.search_mds(brain_id, "노트")] == ["노트.md"]
+
+    response = client.get("/search", params={"q": "회의록", "brain_id": brain_id, "types": "text,md"})
+    assert response.status_code == 200
+    assert [r["title"] for r in response.json()] == ["회의록.txt"]
+    assert client.get("/search", params={"q": "회의록", "brain_id": brain_id, "types": "video"}).status_code == 400
+
+
+def test_source_text_is_scoped_to_kind(db):
+    brain_id = db.create_brain("검색")["brain_id"]
+    pdf = db.create_pdf("논문.pdf", "/tmp/paper.pdf", brain_id=brain_id)
+    md = db.create_mdfile("노트.md", "/tmp/note.md", brain_id=brain_id)
+    # MD 파일도 content_id 시퀀스를 쓰므로 ID가 겹치지 않고, kind 없이도 해당 파일에만 저장
+    assert md["md_id"] != pdf["pdf_id"]
+    assert db.save_source_text(md["md_id"], brain_id, "마크다운 본문 내용")
+    assert [r["type"] for r in db.search_documents("마크다운", brain_id)] == ["md"]
+
+    # 이전 DB처럼 MD 파일 ID가 PDF와 겹쳐도 추출 텍스트는 종류별로 구분
+    with db._transaction() as conn:
+        conn.execute(
+            "INSERT INTO MDFile (md_id, md_title, md_path, brain_id) VALUES (?, ?, ?, ?)",
+            (pdf["pdf_id"], "겹치는.md", "/tmp/dup.md", brain_id)
+        )
+    db.save_source_text(pdf["pdf_id"], brain_id, "트랜스포머 어텐션 구조", kind="pdf")
+    assert [r["type"] for r in db.search_documents("트랜스포머", brain_id)] == ["pdf"]
+    db.delete_mdfile(pdf["pdf_id"])
+    assert [r["type"] for r in db.search_documents("트랜스포머", brain_id)] == ["pdf"]
+
+    # 메모처럼 파일이 아닌 소스는 ID가 파일과 겹쳐도 SourceText에 저장하지 않음
+    assert db.save_source_text(pdf["pdf_id"], brain_id, "메모 본문 임베딩", kind="memo") is False
+    assert db.search_documents("임베딩", brain_id) == []
@@ -0,0 +1,68 @@
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from services import embedding_service, hybrid_search
+from services.hybrid_search import reciprocal_rank_fusion
+from sqlite_db import SQLiteHandler
+
+client = TestClient(app)
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion(
+        {"lexical": ["a", "b", "c"], "vector": ["c", "d", "a", "a"]},
+        rrf_k=60
+    )
+    ids = [item_id for item_id, _, _ in fused]
+    # 두 검색 모두에 나온 a, c가 한쪽에만 나온 b, d보다 앞
+    assert ids[:2] == ["a", "c"] and set(ids[2:]) == {"b", "d"}
+    assert fused[0][2] == {"lexical": 1, "vector": 3}
+    assert fused[0][1] == pytest.approx(1 / 61 + 1 / 63)
+
+    # 가중치를 주면 해당 검색 순위가 우선
+    weighted = reciprocal_rank_fusion({"lexical": ["a"], "vector": ["b"]}, weights={"vector": 2.0})
+    assert [item_id for item_id, _, _ in weighted] == ["b", "a"]
+
+
+@pytest.fixture
+def brain(tmp_path, monkeypatch):
+    db = SQLiteHandler(str(tmp_path / "hybrid.db"))
+    db._init_db()
+    monkeypatch.setattr(hybrid_search, "_db", db)
+    monkeypatch.setattr(embedding_service, "is_index_ready", lambda brain_id: True)
+    monkeypatch.setattr(embedding_service, "encode_text", lambda text: [0.1, 0.2])
+    brain_id = db.create_brain("하이브리드")["brain_id"]
+    memo = db.create_memo("신경망 정리", "신경망과 역전파에 대한 메모", brain_id=brain_id)
+    other = db.create_memo("요리", "김치찌개 만드는 법", brain_id=brain_id)
+    return brain_id, str(memo["memo_id"]), str(other["memo_id"])
+
+
+def test_get_similar_source_ids_fuses_both_searches(brain, monkeypatch):
+    brain_id, memo_id, other_id = brain
+    monkeypatch.setattr(
+        embedding_service, "search_similar_descriptions",
+        lambda embedding, brain_id, limit, threshold: [
+            {"source_id": other_id, "description": "", "score": 0.7},
+            {"source_id": memo_id, "description": "", "score": 0.6},
+            {"source_id": "777", "description": "", "score": 0.55},
+        ]
+    )
+    response = client.post("/search/getSimilarSourceIds", json={"query": "신경망", "brain_id": str(brain_id), "k": 2})
+    assert response.status_code == 200
+    body = response.json()
+    # 키워드와 벡터 양쪽에 나온 메모가 1위, k개만 반환
+    assert body["source_ids"] == [memo_id, other_id]
+    assert body["results"][0]["lexical_rank"] == 1 and body["results"][0]["vector_rank"] == 2
+    assert {"lexical_ms", "vector_ms", "embedding_ms", "fusion_ms", "total_ms"} <= set(body["timings"])
+
+
+def test_vector_failure_falls_back_to_lexical(brain, monkeypatch):
+    brain_id, memo_id, _ = brain
+
+    def broken(**kwargs):
+        raise RuntimeError("qdrant down")
+
+    monkeypatch.setattr(embedding_service, "search_similar_descriptions", broken)
+    response = client.post("/search/getSimilarSourceIds", json={"query": "역전파", "brain_id": str(brain_id)})
+    assert response.status_code == 200
+    assert response.json()["source_ids"] == [memo_id]
@@ -0,0 +1,149 @@
+import pytest
+from sqlite_db import SQLiteHandler
+from services import ai_service, chunk_checkpoint, embedding_service, ingest_service
+from services.ingest_service import run_incremental_ingest
+
+
+class FakeNeo4j:
+    def __init__(self):
+        self.inserted = []
+        self.inserted_edges = []
+        self.removed = []
+        self.removed_edges = []
+        self.fail_insert = False
+
+    def insert_nodes_and_edges(self, nodes, edges, brain_id):
+        if self.fail_insert:
+            raise RuntimeError("Neo4j 쓰기 실패")
+        self.inserted.append([n["name"] for n in nodes])
+        self.inserted_edges.append([(e["source"], e["target"], e["relation"]) for e in edges])
+
+    def remove_edges(self, source_id, brain_id, edges):
+        self.removed_edges.extend((e["source"], e["target"], e["relation"]) for e in edges)
+
+    def remove_descriptions(self, source_id, brain_id, descriptions):
+        self.removed.extend(descriptions)
+
+    def delete_descriptions_by_source_id(self, source_id, brain_id):
+        pass
+
+
+@pytest.fixture
+def setup(tmp_path, monkeypatch):
+    db = SQLiteHandler(str(tmp_path / "ingest.db"))
+    db._init_db()
+    monkeypatch.setattr(chunk_checkpoint, "_db", db)
+    monkeypatch.setattr(ingest_service, "_db", db)
+
+    llm_calls = []
+    failing = set()
+
+    def fake_extract(chunk, source_id, use_cache=True):
+        llm_calls.append(chunk)
+        if chunk in failing:
+            raise RuntimeError("LLM 오류")
+        nodes = [
+            {"name": chunk, "label": "문단", "source_id": source_id,
+             "descriptions": [{"description": f"{chunk} 설명", "source_id": source_id}]},
+            {"name": "문서", "label": "문서", "source_id": source_id, "descriptions": []}
+        ]
+        return nodes, [{"source": chunk, "target": "문서", "relation": "포함", "source_id": source_id}]
+
+    deleted_vectors = []
+    monkeypatch.setattr(ai_service, "split_into_chunks", lambda text: text.split("\n"))
+    monkeypatch.setattr(ai_service, "_request_chunk_extraction", fake_extract)
+    monkeypatch.setattr(embedding_service, "is_index_ready", lambda brain_id: True)
+    monkeypatch.setattr(embedding_service, "delete_node", lambda source_id, brain_id: None)
+    monkeypatch.setattr(embedding_service, "update_index_and_get_embeddings", lambda nodes, brain_id: {})
+    monkeypatch.setattr(embedding_service, "delete_descriptions",
+                        lambda source_id, brain_id, descriptions: deleted_vectors.extend(descriptions))
+
+    return db, FakeNeo4j(), llm_calls, deleted_vectors, failing
+
+
+def test_only_changed_chunks_are_extracted(setup):
+    db, neo4j, llm_calls, deleted_vectors, _ = setup
+    first = run_incremental_ingest("문단1\n문단2\n문단3", "5", "1", neo4j)
+    assert first["mode"] == "full"
+    assert sorted(llm_calls) == ["문단1", "문단2", "문단3"]
+
+    # 문단2만 수정
+    llm_calls.clear()
+    second = run_incremental_ingest("문단1\n문단2 수정\n문단3", "5", "1", neo4j)
+    assert second["mode"] == "incremental"
+    assert llm_calls == ["문단2 수정"]
+    assert second["added_chunks"] == 1 and second["removed_chunks"] == 1
+    assert sorted(neo4j.inserted[-1]) == ["문단2 수정", "문서"]
+    assert neo4j.inserted_edges[-1] == [("문단2 수정", "문서", "포함")]
+    assert deleted_vectors == ["문단2 설명"]
+    assert len(neo4j.removed) == 1 and "문단2 설명" in neo4j.removed[0]
+    # 사라진 청크에서만 나온 엣지도 삭제
+    assert neo4j.removed_edges == [("문단2", "문서", "포함")]
+
+    # 체크포인트와 반영된 청크 기록은 현재 청크 목록으로 정리됨
+    assert len(db.get_source_checkpoints("5")) == 3
+    assert len(db.get_applied_chunks("5")) == 3
+
+
+def test_failed_write_is_retried_next_time(setup):
+    db, neo4j, llm_calls, _, _ = setup
+    run_incremental_ingest("문단1\n문단2", "6", "1", neo4j)
+
+    # 추출은 성공했지만 Neo4j 쓰기가 실패하면 반영된 청크로 기록하지 않음
+    neo4j.fail_insert = True
+    with pytest.raises(RuntimeError):
+        run_incremental_ingest("문단1\n문단2 수정", "6", "1", neo4j)
+    assert {c["nodes"][0]["name"] for c in db.get_applied_chunks("6")} == {"문단1", "문단2"}
+
+    # 다음 재처리에서 같은 청크를 다시 반영 (추출은 체크포인트에서 재사용)
+    neo4j.fail_insert = False
+    llm_calls.clear()
+    retry = run_incremental_ingest("문단1\n문단2 수정", "6", "1", neo4j)
+    assert retry["added_chunks"] == 1 and llm_calls == []
+    assert sorted(neo4j.inserted[-1]) == ["문단2 수정", "문서"]
+    assert {c["nodes"][0]["name"] for c in db.get_applied_chunks("6")} == {"문단1", "문단2 수정"}
+
+
+def test_failed_chunks_are_reported_and_not_applied(setup):
+    db, neo4j, llm_calls, _, failing = setup
+    run_incremental_ingest("문단1\n문단2", "8", "1", neo4j)
+
+    # 추출에 실패한 청크는 결과에 인덱스로 남기고 반영된 청크로 기록하지 않음
+    failing.add("문단3")
+    partial = run_incremental_ingest("문단1\n문단2\n문단3", "8", "1", neo4j)
+    assert partial["failed_chunks"] == [2]
+    assert len(db.get_applied_chunks("8")) == 2
+
+    failing.clear()
+    retry = run_incremental_ingest("문단1\n문단2\n문단3", "8", "1", neo4j)
+    assert retry["failed_chunks"] == [] and retry["added_chunks"] == 1
+    assert len(db.get_applied_chunks("8")) == 3
+
+
+def test_stale_edges_use_merged_names(setup, monkeypatch):
+    db, neo4j, _, _, _ = setup
+
+    def node(name, description):
+        return {"name": name, "label": "개념", "source_id": "9",
+                "descriptions": [{"description": description, "source_id": "9"}]}
+
+    extracted = {
+        "문단A": ([node("딥러닝", "A 설명")], []),
+        "문단B": ([node("딥 러닝", "B 설명"), node("신경망", "B 신경망")],
+                 [{"source": "딥 러닝", "target": "신경망", "relation": "기반", "source_id": "9"}]),
+        "문단C": ([node("딥 러닝", "C 설명"), node("역전파", "C 역전파")],
+                 [{"source": "딥 러닝", "target": "역전파", "relation": "사용", "source_id": "9"}]),
+    }
+    monkeypatch.setattr(ai_service, "_request_chunk_extraction",
+                        lambda chunk, source_id, use_cache=True: extracted[chunk])
+
+    # 표기만 다른 "딥 러닝"은 먼저 나온 "딥러닝"으로 병합되어 저장됨
+    run_incremental_ingest("문단A\n문단B", "9", "1", neo4j)
+    assert neo4j.inserted_edges[-1] == [("딥러닝", "신경망", "기반")]
+
+    # 문단B를 문단C로 바꾸면 Neo4j에 저장된 이름으로 엣지를 지우고, 새 엣지도 대표 이름으로 저장
+    result = run_incremental_ingest("문단A\n문단C", "9", "1", neo4j)
+    assert neo4j.removed_edges == [("딥러닝", "신경망", "기반")]
+    assert neo4j.inserted_edges[-1] == [("딥러닝", "역전파", "사용")]
+    assert "딥 러닝" not in neo4j.inserted[-1]
+    assert result["removed_edges"] == 1
@@ -0,0 +1,133 @@
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from sqlite_db import SQLiteHandler
+from services import ingest_service
+from services.ingest_service import IngestWorkerPool
+
+client = TestClient(app)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def init_db():
+    SQLiteHandler()._init_db()
+
+
+def test_submit_and_cancel_job():
+    response = client.post("/jobs/process_text", json={
+        "text": "작업 큐 테스트 텍스트",
+        "brain_id": "1",
+        "source_id": "999"
+    })
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued"
+
+    response = client.get(f"/jobs/{job['job_id']}")
+    assert response.status_code == 200
+    assert response.json()["source_id"] == "999"
+
+    response = client.post(f"/jobs/{job['job_id']}/cancel")
+    assert response.status_code == 200
+    assert response.json()["status"] == "cancelled"
+
+
+def test_brain_graph_process_text_enqueues_job():
+    # 기존 경로도 동기 처리 대신 작업을 등록하고 바로 job_id를 반환
+    response = client.post("/brainGraph/process_text", json={
+        "text": "메모 본문", "brain_id": "1", "source_id": "998", "source_kind": "memo"
+    })
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued" and job["source_kind"] == "memo"
+    assert client.post(f"/jobs/{job['job_id']}/cancel").json()["status"] == "cancelled"
+
+
+def test_get_missing_job():
+    assert client.get("/jobs/99999999").status_code == 404
+
+
+def test_worker_runs_and_resumes_jobs(tmp_path, monkeypatch):
+    db = SQLiteHandler(str(tmp_path / "jobs.db"))
+    db._init_db()
+
+    def fake_ingest(text, source_id, brain_id, report=None, should_cancel=None, **kwargs):
+        report("extraction", {"extraction": {"done": 1, "total": 1}})
+        return {"nodes_count": 1, "edges_count": 0, "chunks_count": 1}
+
+    monkeypatch.setattr(ingest_service, "run_ingest", fake_ingest)
+
+    job = db.create_job("1", "10", "텍스트")
+    # 서버가 작업 도중 종료된 상황: running으로 남은 작업은 재시작 시 다시 queued
+    claimed = db.claim_next_job()
+    assert claimed["job_id"] == job["job_id"] and claimed["status"] == "running"
+    assert db.claim_next_job() is None
+    assert db.requeue_running_jobs() == 1
+
+    pool = IngestWorkerPool(num_workers=1, db_path=str(tmp_path / "jobs.db"))
+    pool.run_job(db.claim_next_job())
+
+    done = db.get_job(job["job_id"])
+    assert done["status"] == "succeeded"
+    assert done["attempts"] == 2
+    assert done["result"]["nodes_count"] == 1
+    assert done["progress"]["extraction"]["done"] == 1
+
+
+def test_job_options_are_passed_to_worker(tmp_path, monkeypatch):
+    db = SQLiteHandler(str(tmp_path / "jobs.db"))
+    db._init_db()
+    calls = []
+
+    def fake_ingest(text, source_id, brain_id, use_cache=True, source_kind=None, **kwargs):
+        calls.append((use_cache, source_kind))
+        return {"nodes_count": 0, "edges_count": 0, "chunks_count": 1}
+
+    monkeypatch.setattr(ingest_service, "run_ingest", fake_ingest)
+
+    job = db.create_job("1", "12", "텍스트", use_cache=False, source_kind="md")
+    assert job["use_cache"] is False and job["source_kind"] == "md"
+    IngestWorkerPool(num_workers=1, db_path=str(tmp_path / "jobs.db")).run_job(db.claim_next_job())
+    assert calls == [(False, "md")]
+
+
+def test_job_with_failed_chunks_is_marked_failed(tmp_path, monkeypatch):
+    db = SQLiteHandler(str(tmp_path / "jobs.db"))
+    db._init_db()
+    monkeypatch.setattr(ingest_service, "run_ingest", lambda *args, **kwargs: {
+        "nodes_count": 2, "edges_count": 1, "chunks_count": 3, "failed_chunks": [1]
+    })
+
+    job = db.create_job("1", "11", "텍스트")
+    IngestWorkerPool(num_workers=1, db_path=str(tmp_path / "jobs.db")).run_job(db.claim_next_job())
+
+    # 일부 청크만 반영된 작업은 결과를 남긴 채 failed로 마무리
+    finished = db.get_job(job["job_id"])
+    assert finished["status"] == "failed"
+    assert finished["result"]["failed_chunks"] == [1]
+    assert "1/3" in finished["error"]
+
+
+def test_job_fails_after_max_attempts(tmp_path, monkeypatch):
+    db = SQLiteHandler(str(tmp_path / "jobs.db"))
+    db._init_db()
+    monkeypatch.setattr(ingest_service, "run_ingest", lambda *args, **kwargs: pytest.fail("실행되면 안 됨"))
+
+    job = db.create_job("1", "10", "텍스트")
+    # 처리 중 서버가 두 번 죽은 작업: 두 번째 재시작에서 failed로 마무리
+    db.claim_next_job()
+    assert db.requeue_running_jobs(max_attempts=2) == 1
+    db.claim_next_job()
+    assert db.requeue_running_jobs(max_attempts=2) == 0
+
+    failed = db.get_job(job["job_id"])
+    assert failed["status"] == "failed" and failed["attempts"] == 2
+    assert "최대 시도 횟수" in failed["error"]
+
+    # 이미 한도를 넘긴 작업은 워커가 실행하지 않음
+    other = db.create_job("1", "11", "텍스트")
+    pool = IngestWorkerPool(num_workers=1, max_attempts=1, db_path=str(tmp_path / "jobs.db"))
+    db.claim_next_job()
+    db.requeue_running_jobs()
+    pool.run_job(db.claim_next_job())
+    assert db.get_job(other["job_id"])["status"] == "failed"
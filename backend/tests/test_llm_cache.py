@@ -0,0 +1,39 @@
+from services import llm_cache as llm_cache_module
+from services.llm_cache import LLMResponseCache
+
+
+def test_hit_miss_and_bypass(tmp_path):
+    cache = LLMResponseCache(db_path=str(tmp_path / "llm.db"))
+    assert cache.get("openai", "gpt-4o", "v1", "청크") is None
+    cache.put("openai", "gpt-4o", "v1", "청크", '{"nodes": []}')
+
+    assert cache.get("openai", "gpt-4o", "v1", "청크") == '{"nodes": []}'
+    # 프로바이더/모델/프롬프트 버전이 다르면 다른 키
+    assert cache.get("ollama", "gpt-4o", "v1", "청크") is None
+    assert cache.get("openai", "gpt-4o", "v2", "청크") is None
+    # bypass
+    assert cache.get("openai", "gpt-4o", "v1", "청크", use_cache=False) is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 3 and stats["bypassed"] == 1
+    assert stats["entries"] == 1
+
+
+def test_ttl_and_size_eviction(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache_module.time, "time", lambda: now[0])
+    cache = LLMResponseCache(db_path=str(tmp_path / "llm.db"), ttl_seconds=60, max_entries=2)
+
+    cache.put("openai", "m", "v1", "a", "A")
+    now[0] += 61
+    assert cache.get("openai", "m", "v1", "a") is None
+    assert cache.stats()["expired"] == 1
+
+    for chunk in ["b", "c", "d"]:
+        now[0] += 1
+        cache.put("openai", "m", "v1", chunk, chunk.upper())
+    cache.prune()
+    assert cache.stats()["entries"] == 2
+    # 가장 오래 사용하지 않은 b가 삭제됨
+    assert cache.get("openai", "m", "v1", "b") is None
+    assert cache.get("openai", "m", "v1", "d") == "D"
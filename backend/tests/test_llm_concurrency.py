@@ -0,0 +1,32 @@
+import random
+import time
+
+from services import llm_concurrency
+from services.llm_concurrency import call_with_backoff, map_in_order
+
+
+class FakeRateLimitError(Exception):
+    status_code = 429
+
+
+def test_map_in_order_keeps_chunk_order():
+    def slow_upper(text):
+        time.sleep(random.random() / 100)
+        return text.upper()
+
+    chunks = [f"chunk{i}" for i in range(20)]
+    assert map_in_order("openai", slow_upper, chunks) == [c.upper() for c in chunks]
+
+
+def test_call_with_backoff_retries_rate_limit(monkeypatch):
+    monkeypatch.setattr(llm_concurrency.time, "sleep", lambda _: None)
+    calls = {"n": 0}
+
+    def flaky():
+        calls["n"] += 1
+        if calls["n"] < 3:
+            raise FakeRateLimitError("rate limited")
+        return "ok"
+
+    assert call_with_backoff(flaky, "openai") == "ok"
+    assert calls["n"] == 3
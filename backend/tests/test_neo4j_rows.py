@@ -0,0 +1,48 @@
+import json
+import pytest
+from neo4j_db.Neo4jHandler import batched, build_write_rows
+
+
+def test_build_write_rows_merges_nodes_and_edges():
+    nodes = [
+        {"name": "딥러닝", "label": "개념", "source_id": "1",
+         "descriptions": [{"description": "신경망 기반 학습"}]},
+        {"name": "신경망", "label": "개념", "source_id": "1", "descriptions": []},
+        # 같은 이름의 노드: 같은 description은 한 번만, 새 출처는 추가
+        {"name": "딥러닝", "label": "기술", "source_id": "2",
+         "descriptions": [{"description": "신경망 기반 학습", "source_id": "1"},
+                          {"description": "표현 학습", "source_id": "2"}]},
+    ]
+    edges = [
+        {"source": "딥러닝", "target": "신경망", "relation": "사용", "source_id": "1"},
+        {"source": "딥러닝", "target": "신경망", "relation": "사용", "source_id": "2"},
+        {"source": "딥러닝", "target": "신경망", "relation": "사용", "source_id": "1"},
+        {"source": "신경망", "target": "딥러닝", "relation": "기반"},
+    ]
+    node_rows, edge_rows = build_write_rows(nodes, edges)
+
+    assert [row["name"] for row in node_rows] == ["딥러닝", "신경망"]
+    deep = node_rows[0]
+    assert [json.loads(d) for d in deep["new_descriptions"]] == [
+        {"description": "신경망 기반 학습", "source_id": "1"},
+        {"description": "표현 학습", "source_id": "2"},
+    ]
+    assert deep["source_ids"] == ["1", "2"]
+    assert deep["label"] == "기술" and deep["source_id"] == "2"
+    # 입력 노드는 수정하지 않음
+    assert nodes[0]["descriptions"] == [{"description": "신경망 기반 학습"}]
+
+    assert edge_rows == [
+        {"source": "딥러닝", "target": "신경망", "relation": "사용", "source_ids": ["1", "2"]},
+        # 출처가 없는 엣지는 빈 목록 (Neo4j에는 source_ids가 저장되지 않아 remove_edges 대상이 아님)
+        {"source": "신경망", "target": "딥러닝", "relation": "기반", "source_ids": []},
+    ]
+
+
+def test_batched_boundaries():
+    rows = list(range(5))
+    assert batched(rows, 2) == [[0, 1], [2, 3], [4]]
+    assert batched(rows, 5) == [rows]
+    assert batched([], 3) == []
+    with pytest.raises(ValueError):
+        batched(rows, 0)
@@ -0,0 +1,38 @@
+import numpy as np
+from services.node_merge import merge_exact_nodes, merge_nodes_and_edges
+
+
+def _node(name, label="개념", description="설명"):
+    return {"name": name, "label": label, "descriptions": [{"description": description, "source_id": "1"}]}
+
+
+def test_exact_and_spacing_variants_merge():
+    nodes = [_node("딥러닝", description="a"), _node("머신러닝"), _node("딥 러닝", description="b"), _node("딥러닝", description="c")]
+    edges = [
+        {"source": "딥 러닝", "target": "머신러닝", "relation": "하위 분야"},
+        {"source": "딥러닝", "target": "머신러닝", "relation": "하위 분야"},
+        {"source": "딥 러닝", "target": "딥러닝", "relation": "같음"}
+    ]
+    assert [n["name"] for n in merge_exact_nodes([_node("a"), _node("b"), _node("a")])] == ["a", "b"]
+
+    merged_nodes, merged_edges = merge_nodes_and_edges(nodes, edges, resolve_entities=False)
+    assert [n["name"] for n in merged_nodes] == ["딥러닝", "머신러닝"]
+    assert [d["description"] for d in merged_nodes[0]["descriptions"]] == ["a", "c", "b"]
+    # 대표 이름으로 바뀐 엣지는 중복 제거, 병합으로 생긴 자기 루프는 제거
+    assert merged_edges == [{"source": "딥러닝", "target": "머신러닝", "relation": "하위 분야"}]
+
+
+def test_embedding_resolution_only_compares_blocked_candidates():
+    vectors = {"인공지능": [1.0, 0.0], "인공 지능 기술": [0.99, 0.05], "인공위성": [0.0, 1.0], "고양이": [1.0, 0.0]}
+    seen = []
+
+    def fake_encode(names):
+        seen.extend(names)
+        return np.array([vectors[name] for name in names])
+
+    nodes = [_node(name) for name in vectors]
+    merged_nodes, _ = merge_nodes_and_edges(nodes, [], resolve_entities=True, threshold=0.95, encode_fn=fake_encode)
+
+    assert [n["name"] for n in merged_nodes] == ["인공지능", "인공위성", "고양이"]
+    # bigram을 공유하지 않는 "고양이"는 임베딩이 같아도 후보가 아님
+    assert "고양이" not in seen
@@ -0,0 +1,26 @@
+from services import ollama_service
+from services.model_registry import ModelRegistry
+
+
+def test_failed_pull_is_not_retried_until_backoff(monkeypatch):
+    attempts = []
+
+    def failing_pull():
+        attempts.append(1)
+        raise ConnectionError("ollama 서버 없음")
+
+    registry = ModelRegistry()
+    registry.register("ollama", failing_pull)
+    monkeypatch.setattr(ollama_service, "registry", registry)
+    monkeypatch.setattr(ollama_service, "_pull_failed_at", None)
+    now = [1000.0]
+    monkeypatch.setattr(ollama_service.time, "monotonic", lambda: now[0])
+
+    # 실패 후 대기 시간 안에는 pull을 다시 시도하지 않음
+    ollama_service._ensure_model()
+    ollama_service._ensure_model()
+    assert len(attempts) == 1
+
+    now[0] += ollama_service.OLLAMA_PULL_RETRY_SECONDS
+    ollama_service._ensure_model()
+    assert len(attempts) == 2
@@ -0,0 +1,52 @@
+import pytest
+from services.chunk_service import estimate_tokens
+from services.pdf_service import chunk_pdf
+
+pytest.importorskip("pypdf")
+
+
+def _write_pdf(path, pages):
+    """페이지마다 한 줄의 텍스트가 있는 최소 PDF를 만듭니다."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>"
+
+    body, offsets = b"%PDF-1.4\n", []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += f"{number} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(body)
+    body += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    body += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    body += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF".encode("latin-1")
+    path.write_bytes(body)
+
+
+def test_chunk_pdf_maps_chunks_to_pages(tmp_path):
+    path = tmp_path / "doc.pdf"
+    _write_pdf(path, [
+        "Deep learning uses neural networks. It is a branch of machine learning.",
+        "Graphs store entities and relations. Queries walk the edges.",
+        "The last page closes the document."
+    ])
+    seen_pages = []
+    chunks, page_map = chunk_pdf(
+        str(path), on_page=lambda number, total: seen_pages.append((number, total)),
+        max_tokens=20, count_tokens=estimate_tokens
+    )
+
+    assert seen_pages == [(1, 3), (2, 3), (3, 3)]
+    assert len(chunks) == len(page_map) > 1
+    assert chunks[0].startswith("Deep learning")
+    assert page_map[0]["page_start"] == 1
+    assert page_map[-1]["page_end"] == 3
+    assert all(row["page_start"] <= row["page_end"] for row in page_map)
+    assert [row["chunk_index"] for row in page_map] == list(range(len(chunks)))
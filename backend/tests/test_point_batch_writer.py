@@ -0,0 +1,62 @@
+import pytest
+from services import embedding_service
+from services.embedding_service import PointBatchWriter
+
+
+class FakeQdrant:
+    def __init__(self):
+        self.upserts = []
+
+    def upsert(self, collection_name, points):
+        self.upserts.append((collection_name, list(points)))
+
+
+@pytest.fixture
+def client(monkeypatch):
+    fake = FakeQdrant()
+    monkeypatch.setattr(embedding_service, "get_client", lambda: fake)
+    return fake
+
+
+def test_flushes_when_batch_size_is_reached(client):
+    writer = PointBatchWriter("1", batch_size=3, flush_interval=3600)
+    for i in range(7):
+        writer.add(i)
+    assert [points for _, points in client.upserts] == [[0, 1, 2], [3, 4, 5]]
+    assert writer.stats()["pending"] == 1
+
+
+def test_flushes_after_interval_on_next_add(client, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(embedding_service.time, "monotonic", lambda: now[0])
+    writer = PointBatchWriter("1", batch_size=100, flush_interval=5)
+
+    writer.add("a")
+    now[0] += 10
+    # 타이머가 없으므로 시간이 지나도 add가 호출되기 전에는 저장하지 않음
+    assert client.upserts == []
+    writer.add("b")
+    assert [points for _, points in client.upserts] == [["a", "b"]]
+
+
+def test_exit_flushes_remaining_points_and_stats(client):
+    with PointBatchWriter("1", batch_size=2, flush_interval=3600) as writer:
+        for i in range(3):
+            writer.add(i)
+    assert [points for _, points in client.upserts] == [[0, 1], [2]]
+    assert client.upserts[0][0] == embedding_service.get_collection_name("1")
+
+    stats = writer.stats()
+    assert stats["points_written"] == 3 and stats["pending"] == 0
+    assert stats["flush_count"] == 2 and len(stats["flush_seconds"]) == 2
+    assert stats["total_flush_seconds"] == pytest.approx(sum(stats["flush_seconds"]))
+    # 버퍼가 비어 있으면 flush해도 upsert하지 않음
+    assert writer.flush() == 0 and len(client.upserts) == 2
+
+
+def test_exit_with_error_still_flushes(client):
+    with pytest.raises(ValueError):
+        with PointBatchWriter("1", batch_size=10, flush_interval=3600) as writer:
+            writer.add("a")
+            raise ValueError("임베딩 중 오류")
+    assert [points for _, points in client.upserts] == [["a"]]
@@ -0,0 +1,76 @@
+import threading
+import pytest
+from sqlite_db import SQLiteHandler
+from sqlite_db.connection import connections
+
+
+@pytest.fixture
+def db(tmp_path):
+    handler = SQLiteHandler(str(tmp_path / "pool.db"))
+    handler._init_db()
+    return handler
+
+
+def test_connection_reused_per_thread_with_pragmas(db):
+    conn = db._conn()
+    assert db._conn() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(db._conn()))
+    thread.start()
+    thread.join()
+    assert other[0] is not conn
+
+
+def test_transaction_rolls_back_on_error(db):
+    brain = db.create_brain("트랜잭션")
+    with pytest.raises(RuntimeError):
+        with db._transaction() as conn:
+            conn.execute("UPDATE Brain SET brain_name = ? WHERE brain_id = ?", ("변경", brain["brain_id"]))
+            raise RuntimeError("중단")
+    assert db.get_brain(brain["brain_id"])["brain_name"] == "트랜잭션"
+
+
+def test_concurrent_writers_do_not_lock(db):
+    brain = db.create_brain("동시 쓰기")
+    errors = []
+
+    def write(n):
+        try:
+            for i in range(20):
+                db.create_memo(f"메모 {n}-{i}", "내용", brain_id=brain["brain_id"])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    memos = db.get_memos_by_brain(brain["brain_id"])
+    assert len(memos) == 80
+    assert len({memo["memo_id"] for memo in memos}) == 80
+
+
+def test_close_all_reopens_on_next_use(db):
+    conn = db._conn()
+    connections.close_all()
+    assert db._conn() is not conn
+    assert db.get_all_brains() == []
+
+
+def test_content_ids_are_shared_across_tables_and_rolled_back(db):
+    brain = db.create_brain("ID")
+    memo_id = db.create_memo("메모", "내용", brain_id=brain["brain_id"])["memo_id"]
+    pdf_id = db.create_pdf("문서.pdf", "/tmp/doc.pdf", brain_id=brain["brain_id"])["pdf_id"]
+    chat_id = db.save_chat(False, "질문", brain["brain_id"])
+    assert [memo_id, pdf_id, chat_id] == [memo_id, memo_id + 1, memo_id + 2]
+
+    # INSERT가 실패하면 발급한 ID도 롤백됨
+    with pytest.raises(RuntimeError):
+        db.create_textfile("실패.txt", "/tmp/a.txt", brain_id=brain["brain_id"], type=object())
+    assert db.create_textfile("a.txt", "/tmp/a.txt", brain_id=brain["brain_id"])["txt_id"] == chat_id + 1
@@ -0,0 +1,92 @@
+import sqlite3
+import pytest
+from sqlite_db import SQLiteHandler
+from sqlite_db.migrations import LATEST_VERSION, apply_migrations, get_schema_version
+
+
+@pytest.fixture
+def db(tmp_path):
+    handler = SQLiteHandler(str(tmp_path / "schema.db"))
+    handler._init_db()
+    return handler
+
+
+def test_migrations_upgrade_legacy_db(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    # source_path 컬럼과 인덱스가 없던 이전 버전 스키마
+    legacy = sqlite3.connect(path)
+    legacy.execute("""
+        CREATE TABLE IngestJob (
+            job_id INTEGER PRIMARY KEY AUTOINCREMENT, brain_id TEXT NOT NULL, source_id TEXT NOT NULL,
+            text TEXT NOT NULL, status TEXT NOT NULL DEFAULT 'queued', stage TEXT, progress TEXT, result TEXT,
+            error TEXT, attempts INTEGER NOT NULL DEFAULT 0, cancel_requested BOOLEAN NOT NULL DEFAULT 0,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP, updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    legacy.commit()
+    legacy.close()
+
+    db = SQLiteHandler(path)
+    db._init_db()
+    conn = db._conn()
+    assert get_schema_version(conn) == LATEST_VERSION
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(IngestJob)")}
+    assert {"source_path", "use_cache", "source_kind"} <= columns
+    assert "idx_memo_brain_date" in {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+    # 이미 적용된 마이그레이션은 다시 실행하지 않음
+    with db._transaction() as conn:
+        assert apply_migrations(conn) == 0
+
+
+def test_source_text_migration_adds_kind(db):
+    # v3 시점의 SourceText(source_id 단일 키)와 트리거로 되돌린 DB
+    brain_id = db.create_brain("마이그레이션")["brain_id"]
+    pdf = db.create_pdf("이전.pdf", "/tmp/old.pdf", brain_id=brain_id)
+    with db._transaction() as conn:
+        # 트리거는 v5에서 다시 만들어지므로 모두 제거
+        for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'").fetchall():
+            conn.execute(f"DROP TRIGGER {name}")
+        conn.execute("DROP TABLE SourceText")
+        conn.execute(
+            "CREATE TABLE SourceText (source_id TEXT PRIMARY KEY, brain_id INTEGER, content TEXT NOT NULL, "
+            "updated_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+        )
+        conn.execute("INSERT INTO SourceText (source_id, brain_id, content) VALUES (?, ?, ?)",
+                     (str(pdf["pdf_id"]), brain_id, "이전 버전에서 추출한 본문"))
+        conn.execute("INSERT INTO MDFile (md_id, md_title, md_path, brain_id) VALUES (500, 'a.md', '/tmp/a.md', ?)", (brain_id,))
+        conn.execute("PRAGMA user_version = 4")
+
+    db._init_db()
+    conn = db._conn()
+    assert get_schema_version(conn) == LATEST_VERSION
+    assert [row[0] for row in conn.execute("SELECT kind FROM SourceText")] == ["pdf"]
+    assert [r["type"] for r in db.search_documents("추출한", brain_id)] == ["pdf"]
+    # 새 MD 파일 ID는 기존 md_id 다음부터 발급
+    assert db.create_mdfile("b.md", "/tmp/b.md", brain_id=brain_id)["md_id"] > 500
+
+
+def test_listing_queries_use_indexes(db):
+    conn = db._conn()
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        db.get_memos_by_brain(1)
+        db.get_memos_by_brain(1, is_source=True)
+        db.get_pdfs_by_brain(1)
+        db.get_textfiles_by_brain(1)
+        db.get_mds_by_brain(1)
+        db.get_chat_list(1)
+        db.count_pdfs_by_path("/tmp/doc.pdf")
+        db.count_textfiles_by_path("/tmp/doc.txt")
+        db.count_mdfiles_by_path("/tmp/doc.md")
+    finally:
+        conn.set_trace_callback(None)
+
+    selects = [sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]
+    assert len(selects) == 9
+    for sql in selects:
+        plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+        searches = [detail for detail in plan if detail.startswith(("SCAN", "SEARCH"))]
+        assert searches and all("USING INDEX idx_" in detail or "USING COVERING INDEX idx_" in detail for detail in searches), (sql, plan)
+        assert not any("TEMP B-TREE" in detail for detail in plan), (sql, plan)
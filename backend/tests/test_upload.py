@@ -0,0 +1,67 @@
+import hashlib
+import io
+import os
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from routers import textFileRouter
+from services import upload_service
+from services.upload_service import UploadTooLargeError, write_stream
+
+client = TestClient(app)
+
+
+def test_write_stream_hashes_dedups_and_limits(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_service, "UPLOAD_CHUNK_SIZE", 4)
+    content = "스트리밍 업로드 테스트".encode("utf-8")
+
+    first = write_stream(io.BytesIO(content), str(tmp_path), ".txt")
+    assert first["sha256"] == hashlib.sha256(content).hexdigest()
+    assert first["size"] == len(content) and not first["deduplicated"]
+    assert os.path.basename(first["path"]) == f"{first['sha256']}.txt"
+
+    second = write_stream(io.BytesIO(content), str(tmp_path), ".txt")
+    assert second["deduplicated"] and second["path"] == first["path"]
+
+    with pytest.raises(UploadTooLargeError):
+        write_stream(io.BytesIO(b"x" * 100), str(tmp_path), ".txt", max_bytes=10)
+    # 임시 파일은 남지 않음
+    assert sorted(os.listdir(tmp_path)) == [os.path.basename(first["path"])]
+
+
+def test_upload_txt_streams_to_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(textFileRouter, "UPLOAD_TXT_DIR", str(tmp_path))
+    response = client.post(
+        "/textfiles/upload-txt",
+        files=[("files", ("메모.txt", "업로드 내용".encode("utf-8"), "text/plain"))]
+    )
+    assert response.status_code == 200
+    [uploaded] = response.json()
+    assert uploaded["txt_title"] == "메모.txt"
+    with open(uploaded["txt_path"], encoding="utf-8") as f:
+        assert f.read() == "업로드 내용"
+
+
+def test_delete_brain_keeps_files_shared_with_other_brains(tmp_path, monkeypatch):
+    monkeypatch.setattr(textFileRouter, "UPLOAD_TXT_DIR", str(tmp_path))
+    db = textFileRouter.sqlite_handler
+    first = db.create_brain("공유 파일 1")["brain_id"]
+    second = db.create_brain("공유 파일 2")["brain_id"]
+
+    # 같은 내용의 파일을 두 브레인에 업로드하면 파일 하나를 공유
+    paths = []
+    for brain_id in (first, second):
+        response = client.post(
+            "/textfiles/upload-txt",
+            files=[("files", ("공유.txt", "두 브레인이 공유하는 내용".encode("utf-8"), "text/plain"))],
+            data={"brain_id": str(brain_id)}
+        )
+        assert response.status_code == 200
+        paths.append(response.json()[0]["txt_path"])
+    assert paths[0] == paths[1]
+
+    # 다른 브레인이 참조 중인 파일은 남기고, 마지막 참조가 사라지면 삭제
+    assert db.delete_brain(first)
+    assert os.path.exists(paths[0])
+    assert db.delete_brain(second)
+    assert not os.path.exists(paths[0])
@@ -8,4 +8,5 @@ export * from './graph';
 export * from './voice';
 export * from './graphApi';
 export * from './tmpAPI';
-export * from './mds';
\ No newline at end of file
+export * from './mds';
+export * from './jobs';
\ No newline at end of file
@@ -142,14 +142,16 @@ function getDefaultGraphData() {
   };
 }
 
-export const processText = async (text, sourceId, brainId) => {
+// 텍스트 → 그래프 변환 작업 등록 (job 반환, waitForJob으로 완료 대기)
+export const processText = async (text, sourceId, brainId, sourceKind = null) => {
   try {
     const response = await api.post(
-      '/brainGraph/process_text',
+      '/jobs/process_text',
       {
         text,
         source_id: sourceId,
-        brain_id: brainId
+        brain_id: brainId,
+        source_kind: sourceKind
       }
     );
     return response.data;
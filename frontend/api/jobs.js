@@ -0,0 +1,16 @@
+import { api } from './api';
+
+// 백그라운드 작업 상태 조회
+export const getJob = id => api.get(`/jobs/${id}`).then(r => r.data);
+
+// 작업이 끝날 때까지(succeeded / failed / cancelled) 주기적으로 조회
+export const waitForJob = async (id, intervalMs = 1000) => {
+    for (;;) {
+        const job = await getJob(id);
+        if (job.status === 'succeeded') return job;
+        if (job.status === 'failed' || job.status === 'cancelled') {
+            throw new Error(job.error || `작업 ${id}이(가) ${job.status} 상태로 종료되었습니다.`);
+        }
+        await new Promise(resolve => setTimeout(resolve, intervalMs));
+    }
+};
@@ -22,4 +22,8 @@ export const uploadPdfs = (files, brainId = null) => {
         formData,
         { headers: { 'Content-Type': 'multipart/form-data' } }
     ).then(res => res.data);
-}; 
\ No newline at end of file
+}; 
+// 업로드된 PDF를 서버에서 페이지 단위로 추출해 그래프로 변환하는 작업 등록
+export const processPdf = id => api.post(`/pdfs/${id}/process`).then(r => r.data);
+// PDF 청크별 페이지 매핑 조회
+export const getPdfChunkPages = id => api.get(`/pdfs/${id}/chunk_pages`).then(r => r.data);
@@ -11,10 +11,10 @@ export const deleteTextFile = id => api.delete(`/textfiles/${id}`);
 // 브레인에 속한 모든 텍스트 파일 조회
 export const getTextfilesByBrain = (brainId) => api.get(`/textfiles/brain/${brainId}`).then(r => r.data);
 
-// 텍스트 → 그래프 변환 요청
+// 텍스트 → 그래프 변환 작업 등록 (job 반환, waitForJob으로 완료 대기)
 export const createTextToGraph = body =>
     api.post(
-        '/brainGraph/process_text',
+        '/jobs/process_text',
         JSON.stringify(body),
         { headers: { 'Content-Type': 'application/json' } }
     ).then(r => r.data);
@@ -10,6 +10,7 @@ import { TiUpload } from 'react-icons/ti'
 import { GoPencil } from 'react-icons/go';
 import { RiDeleteBinLine } from 'react-icons/ri';
 import { processText, deleteDB } from '../../../../api/graphApi';
+import { waitForJob } from '../../../../api/jobs';
 import ConfirmDialog from '../../common/ConfirmDialog';
 import { AiOutlineLoading3Quarters } from 'react-icons/ai'
 import { AiOutlineNodeIndex } from "react-icons/ai";
@@ -44,8 +45,9 @@ async function processMemoTextAsGraph(content, sourceId, brainId) {
     return;
   }
   try {
-    const response = await processText(content, String(sourceId), String(brainId));
-    console.log("✅ 그래프 생성 완료:", response);
+    const job = await processText(content, String(sourceId), String(brainId), 'memo');
+    const response = await waitForJob(job.job_id);
+    console.log("✅ 그래프 생성 완료:", response.result);
   } catch (error) {
     console.error("❌ 그래프 생성 실패:", error);
   }
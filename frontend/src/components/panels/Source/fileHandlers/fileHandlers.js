@@ -1,32 +1,24 @@
-import { uploadPdfs, uploadTextfiles, createMemo, uploadMDFiles, createTextToGraph } from '../../../../../api/backend';
-import { pdfjs } from 'react-pdf';
+import { uploadPdfs, uploadTextfiles, createMemo, uploadMDFiles, createTextToGraph, processPdf, waitForJob } from '../../../../../api/backend';
 
 const fileHandlers = {
   pdf: async (f, brainId) => {
     const [meta] = await uploadPdfs([f], brainId);
-    const arrayBuffer = await f.arrayBuffer();
-    const pdfDoc = await pdfjs.getDocument({ data: arrayBuffer }).promise;
-    let content = '';
-    for (let i = 1; i <= pdfDoc.numPages; i++) {
-      const page = await pdfDoc.getPage(i);
-      const textContent = await page.getTextContent();
-      content += textContent.items.map(item => item.str).join(' ') + '\n\n';
-    }
-    await createTextToGraph({
-      text: content,
-      brain_id: String(brainId),
-      source_id: String(meta.pdf_id),
-    });
+    // 텍스트 추출은 서버에서 페이지 단위로 처리 (브라우저에서 PDF 전체를 파싱하지 않음)
+    const job = await processPdf(meta.pdf_id);
+    await waitForJob(job.job_id);
     return { id: meta.pdf_id, filetype: 'pdf', meta };
   },
   txt: async (f, brainId) => {
     const [meta] = await uploadTextfiles([f], brainId);
     const content = await f.text();
-    await createTextToGraph({
+    // 그래프 변환은 백그라운드 작업으로 등록하고 끝날 때까지 대기
+    const job = await createTextToGraph({
       text: content,
       brain_id: String(brainId),
       source_id: String(meta.txt_id),
+      source_kind: 'text',
     });
+    await waitForJob(job.job_id);
     return { id: meta.txt_id, filetype: 'txt', meta };
   },
   memo: async (f, brainId) => {
@@ -43,11 +35,13 @@ const fileHandlers = {
   md: async (f, brainId) => {
     const [meta] = await uploadMDFiles([f], brainId);
     const content = await f.text();
-    await createTextToGraph({
+    const job = await createTextToGraph({
       text: content,
       brain_id: String(brainId),
       source_id: String(meta.md_id),
+      source_kind: 'md',
     });
+    await waitForJob(job.job_id);
     return { id: meta.md_id, filetype: 'md', meta };
   },
 };